@@ -0,0 +1,117 @@
+import argparse
+import ast
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+project_root: Path = Path(__file__).resolve().parents[1]
+sys.path.append(str(project_root))
+
+from src.libs.utils.code_analysis import ModuleSummary  # noqa: E402
+from src.libs.utils.module_index import get_module_index  # noqa: E402
+from src.libs.utils.symbol_graph import SymbolGraph  # noqa: E402
+
+MODULE_SIZES: List[Tuple[int, int]] = [(10, 10), (50, 20), (200, 20), (20, 500)]
+
+
+"""
+    Generates a module with 'class_count' classes of 'method_count' methods each. Every method calls the next one and
+    a module level function, so the summary has imports, references and methods to index, like a large real module.
+"""
+
+
+def generate_module(class_count: int, method_count: int) -> str:
+    lines: List[str] = ["import os", "from pathlib import Path", "from typing import Dict, List", "", ""]
+
+    for class_index in range(class_count):
+        lines.append(f"class Class{class_index}:")
+
+        for method_index in range(method_count):
+            lines.append(f"    def method_{method_index}(self, value: int) -> int:")
+            lines.append(f"        result: int = self.method_{(method_index + 1) % method_count}(value) + helper_{class_index}(value)")
+            lines.append("        return len(os.path.join(str(Path.cwd()), str(result)))")
+            lines.append("")
+
+        lines.extend(["", f"def helper_{class_index}(value: int) -> int:", f"    return value * {class_index}", "", ""])
+
+    lines.append("INSTANCES: Dict[str, List[int]] = {name: [] for name in os.environ}")
+    return "\n".join(lines) + "\n"
+
+
+def get_best_time(function: Callable[[], object], repeat: int) -> float:
+    best: float = float("inf")
+
+    for _ in range(repeat):
+        started_at: float = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started_at)
+
+    return best
+
+
+"""
+    Measures building a 'ModuleSummary' against parsing alone, so the cost of the single analysis pass shows as the
+    difference, together with the size of the pickled summary that the analysis cache stores.
+"""
+
+
+def bench_module_summary(repeat: int) -> None:
+    print(f"{'module':>18} {'lines':>7} {'parse ms':>9} {'summary ms':>11} {'analysis ms':>12} {'pickle KB':>10}")
+
+    for class_count, method_count in MODULE_SIZES:
+        content: str = generate_module(class_count, method_count)
+        parse_time: float = get_best_time(lambda: ast.parse(content), repeat)
+        summary_time: float = get_best_time(lambda: ModuleSummary(content), repeat)
+        pickle_size: int = len(pickle.dumps(ModuleSummary(content), protocol=pickle.HIGHEST_PROTOCOL))
+
+        print(
+            f"{f'{class_count}x{method_count}':>18} {content.count(chr(10)):>7} {parse_time * 1000:>9.1f} {summary_time * 1000:>11.1f}"
+            f" {(summary_time - parse_time) * 1000:>12.1f} {pickle_size / 1024:>10.1f}"
+        )
+
+
+"""
+    Measures the used-code traversal of the prompt command: an entry file that uses one method of every class of a
+    generated module, resolved through 'SymbolGraph.find_reachable_symbols'. Summaries are loaded once before timing, so
+    the time is spent walking the graph, where every reached class expands to its methods.
+"""
+
+
+def bench_symbol_graph(repeat: int) -> None:
+    print(f"{'module':>18} {'symbols':>8} {'reachability ms':>16}")
+
+    for class_count, method_count in MODULE_SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            root: Path = Path(directory)
+            (root / "models.py").write_text(generate_module(class_count, method_count))
+            (root / "main.py").write_text(
+                "from models import " + ", ".join(f"Class{index}" for index in range(class_count)) + "\n\n"
+                + "\n".join(f"Class{index}().method_0(1)" for index in range(class_count)) + "\n"
+            )
+            get_module_index().invalidate()
+
+            def find_reachable_symbols() -> int:
+                reached_names, _ = SymbolGraph(root, None, [], lambda path: False).find_reachable_symbols(root / "main.py")
+                return sum(len(names) for names in reached_names.values())
+
+            symbol_count: int = find_reachable_symbols()
+            reachability_time: float = get_best_time(find_reachable_symbols, repeat)
+
+        print(f"{f'{class_count}x{method_count}':>18} {symbol_count:>8} {reachability_time * 1000:>16.1f}")
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="Benchmark the module analysis of the prompt command.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the best one is reported.")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    bench_module_summary(arguments.repeat)
+    print()
+    bench_symbol_graph(arguments.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+from argparse import ArgumentParser, Namespace
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import json
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from src.apps.console.classes.commands.context import ContextCommand
+from src.apps.console.classes.commands.prompt import DEFAULT_PROMPT_LOG_NAME, PromptConstructorCommand
+from src.libs.utils.configuration import Settings, get_settings
+from src.libs.utils.gitignore import GitignoreMatcher, get_gitignore_matcher
+from src.libs.utils.process_pool import create_process_pool
+from src.libs.utils.tracing import CHROME_TRACE_FORMAT, TRACE_FORMATS, start_tracing, stop_tracing, trace_span
+
+JOB_COMMANDS: List[str] = ["prompt", "context"]
+DAEMON_COMMANDS: List[str] = ["daemon", "request"]
+YAML_JOB_FILE_SUFFIXES: List[str] = [".yaml", ".yml"]
+TRAVERSE_MODES: Dict[str, str] = {"entire": "entire file", "entire file": "entire file", "used": "used code only", "used code only": "used code only"}
+CODE_OUTPUTS: List[str] = ["differences", "entire"]
+
+
+"""
+    Reads a job file: either a list of jobs or a mapping with a 'jobs' list, optional 'defaults' merged into every job
+    and an optional number of 'workers'.
+
+    JSON files are always supported. YAML files need PyYAML, which is imported only when a YAML file is read.
+
+    Args:
+        job_file (Path): The '.json', '.yaml' or '.yml' job file.
+
+    Returns:
+        Dict[str, Any]: The job file as a mapping with 'jobs', 'defaults' and 'workers'.
+"""
+
+
+def load_job_file(job_file: Path) -> Dict[str, Any]:
+    content: str = job_file.read_text(encoding="utf-8")
+
+    if job_file.suffix.lower() in YAML_JOB_FILE_SUFFIXES:
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"Reading '{job_file}' requires PyYAML ('pip install pyyaml'), or use a JSON job file instead.")
+
+        try:
+            data: Any = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            raise ValueError(f"'{job_file}' is not valid YAML: {str(e)}")
+    else:
+        data = json.loads(content)
+
+    if isinstance(data, list):
+        data = {"jobs": data}
+
+    if not isinstance(data, dict) or not isinstance(data.get("jobs"), list):
+        raise ValueError(f"'{job_file}' must contain a list of jobs or a mapping with a 'jobs' list.")
+
+    if not all(isinstance(job, dict) for job in data["jobs"]) or not isinstance(data.get("defaults") or {}, dict):
+        raise ValueError(f"The jobs and the 'defaults' of '{job_file}' must be mappings.")
+
+    return data
+
+
+def get_job_value(job: Dict[str, Any], key: str, default: Any = None) -> Any:
+    value: Any = job.get(key)
+    return default if value is None else value
+
+
+def get_positive_int(value: Any, name: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"'{name}' must be a positive integer, got {value!r}.")
+
+    return value
+
+
+"""
+    Validates a job and fills in every value the interactive commands would have asked for.
+
+    Prompt jobs traverse from 'start_file' when it is given and include whole 'folders' otherwise. Defaults follow the
+    interactive prompts and the configuration: the configured project root and output format, 'entire file' traversal,
+    code differences and chain of thought unless 'CHAIN_OF_THOUGHT' disables it. Relative paths are resolved against the
+    project root, except the project root itself and context paths, which are resolved against the working directory.
+
+    Args:
+        job (Dict[str, Any]): The job as read from the command line or a job file.
+
+    Returns:
+        Dict[str, Any]: The normalized job.
+"""
+
+
+def normalize_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    command: str = get_job_value(job, "command", "prompt")
+
+    if command not in JOB_COMMANDS:
+        raise ValueError(f"Unknown job command '{command}'. Expected one of: {', '.join(JOB_COMMANDS)}.")
+
+    if command == "context":
+        if not job.get("path"):
+            raise ValueError("Context jobs need a 'path'.")
+
+        path: Path = Path(job["path"]).resolve()
+
+        if not path.exists():
+            raise ValueError(f"The path '{path}' does not exist.")
+
+        return {"command": command, "path": path}
+
+    settings: Settings = get_settings()
+    project_root: Path = Path(get_job_value(job, "project_root", settings.project_root_path or Path.cwd())).resolve()
+
+    if not project_root.is_dir():
+        raise ValueError(f"The project root '{project_root}' is not a valid directory.")
+
+    output_directory: Path = settings.prompt_root_path or project_root
+    output: Path = project_root / get_job_value(job, "output", output_directory / DEFAULT_PROMPT_LOG_NAME)
+
+    traverse_mode: Optional[str] = TRAVERSE_MODES.get(str(get_job_value(job, "traverse_mode", "entire file")).lower())
+    code_output: str = str(get_job_value(job, "changes", "differences")).lower()
+
+    if traverse_mode is None:
+        raise ValueError(f"Unknown traverse mode '{job['traverse_mode']}'. Expected 'entire file' or 'used code only'.")
+
+    if code_output not in CODE_OUTPUTS:
+        raise ValueError(f"Unknown value '{job['changes']}' for 'changes'. Expected one of: {', '.join(CODE_OUTPUTS)}.")
+
+    prompt_options: Dict[str, Any] = {
+        "entire_file_vs_code_differences": code_output,
+        "is_chain_of_thought": bool(get_job_value(job, "chain_of_thought", settings.chain_of_thought is not False)),
+        "ending_context": str(get_job_value(job, "context", "")),
+        "instructions": str(get_job_value(job, "instructions", "")) + "\n",
+        "token_budget": get_positive_int(job["token_budget"], "token_budget") if job.get("token_budget") is not None else None,
+    }
+
+    if job.get("start_file"):
+        prompt_options["mode"] = "traverse"
+        prompt_options["start_file"] = project_root / job["start_file"]
+        prompt_options["traverse_mode"] = traverse_mode
+
+        if not prompt_options["start_file"].is_file():
+            raise ValueError(f"File {prompt_options['start_file']} does not exist.")
+    elif job.get("folders"):
+        folders: Any = job["folders"]
+        prompt_options["mode"] = "all"
+        prompt_options["folders"] = [project_root / folder for folder in (folders.split() if isinstance(folders, str) else folders)]
+    else:
+        raise ValueError("Prompt jobs need either a 'start_file' or 'folders'.")
+
+    return {
+        "command": command,
+        "project_root": project_root,
+        "output": output,
+        "output_format": get_job_value(job, "output_format", settings.output_code_format or "Filename"),
+        "prompt_options": prompt_options,
+    }
+
+
+"""
+    Non-interactive runner for the prompt and context commands.
+
+    Jobs run against the same command instances, so the parse and analysis caches, the module index, the gitignore
+    matchers and the token counts stay in memory from one job to the next. Prompt logs are not copied to the clipboard.
+"""
+
+
+class BatchApp:
+    def __init__(self, quiet: bool = False) -> None:
+        self.console: Console = Console(quiet=quiet)
+        self.prompt_command: PromptConstructorCommand = PromptConstructorCommand(self)
+        self.context_command: ContextCommand = ContextCommand(self)
+        self.gitignore_matchers: Dict[Path, GitignoreMatcher] = {}
+
+    def get_gitignore_matcher(self, project_root: Path) -> GitignoreMatcher:
+        if project_root not in self.gitignore_matchers:
+            self.gitignore_matchers[project_root] = get_gitignore_matcher(project_root)
+
+        return self.gitignore_matchers[project_root]
+
+    def run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        started_at: float = time.perf_counter()
+        result: Dict[str, Any] = {"command": job["command"], "target": str(job.get("output") or job.get("path")), "error": None}
+
+        try:
+            with trace_span("job", command=job["command"], target=result["target"]):
+                if job["command"] == "context":
+                    result["tokens"] = self.context_command.analyze_path(job["path"])
+                else:
+                    self.run_prompt_job(job)
+        except Exception as e:
+            result["error"] = str(e)
+
+        result["seconds"] = time.perf_counter() - started_at
+        return result
+
+    def prepare_prompt_command(self, job: Dict[str, Any]) -> PromptConstructorCommand:
+        command: PromptConstructorCommand = self.prompt_command
+
+        command.project_root = job["project_root"]
+        command.gitignore_matcher = self.get_gitignore_matcher(job["project_root"])
+        command.output_format = job["output_format"]
+        command.set_mode(job["prompt_options"]["mode"])
+
+        return command
+
+    def run_prompt_job(self, job: Dict[str, Any]) -> None:
+        command: PromptConstructorCommand = self.prepare_prompt_command(job)
+
+        job["output"].parent.mkdir(parents=True, exist_ok=True)
+        command.write_prompt_log(job["output"], job["prompt_options"], should_copy_to_clipboard=False)
+
+    def run_jobs(self, jobs: List[Dict[str, Any]], workers: int = 1) -> List[Dict[str, Any]]:
+        if workers <= 1 or len(jobs) <= 1:
+            return [self.run_job(job) for job in jobs]
+
+        with create_process_pool(min(workers, len(jobs)), initializer=initialize_batch_worker) as executor:
+            return list(executor.map(run_batch_job, jobs))
+
+    def print_summary(self, results: List[Dict[str, Any]]) -> None:
+        table: Table = Table(title="Batch results")
+        table.add_column("#", justify="right")
+        table.add_column("Command")
+        table.add_column("Target")
+        table.add_column("Time", justify="right")
+        table.add_column("Result")
+
+        for index, result in enumerate(results, start=1):
+            if result["error"]:
+                status: str = f"[bold red]failed: {result['error']}[/bold red]"
+            elif result.get("tokens") is not None:
+                status = f"[bold green]{result['tokens']:,} tokens[/bold green]"
+            else:
+                status = "[bold green]ok[/bold green]"
+
+            table.add_row(str(index), result["command"], result["target"], f"{result['seconds']:.2f}s", status)
+
+        self.console.print(table)
+
+
+BATCH_WORKER_APP: Optional[BatchApp] = None
+
+
+def initialize_batch_worker() -> None:
+    global BATCH_WORKER_APP
+    BATCH_WORKER_APP = BatchApp(quiet=True)
+
+
+def run_batch_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    return BATCH_WORKER_APP.run_job(job)
+
+
+def create_argument_parser() -> ArgumentParser:
+    parser: ArgumentParser = ArgumentParser(prog="main.py", description="Build prompts and count tokens without the interactive console.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    trace_parser: ArgumentParser = ArgumentParser(add_help=False)
+    trace_parser.add_argument("--trace", help="Write the time spent in every phase to this file when the command finishes. Defaults to TRACE_PATH.")
+    trace_parser.add_argument("--trace-format", dest="trace_format", choices=TRACE_FORMATS, default=CHROME_TRACE_FORMAT, help="Chrome trace events or a JSON summary per phase.")
+
+    prompt_parser: ArgumentParser = subparsers.add_parser("prompt", parents=[trace_parser], help="Build a single prompt log.")
+    prompt_parser.add_argument("--project-root", dest="project_root", help="Project to analyze. Defaults to PROJECT_ROOT_PATH or the working directory.")
+    prompt_parser.add_argument("--output", help="Prompt log to write, relative to the project root. Defaults to PROMPT_ROOT_PATH/prompt.log.")
+    prompt_parser.add_argument("--start-file", dest="start_file", help="Traverse the imports of this file.")
+    prompt_parser.add_argument("--folders", nargs="+", help="Include every file of these folders.")
+    prompt_parser.add_argument("--traverse-mode", dest="traverse_mode", choices=sorted(TRAVERSE_MODES), help="Include entire files or only used code.")
+    prompt_parser.add_argument("--changes", choices=CODE_OUTPUTS, help="Ask for code differences or entire files.")
+    prompt_parser.add_argument("--output-format", dest="output_format", choices=["Filename", "XML"], help="Defaults to OUTPUT_CODE_FORMAT.")
+    prompt_parser.add_argument("--chain-of-thought", dest="chain_of_thought", action="store_true", default=None)
+    prompt_parser.add_argument("--no-chain-of-thought", dest="chain_of_thought", action="store_false")
+    prompt_parser.add_argument("--context", help="Context written at the end of the prompt log.")
+    prompt_parser.add_argument("--instructions", help="Instructions written at the end of the prompt log.")
+    prompt_parser.add_argument("--token-budget", dest="token_budget", type=int, help="Defaults to PROMPT_TOKEN_BUDGET.")
+
+    context_parser: ArgumentParser = subparsers.add_parser("context", parents=[trace_parser], help="Count the tokens of files or folders.")
+    context_parser.add_argument("paths", nargs="+")
+
+    batch_parser: ArgumentParser = subparsers.add_parser("batch", parents=[trace_parser], help="Run the jobs of a JSON or YAML job file.")
+    batch_parser.add_argument("job_file")
+    batch_parser.add_argument("--workers", type=int, help="Run up to this many independent jobs concurrently in separate processes.")
+
+    daemon_parser: ArgumentParser = subparsers.add_parser("daemon", parents=[trace_parser], help="Serve prompt and token count requests over a Unix socket.")
+    daemon_parser.add_argument("--socket", help="Socket to listen on. Defaults to DAEMON_SOCKET_PATH.")
+    daemon_parser.add_argument("--project-root", dest="project_roots", action="append", help="Watch this project from the start. Other projects are watched from their first request.")
+
+    request_parser: ArgumentParser = subparsers.add_parser("request", help="Send a JSON request to a running daemon and print the response.")
+    request_parser.add_argument("request", nargs="?", help="The JSON request. Read from standard input when omitted.")
+    request_parser.add_argument("--socket", help="Socket of the daemon. Defaults to DAEMON_SOCKET_PATH.")
+
+    return parser
+
+
+def get_jobs(arguments: Namespace) -> tuple[List[Dict[str, Any]], int]:
+    if arguments.command == "context":
+        return [{"command": "context", "path": path} for path in arguments.paths], 1
+
+    if arguments.command == "prompt":
+        job: Dict[str, Any] = {key: value for key, value in vars(arguments).items() if value is not None}
+        return [job], 1
+
+    job_file: Dict[str, Any] = load_job_file(Path(arguments.job_file))
+    defaults: Dict[str, Any] = job_file.get("defaults") or {}
+    workers: int = get_positive_int(arguments.workers if arguments.workers is not None else get_job_value(job_file, "workers", 1), "workers")
+
+    return [{**defaults, **job} for job in job_file["jobs"]], workers
+
+
+"""
+    Entry point of the headless mode: builds every requested prompt and token count in one process and prints a summary.
+
+    Every job is validated before any of them runs, and two prompt jobs may not write the same prompt log.
+    With '--trace' the time spent in every phase is written once all jobs have finished. Jobs that run in worker processes
+    are not traced.
+
+    Args:
+        argv (List[str]): Command line arguments without the program name.
+
+    Returns:
+        int: Exit code, 0 when every job succeeded, 1 otherwise.
+"""
+
+
+def run_batch(argv: List[str]) -> int:
+    arguments: Namespace = create_argument_parser().parse_args(argv)
+
+    if getattr(arguments, "trace", None):
+        start_tracing(Path(arguments.trace), arguments.trace_format)
+
+    if arguments.command in DAEMON_COMMANDS:
+        from src.apps.console.classes.daemon_app import run_daemon_command
+
+        return run_daemon_command(arguments)
+
+    console: Console = Console()
+
+    try:
+        raw_jobs, workers = get_jobs(arguments)
+        jobs: List[Dict[str, Any]] = [normalize_job(job) for job in raw_jobs]
+    except (OSError, ValueError) as e:
+        console.print(f"Invalid jobs: {str(e)}", style="bold red")
+        return 1
+
+    outputs: List[Path] = [job["output"] for job in jobs if job["command"] == "prompt"]
+    duplicated_outputs: List[str] = sorted({str(output) for output in outputs if outputs.count(output) > 1})
+
+    if duplicated_outputs:
+        console.print(f"Invalid jobs: several prompt jobs write {', '.join(duplicated_outputs)}", style="bold red")
+        return 1
+
+    app: BatchApp = BatchApp()
+    results: List[Dict[str, Any]] = app.run_jobs(jobs, workers)
+    app.print_summary(results)
+
+    trace_path: Optional[Path] = stop_tracing()
+
+    if trace_path is not None:
+        console.print(f"Trace written to {trace_path}", style="bold green")
+
+    return 1 if any(result["error"] for result in results) else 0
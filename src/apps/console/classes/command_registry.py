@@ -0,0 +1,85 @@
+from typing import Any, Dict, Iterator, List
+from types import ModuleType
+import importlib
+
+from src.apps.console.classes.commands.base import BaseCommand
+
+COMMANDS_PACKAGE: str = "src.apps.console.classes.commands"
+
+
+class CommandSpec:
+    def __init__(self, name: str, description: str, module_name: str, class_name: str) -> None:
+        self.name: str = name
+        self.description: str = description
+        self.module_name: str = module_name
+        self.class_name: str = class_name
+
+
+"""
+    Manifest of the console commands, in the order 'help' lists them.
+
+    Names and descriptions are duplicated here so the console can parse input and list the commands without importing
+    the command modules. Each entry must match the 'name' and 'description' of the command class it points to, which is
+    checked when the command is loaded.
+"""
+
+COMMAND_MANIFEST: List[CommandSpec] = [
+    CommandSpec("context", "Calculate the token ratio of a file or folder against Claude 3.5 Sonnet's context window", "context", "ContextCommand"),
+    CommandSpec(
+        "create react structure",
+        "Create a new React project structure\nwith ESLint, Prettier, and TypeScript (optional). Style options include \nCSS Modules, Tailwind, and Material UI.",
+        "create_react_structure",
+        "CreateReactStructureCommand",
+    ),
+    CommandSpec("exit", "Exit the console application", "exit", "ExitCommand"),
+    CommandSpec("help", "Show available commands", "help", "HelpCommand"),
+    CommandSpec(
+        "prompt",
+        "Construct a prompt log file from given Python files or all files in specified folders. Use 'prompt --watch' to regenerate it on every change",
+        "prompt",
+        "PromptConstructorCommand",
+    ),
+]
+
+
+"""
+    Commands of the console, loaded on demand.
+
+    The registry behaves like the mapping of command names to commands it replaces: membership and iteration only read
+    the manifest, and looking a command up imports its module and instantiates it the first time, so the console reaches
+    its first prompt without importing the analysis, tokenizer or React scaffolding modules.
+"""
+
+
+class CommandRegistry:
+    def __init__(self, app: Any, specs: List[CommandSpec]) -> None:
+        self.app: Any = app
+        self.specs: Dict[str, CommandSpec] = {spec.name: spec for spec in specs}
+        self.commands: Dict[str, BaseCommand] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.specs)
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+    def __getitem__(self, name: str) -> BaseCommand:
+        if name not in self.commands:
+            self.commands[name] = self.load_command(self.specs[name])
+
+        return self.commands[name]
+
+    def load_command(self, spec: CommandSpec) -> BaseCommand:
+        module: ModuleType = importlib.import_module(f"{COMMANDS_PACKAGE}.{spec.module_name}")
+        command: BaseCommand = getattr(module, spec.class_name)(self.app)
+
+        if command.name != spec.name:
+            raise ValueError(f"The command manifest lists '{spec.name}' but {spec.module_name}.{spec.class_name} is named '{command.name}'.")
+
+        if command.description != spec.description:
+            raise ValueError(f"The command manifest description of '{spec.name}' does not match the description of {spec.module_name}.{spec.class_name}.")
+
+        return command
@@ -1,70 +1,117 @@
-import os
 from pathlib import Path
-import re
-from typing import Any, Coroutine
+from typing import Any, Coroutine, Dict, List, Optional
 
 from rich.panel import Panel
 from rich.progress import Progress
+from rich.table import Table
 
 from src.apps.console.classes.commands.base import BaseCommand
 from src.libs.helpers.console import get_user_input
-from src.libs.utils.constants import CLAUDE_CONTEXT_WINDOW
+from src.libs.utils.file_system import should_ignore_file, walk_files
+from src.libs.utils.constants import CLAUDE_CONTEXT_WINDOW, ALLOWED_FILES
+from src.libs.utils.gitignore import GitignoreMatcher, get_gitignore_matcher
+from src.libs.utils.configuration import Settings, get_settings, reload_settings_if_changed
+from src.libs.utils.text_files import is_text_file
+from src.libs.utils.token_counter import BpeTokenizer, TokenCounter, get_configured_tokenizer
 
 NAME: str = "context"
 DESCRIPTION: str = "Calculate the token ratio of a file or folder against Claude 3.5 Sonnet's context window"
 AVOID_FILES: str = [".pyc", ".pyo", ".so", ".o", ".a", ".lib", ".dll", ".exe"]
+MAX_BREAKDOWN_ROWS: int = 15
 
 
 class ContextCommand(BaseCommand):
     name: str = NAME
     description: str = DESCRIPTION
+    token_counter: Optional[TokenCounter] = None
+    token_counter_settings: Optional[Settings] = None
 
     async def execute(self, *args: Any, **kwargs: Any) -> Coroutine[Any, Any, None]:
+        reload_settings_if_changed()
         path_input: str = await get_user_input("Enter the path to a file or folder (e.g., src/apps/console/main.py): ")
-        path: Path = Path(path_input)
 
+        self.analyze_path(Path(path_input))
+
+    def analyze_path(self, path: Path) -> Optional[int]:
         if not path.exists():
             self.console.print(Panel(f"The path '{path}' does not exist.", title="Error", style="bold red"))
-            return
+            return None
 
         if path.is_file():
             token_count = self.count_tokens_in_file(path)
             self.print_result(token_count, "file")
         elif path.is_dir():
-            token_count, file_count, skipped_count = self.count_tokens_in_folder(path)
+            token_count, file_count, skipped_count, extension_tokens, directory_tokens = self.count_tokens_in_folder(path)
             self.print_result(token_count, "folder", file_count, skipped_count)
+            self.print_breakdown(extension_tokens, "Extension", token_count)
+            self.print_breakdown(directory_tokens, "Directory", token_count)
         else:
             self.console.print(Panel(f"The path '{path}' is neither a file nor a folder.", title="Error", style="bold red"))
+            return None
+
+        return token_count
 
     def count_tokens_in_file(self, file_path: Path) -> int:
+        if not is_text_file(file_path, ALLOWED_FILES):
+            self.console.print(f"Skipping file {file_path}: Not a UTF-8 text file", style="yellow")
+            return 0
+
         try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                content = file.read()
-            return self.estimate_tokens(content)
+            return self.get_token_counter().count_file_tokens(file_path)
         except UnicodeDecodeError:
             self.console.print(f"Skipping file {file_path}: Unable to decode as UTF-8", style="yellow")
             return 0
 
-    def count_tokens_in_folder(self, folder_path: Path) -> tuple[int, int, int]:
+    def count_tokens_in_folder(self, folder_path: Path) -> tuple[int, int, int, Dict[str, int], Dict[str, int]]:
+        folder_path = folder_path.resolve()
+        gitignore_matcher: GitignoreMatcher = get_gitignore_matcher(self.get_project_root(folder_path))
+        file_paths: List[Path] = []
+        skipped_count = 0
+
+        for file_path in walk_files(folder_path, lambda path, is_dir: should_ignore_file(path, gitignore_matcher, ALLOWED_FILES, is_dir)):
+            if self.should_process_file(file_path):
+                file_paths.append(file_path)
+            else:
+                skipped_count += 1
+
+        with Progress(console=self.console) as progress:
+            task = progress.add_task("[cyan]Processing files...", total=len(file_paths))
+            token_counts = self.get_token_counter().count_files_tokens(file_paths, on_progress=lambda count: progress.update(task, advance=count))
+
         total_tokens = 0
         file_count = 0
-        skipped_count = 0
-        with Progress() as progress:
-            task = progress.add_task("[cyan]Processing files...", total=None)
-            for root, _, files in os.walk(folder_path):
-                for file in files:
-                    file_path = Path(root) / file
-                    if self.should_process_file(file_path):
-                        tokens = self.count_tokens_in_file(file_path)
-                        if tokens > 0:
-                            total_tokens += tokens
-                            file_count += 1
-                        else:
-                            skipped_count += 1
-                    else:
-                        skipped_count += 1
-                    progress.update(task, advance=1)
-        return total_tokens, file_count, skipped_count
+        extension_tokens: Dict[str, int] = {}
+        directory_tokens: Dict[str, int] = {}
+
+        for file_path in file_paths:
+            tokens = token_counts[file_path]
+
+            if tokens is None:
+                self.console.print(f"Skipping file {file_path}: Not a UTF-8 text file", style="yellow")
+
+            if not tokens:
+                skipped_count += 1
+                continue
+
+            total_tokens += tokens
+            file_count += 1
+
+            extension: str = file_path.suffix.lower() or "(no extension)"
+            extension_tokens[extension] = extension_tokens.get(extension, 0) + tokens
+
+            relative_parts = file_path.relative_to(folder_path).parts
+            directory: str = relative_parts[0] if len(relative_parts) > 1 else "."
+            directory_tokens[directory] = directory_tokens.get(directory, 0) + tokens
+
+        return total_tokens, file_count, skipped_count, extension_tokens, directory_tokens
+
+    def get_project_root(self, folder_path: Path) -> Path:
+        project_root: Path = (get_settings().project_root_path or Path.cwd()).resolve()
+
+        if folder_path == project_root or project_root in folder_path.parents:
+            return project_root
+
+        return folder_path
 
     def should_process_file(self, file_path: Path) -> bool:
         if file_path.name.startswith("."):
@@ -73,10 +120,24 @@ class ContextCommand(BaseCommand):
             return False
         return True
 
+    def load_tokenizer(self) -> Optional[BpeTokenizer]:
+        try:
+            return get_configured_tokenizer()
+        except (OSError, ValueError) as e:
+            self.console.print(f"Unable to load tokenizer vocabulary: {str(e)}. Falling back to the token estimate.", style="yellow")
+            return None
+
+    def get_token_counter(self) -> TokenCounter:
+        settings: Settings = get_settings()
+
+        if self.token_counter is None or self.token_counter_settings is not settings:
+            self.token_counter = TokenCounter(settings.project_root_path or Path.cwd(), self.load_tokenizer())
+            self.token_counter_settings = settings
+
+        return self.token_counter
+
     def estimate_tokens(self, text: str) -> int:
-        tokens = re.findall(r"\w+|[^\w\s]", text)
-        whitespace_count = len(re.findall(r"\s+", text))
-        return len(tokens) + whitespace_count
+        return self.get_token_counter().count_tokens(text)
 
     def print_result(self, token_count: int, path_type: str, file_count: int = 1, skipped_count: int = 0) -> None:
         ratio = token_count / CLAUDE_CONTEXT_WINDOW * 100
@@ -86,3 +147,20 @@ class ContextCommand(BaseCommand):
             result += f"Files processed: {file_count:,}\n"
             result += f"Files skipped: {skipped_count:,}"
         self.console.print(Panel(result, title="Token Analysis Result", style="bold green"))
+
+    def print_breakdown(self, tokens_by_key: Dict[str, int], key_title: str, token_count: int) -> None:
+        if not tokens_by_key:
+            return
+
+        table: Table = Table(title=f"Tokens by {key_title.lower()}")
+        table.add_column(key_title)
+        table.add_column("Tokens", justify="right")
+        table.add_column("Share", justify="right")
+
+        for key, tokens in sorted(tokens_by_key.items(), key=lambda item: item[1], reverse=True)[:MAX_BREAKDOWN_ROWS]:
+            table.add_row(key, f"{tokens:,}", f"{tokens / token_count * 100:.2f}%")
+
+        if len(tokens_by_key) > MAX_BREAKDOWN_ROWS:
+            table.add_row(f"... {len(tokens_by_key) - MAX_BREAKDOWN_ROWS} more", "", "")
+
+        self.console.print(table)
@@ -1,6 +1,7 @@
-from typing import Any, Coroutine, Dict
+from typing import Any, Coroutine
 from rich.panel import Panel
 
+from src.apps.console.classes.command_registry import CommandRegistry
 from src.apps.console.classes.commands.base import BaseCommand
 
 
@@ -9,9 +10,9 @@ class HelpCommand(BaseCommand):
     description: str = "Show available commands"
 
     async def execute(self, *args: Any, **kwargs: Any) -> Coroutine[Any, Any, None]:
-        help_text: str = "\n".join([f"- {cmd.name}: {cmd.description}" for cmd in self.app.commands.values()])
+        help_text: str = "\n".join([f"- {spec.name}: {spec.description}" for spec in self.app.commands.specs.values()])
         self.console.print(Panel(help_text, title="Available Commands", expand=False))
 
     @property
-    def app_commands(self) -> Dict[str, BaseCommand]:
+    def app_commands(self) -> CommandRegistry:
         return self.app.commands
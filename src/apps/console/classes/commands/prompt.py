@@ -1,60 +1,104 @@
-import ast
 from pathlib import Path
-from typing import Set, List, Any, Dict, Tuple
-import re
+from typing import Set, List, Any, Dict, Tuple, Optional
+import asyncio
+import os
+import signal
+import time
 
+from rich.panel import Panel
 
 from src.apps.console.classes.commands.base import BaseCommand
 from src.libs.helpers.console import get_user_input, get_yes_no_bool_user_input
-from src.libs.utils.string import wrap_text, remove_non_printable_characters, write_indented_content
-from src.libs.utils.constants import CODE_CHANGES, ENTIRE_FILE, DASHED_MARKERS_EXPLANATION, XML_MARKERS_EXPLANATION, CHAIN_OF_THOUGHT
-from src.libs.utils.prompting import create_dashed_filename_marker, create_dashed_filename_end_marker, update_content_dashed_marker
+from src.libs.utils.string import wrap_text, write_indented_content
+from src.libs.utils.constants import CODE_CHANGES, ENTIRE_FILE, DASHED_MARKERS_EXPLANATION, XML_MARKERS_EXPLANATION, CHAIN_OF_THOUGHT, ALLOWED_FILES, CLAUDE_CONTEXT_WINDOW
+from src.libs.utils.prompt_document import PromptDocument
 from src.libs.utils.file_system import (
-    copy_to_clipboard,
-    get_gitignore_patters_list,
+    copy_text_to_clipboard,
     should_ignore_file,
-    is_text_file_mimetype_or_allowed_file,
     read_file_content,
     path_exists,
     is_path_directory,
-    get_files_match_pattern,
-    read_log_file,
+    walk_files,
     write_log_file,
-    write_log_file_from_start,
 )
-from src.libs.utils.configuration import get_config_value
+from src.libs.utils.configuration import Settings, get_settings, reload_settings_if_changed
+from src.libs.utils.text_files import is_text_file
 from .....libs.utils.code_analysis import (
-    get_unused_code_nodes,
     get_local_imports as get_local_imports_from_content,
-    remove_blank_lines_from_code_lines,
-    get_node_source_code_with_decorators,
+    get_signature_outline,
+    NodeSummary,
+)
+from src.libs.utils.module_index import get_module_index
+from src.libs.utils.traversal import prefetch_import_graph
+from src.libs.utils.gitignore import GitignoreMatcher, get_gitignore_matcher
+from src.libs.utils.file_watcher import FileWatcher, create_file_watcher
+from src.libs.utils.symbol_graph import SymbolGraph
+from src.libs.utils.prompt_sinks import PromptSink, create_prompt_sink
+from src.libs.utils.source_spans import SourceView, Span, SpanSet, merge_adjacent_spans
+from src.libs.utils.token_counter import BpeTokenizer, TokenCounter, get_configured_tokenizer
+from src.libs.utils.tracing import trace_aggregate, trace_span
+from src.libs.utils.prompt_packer import (
+    FULL_SOURCE_LEVEL,
+    USED_CODE_LEVEL,
+    SIGNATURES_LEVEL,
+    PackingCandidate,
+    PackingReport,
+    get_import_distances,
+    pack_prompt_document,
 )
 
 
 NAME: str = "prompt"
-DESCRIPTION: str = "Construct a prompt log file from given Python files or all files in specified folders"
-DEFAULT_PROJECT_ROOT: Path | None = Path(get_config_value("PROJECT_ROOT_PATH", "")) if get_config_value("PROJECT_ROOT_PATH", None) else None
-DEFAULT_PROMPT_PATH: Path | None = Path(get_config_value("PROMPT_ROOT_PATH", "")) if get_config_value("PROMPT_ROOT_PATH", None) else None
+DESCRIPTION: str = "Construct a prompt log file from given Python files or all files in specified folders. Use 'prompt --watch' to regenerate it on every change"
 PROCESSED_FILES: Set[Path] = set()
-ALLOWED_FILES: List[str] = [".gitignore", ".env.example", "pyproject.toml", ".flake8"]
-PROCESSED_CONTENT: Dict[Path, Set[int]] = {}
+PROCESSED_CONTENT: Dict[Path, SpanSet] = {}
 ALIAS_MAPPING: Dict[str, str] = {}
+PROCESSED_IMPORTS: Dict[Path, List[Path]] = {}
 DEFAULT_PROMPT_LOG_NAME: str = "prompt.log"
-DEFAULT_OUTPUT_FORMAT: str | None = get_config_value("OUTPUT_CODE_FORMAT", None)
-DEFAULT_CHAIN_OF_THOUGHT: bool | None = get_config_value("CHAIN_OF_THOUGHT", "false") == "true" if get_config_value("CHAIN_OF_THOUGHT", None) else None
+EMITTED_NODE_KINDS: Tuple[str, ...] = ("ClassDef", "FunctionDef", "AsyncFunctionDef", "Assign", "AnnAssign", "Import", "ImportFrom")
+WATCH_FLAG: str = "--watch"
+WATCH_DEBOUNCE_SECONDS: float = 0.05
+
+
+"""
+    Waits up to 'timeout' seconds for the watch of the prompt command to be stopped.
+
+    The watch polls for changes and debounces them through this function, so Ctrl+C, which sets 'stop_event' from a
+    SIGINT handler of the event loop, ends the wait right away instead of after the full interval.
+
+    Args:
+        stop_event (asyncio.Event): Event that is set when the watch must stop.
+        timeout (float): Maximum number of seconds to wait.
+
+    Returns:
+        bool: Whether the watch was stopped. False when the timeout expired first.
+"""
+
+
+async def wait_for_stop(stop_event: asyncio.Event, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(stop_event.wait(), timeout)
+    except asyncio.TimeoutError:
+        pass
+
+    return stop_event.is_set()
 
 
 class PromptConstructorCommand(BaseCommand):
     name: str = NAME
     description: str = DESCRIPTION
-    project_root: Path = DEFAULT_PROJECT_ROOT
+    project_root: Path | None = None
     processed_files: Set[Path] = PROCESSED_FILES
-    processed_content: Dict[Path, Set[int]] = PROCESSED_CONTENT
+    processed_content: Dict[Path, SpanSet] = PROCESSED_CONTENT
     prompt_log_name: str = DEFAULT_PROMPT_LOG_NAME
     processed_alias_mapping: Dict[str, str] = ALIAS_MAPPING
-    output_format: str | None = DEFAULT_OUTPUT_FORMAT
+    processed_imports: Dict[Path, List[Path]] = PROCESSED_IMPORTS
+    output_format: str | None = None
+    symbol_graph: SymbolGraph | None = None
+    reached_symbols: Tuple[Dict[Path, Set[str]], Set[Path]] = ({}, set())
 
     async def execute(self, *args: Any, **kwargs: Any) -> None:
+        reload_settings_if_changed()
         await self.set_project_root()
 
         self.console.print(f"You're analyzing: '{self.project_root}' project", style="bold green")
@@ -73,7 +117,8 @@ class PromptConstructorCommand(BaseCommand):
 
         self.console.print(f"Prompt.log file is gonna be saved on: '{prompt_log}'", style="bold green")
 
-        self.ignore_patterns: List[str] = get_gitignore_patters_list(self.project_root)
+        self.gitignore_matcher: GitignoreMatcher = get_gitignore_matcher(self.project_root)
+        get_module_index().invalidate()
 
         mode: str = await get_user_input("Enter mode: ", choices=["all", "traverse"], default="all") or "all"
         self.set_mode(mode)
@@ -85,360 +130,592 @@ class PromptConstructorCommand(BaseCommand):
             or "differences"
         )
 
-        is_chain_of_thought: bool = DEFAULT_CHAIN_OF_THOUGHT
+        is_chain_of_thought: bool | None = get_settings().chain_of_thought
 
-        if DEFAULT_CHAIN_OF_THOUGHT is None:
+        if is_chain_of_thought is None:
             is_chain_of_thought: bool = await get_yes_no_bool_user_input(console_message="Use CoT?", default_value="yes")
 
         self.output_format = await self.get_output_format()
 
-        with open(prompt_log, "w+") as log_file:
-            if mode == "traverse":
-                filename: str = await get_user_input("Enter the filename (e.g., src/apps/console/main.py): ")
-                start_file: Path = self.project_root / filename
+        prompt_options: Dict[str, Any] = {
+            "mode": mode,
+            "entire_file_vs_code_differences": entire_file_vs_code_differences,
+            "is_chain_of_thought": is_chain_of_thought,
+        }
 
-                if not path_exists(start_file):
-                    self.console.print(f"File {start_file} does not exist.", style="bold red")
-                    return
+        if mode == "traverse":
+            filename: str = await get_user_input("Enter the filename (e.g., src/apps/console/main.py): ")
+            start_file: Path = self.project_root / filename
 
-                traverse_mode: str | None = await get_user_input("Choose traverse mode:", choices=["entire file", "used code only"], default="entire file")
+            if not path_exists(start_file):
+                self.console.print(f"File {start_file} does not exist.", style="bold red")
+                return
 
-                ending_context: str = await self.get_ending_context()
+            prompt_options["start_file"] = start_file
+            prompt_options["traverse_mode"] = await get_user_input("Choose traverse mode:", choices=["entire file", "used code only"], default="entire file")
 
-                if traverse_mode == "entire file":
-                    self.process_file(start_file, log_file)
-                else:
-                    self.process_file_used_code_only(start_file, log_file)
+        elif mode == "all":
+            folder_paths = await get_user_input("Enter the folder paths (space-separated, e.g., src/apps/console src/libs): ")
+            prompt_options["folders"] = [self.project_root / folder.strip() for folder in folder_paths.split()]
 
-                write_log_file(log_file, "<context>\n")
+        else:
+            self.console.print(f"Invalid mode: {mode}", style="bold red")
+            return
 
-                if self.output_format.upper() == "XML":
-                    context_content: str = wrap_text(XML_MARKERS_EXPLANATION)
-                else:
-                    context_content: str = wrap_text(DASHED_MARKERS_EXPLANATION)
+        prompt_options["ending_context"] = await self.get_ending_context()
+        prompt_options["instructions"] = await self.get_instructions() + "\n"
 
-                if ending_context:
-                    context_content += "\n" + wrap_text(ending_context)
+        with trace_span("prompt.files", mode=mode):
+            files_document: PromptDocument = self.build_files_document(prompt_options)
 
-                indented_content: str = write_indented_content(context_content)
+        self.write_prompt_log(prompt_log, prompt_options, files_document=files_document)
 
-                write_log_file(log_file, indented_content)
+        if WATCH_FLAG in args:
+            await self.watch_prompt_log(prompt_log, prompt_options, files_document)
 
-                write_log_file(log_file, "\n</context>\n\n")
+    def build_prompt_document(self, prompt_options: Dict[str, Any]) -> PromptDocument:
+        return self.complete_prompt_document(self.build_files_document(prompt_options), prompt_options)
 
-                write_log_file(log_file, "<instructions>\n")
+    def build_files_document(self, prompt_options: Dict[str, Any]) -> PromptDocument:
+        self.processed_files.clear()
+        self.processed_content.clear()
+        self.processed_alias_mapping.clear()
+        self.processed_imports.clear()
 
-                instructions: str = await self.get_instructions() + "\n"
+        prompt_document: PromptDocument = PromptDocument(self.project_root)
+        mode: str = prompt_options["mode"]
 
-                write_log_file(log_file, write_indented_content(wrap_text(instructions)))
+        if mode == "traverse":
+            start_file: Path = prompt_options["start_file"]
 
-                if is_chain_of_thought:
-                    write_log_file(log_file, write_indented_content(wrap_text(CHAIN_OF_THOUGHT)))
+            with trace_span("imports.prefetch", file=start_file):
+                prefetch_import_graph(start_file, self.project_root, self.gitignore_matcher, ALLOWED_FILES, self.should_ignore)
 
-                if entire_file_vs_code_differences == "differences":
-                    instructions_content: str = wrap_text(CODE_CHANGES)
-                elif entire_file_vs_code_differences == "entire":
-                    instructions_content: str = wrap_text(ENTIRE_FILE)
-                else:
-                    instructions_content: str = ""
+            if prompt_options["traverse_mode"] == "entire file":
+                self.process_file(start_file, prompt_document)
+            else:
+                self.process_file_used_code_only(start_file, prompt_document)
+        else:
+            self.process_multiple_folders(prompt_options["folders"], prompt_document)
 
-                indented_content: str = write_indented_content(instructions_content)
+        return prompt_document
 
-                write_log_file(log_file, indented_content)
+    def complete_prompt_document(self, prompt_document: PromptDocument, prompt_options: Dict[str, Any]) -> PromptDocument:
+        mode: str = prompt_options["mode"]
 
-                write_log_file(log_file, "\n</instructions>")
+        prompt_document.write("<context>\n")
 
-            elif mode == "all":
-                folder_paths = await get_user_input("Enter the folder paths (space-separated, e.g., src/apps/console src/libs): ")
-                folders = [self.project_root / folder.strip() for folder in folder_paths.split()]
+        if self.output_format.upper() == "XML":
+            context_content: str = wrap_text(XML_MARKERS_EXPLANATION)
+        else:
+            context_content: str = wrap_text(DASHED_MARKERS_EXPLANATION)
 
-                ending_context = await self.get_ending_context()
+        if prompt_options["ending_context"]:
+            context_content += "\n" + wrap_text(prompt_options["ending_context"])
 
-                self.process_multiple_folders(folders, log_file)
+        prompt_document.write(write_indented_content(context_content))
 
-                write_log_file(log_file, "<context>\n")
+        prompt_document.write("\n</context>\n\n")
 
-                if self.output_format.upper() == "XML":
-                    context_content: str = wrap_text(XML_MARKERS_EXPLANATION)
-                else:
-                    context_content: str = wrap_text(DASHED_MARKERS_EXPLANATION)
+        prompt_document.write("<instructions>\n")
 
-                if ending_context:
-                    context_content += "\n" + wrap_text(ending_context)
+        prompt_document.write(write_indented_content(wrap_text(prompt_options["instructions"])))
 
-                indented_content: str = write_indented_content(context_content)
+        if prompt_options["is_chain_of_thought"]:
+            chain_of_thought_ending: str = "\n\n" if mode == "all" else ""
+            prompt_document.write(write_indented_content(wrap_text(CHAIN_OF_THOUGHT)) + chain_of_thought_ending)
 
-                write_log_file(log_file, indented_content)
+        if prompt_options["entire_file_vs_code_differences"] == "differences":
+            instructions_content: str = wrap_text(CODE_CHANGES)
+        elif prompt_options["entire_file_vs_code_differences"] == "entire":
+            instructions_content: str = wrap_text(ENTIRE_FILE)
+        else:
+            instructions_content: str = ""
 
-                write_log_file(log_file, "\n</context>\n\n")
+        prompt_document.write(write_indented_content(instructions_content))
 
-                write_log_file(log_file, "<instructions>\n")
+        prompt_document.write("\n</instructions>")
 
-                instructions: str = await self.get_instructions() + "\n"
+        with trace_span("prompt.budget"):
+            self.fit_prompt_document_to_budget(prompt_document, prompt_options)
 
-                write_log_file(log_file, write_indented_content(wrap_text(instructions)))
+        return prompt_document
 
-                if is_chain_of_thought:
-                    write_log_file(log_file, write_indented_content(wrap_text(CHAIN_OF_THOUGHT)) + "\n\n")
+    def fit_prompt_document_to_budget(self, prompt_document: PromptDocument, prompt_options: Dict[str, Any]) -> None:
+        try:
+            tokenizer: Optional[BpeTokenizer] = get_configured_tokenizer()
+        except (OSError, ValueError) as e:
+            self.console.print(f"Unable to load tokenizer vocabulary: {str(e)}. Falling back to the token estimate.", style="yellow")
+            tokenizer = None
 
-                if entire_file_vs_code_differences == "differences":
-                    instructions_content: str = wrap_text(CODE_CHANGES)
-                elif entire_file_vs_code_differences == "entire":
-                    instructions_content: str = wrap_text(ENTIRE_FILE)
-                else:
-                    instructions_content: str = ""
+        token_counter: TokenCounter = TokenCounter(tokenizer=tokenizer)
+        token_budget: int = prompt_options.get("token_budget") or get_settings().prompt_token_budget or CLAUDE_CONTEXT_WINDOW
+
+        if token_counter.count_tokens(prompt_document.render()) <= token_budget:
+            return
+
+        candidates: List[PackingCandidate] = self.get_packing_candidates(prompt_document, prompt_options)
+        report: PackingReport = pack_prompt_document(prompt_document, candidates, token_budget, token_counter.count_tokens)
+
+        self.print_packing_report(report)
+
+    def get_packing_candidates(self, prompt_document: PromptDocument, prompt_options: Dict[str, Any]) -> List[PackingCandidate]:
+        start_file: Optional[Path] = prompt_options.get("start_file")
+        is_used_code_only: bool = prompt_options["mode"] == "traverse" and prompt_options["traverse_mode"] != "entire file"
+        distances: Dict[Path, int] = {}
+        used_code_slices: Dict[Path, str] = {}
+
+        if prompt_options["mode"] == "traverse":
+            distances = get_import_distances(start_file, lambda file_path: self.get_local_imports(file_path)[0].keys())
 
-                indented_content: str = write_indented_content(instructions_content)
+            if not is_used_code_only:
+                used_code_slices = self.get_used_code_slices(start_file)
 
-                write_log_file(log_file, indented_content)
+        candidates: List[PackingCandidate] = []
 
-                write_log_file(log_file, "\n</instructions>")
+        for file_path in prompt_document.segments:
+            content: str | None = read_file_content(file_path)
+            level: str = USED_CODE_LEVEL if is_used_code_only and file_path != start_file else FULL_SOURCE_LEVEL
+            alternatives: Dict[str, str] = {}
 
+            if used_code_slices.get(file_path) not in (None, (content or "").strip("\n")):
+                alternatives[USED_CODE_LEVEL] = used_code_slices[file_path]
+
+            if content and file_path.suffix == ".py":
+                try:
+                    alternatives[SIGNATURES_LEVEL] = get_signature_outline(content)
+                except (SyntaxError, ValueError):
+                    pass
+
+            candidates.append(PackingCandidate(file_path, distances.get(file_path, 0), level, alternatives))
+
+        return candidates
+
+    def get_used_code_slices(self, start_file: Path) -> Dict[Path, str]:
+        processed_files: Set[Path] = set(self.processed_files)
+        processed_content: Dict[Path, SpanSet] = {file_path: spans.copy() for file_path, spans in self.processed_content.items()}
+        processed_alias_mapping: Dict[str, str] = dict(self.processed_alias_mapping)
+
+        self.processed_files.clear()
+        self.processed_content.clear()
+        self.processed_alias_mapping.clear()
+
+        used_code_document: PromptDocument = PromptDocument(self.project_root)
+
+        try:
+            self.process_file_used_code_only(start_file, used_code_document)
+        finally:
+            self.processed_files.clear()
+            self.processed_files.update(processed_files)
+            self.processed_content.clear()
+            self.processed_content.update(processed_content)
+            self.processed_alias_mapping.clear()
+            self.processed_alias_mapping.update(processed_alias_mapping)
+
+        return {file_path: segment.get_content().strip("\n") for file_path, segment in used_code_document.segments.items()}
+
+    def print_packing_report(self, report: PackingReport) -> None:
+        lines: List[str] = [
+            f"Estimated {report.initial_tokens:,} tokens against a budget of {report.token_budget:,}. Packed to {report.final_tokens:,} tokens.",
+        ]
+
+        for candidate in report.degraded:
+            lines.append(f"- {candidate.file_path.relative_to(self.project_root)}: {candidate.initial_level} -> {candidate.level}")
+
+        if report.is_over_budget():
+            lines.append("The prompt is still over the budget with every file reduced as far as possible.")
+
+        self.console.print(Panel("\n".join(lines), title="Token budget", style="bold red" if report.is_over_budget() else "bold yellow"))
+
+    def render_prompt_log(self, prompt_options: Dict[str, Any], files_document: Optional[PromptDocument] = None) -> str:
+        with trace_span("prompt.build", mode=prompt_options["mode"]):
+            if files_document is None:
+                prompt_document: PromptDocument = self.build_prompt_document(prompt_options)
             else:
-                self.console.print(f"Invalid mode: {mode}", style="bold red")
-                return
+                prompt_document = self.complete_prompt_document(files_document.copy(), prompt_options)
 
-        self.format_prompt_log()
-        result: dict[str, str] = copy_to_clipboard(prompt_log)
+        with trace_span("prompt.render", output_format=self.output_format):
+            prompt_sink: PromptSink = create_prompt_sink(self.output_format, self.project_root)
+            prompt_sink.write_prompt_document(prompt_document)
+            return prompt_sink.get_content()
 
-        if result["success"]:
-            self.console.print("prompt log has been copied to the clipboard", style="bold green")
+    def write_prompt_log(
+        self, prompt_log: Path, prompt_options: Dict[str, Any], should_copy_to_clipboard: bool = True, files_document: Optional[PromptDocument] = None
+    ) -> None:
+        content: str = self.render_prompt_log(prompt_options, files_document)
+
+        with trace_span("prompt.write", file=prompt_log), open(prompt_log, "w", encoding="utf-8") as log_file:
+            write_log_file(log_file, content)
+
+        if should_copy_to_clipboard:
+            result: dict[str, str] = copy_text_to_clipboard(content)
+
+            if result["success"]:
+                self.console.print("prompt log has been copied to the clipboard", style="bold green")
 
         self.console.print(f"prompt log has been written to {prompt_log}", style="bold green")
 
+    def is_prompt_input(self, file_path: Path, prompt_log: Path, prompt_options: Dict[str, Any]) -> bool:
+        if file_path == prompt_log:
+            return False
+
+        if file_path == self.project_root or file_path in self.processed_files:
+            return True
+
+        if prompt_options["mode"] == "traverse":
+            return file_path.suffix == ".py"
+
+        return any(folder == file_path or folder in file_path.parents for folder in prompt_options["folders"])
+
+    async def watch_prompt_log(self, prompt_log: Path, prompt_options: Dict[str, Any], files_document: PromptDocument | None = None) -> None:
+        file_watcher: FileWatcher = create_file_watcher(self.project_root, self.should_ignore)
+        stop_event: asyncio.Event = asyncio.Event()
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        previous_sigint_handler: Any = signal.getsignal(signal.SIGINT)
+
+        try:
+            loop.add_signal_handler(signal.SIGINT, stop_event.set)
+            is_sigint_handled: bool = True
+        except (NotImplementedError, RuntimeError, ValueError):
+            is_sigint_handled = False
+
+        self.console.print(f"Watching '{self.project_root}' for changes. Press Ctrl+C to stop.", style="bold green")
+
+        try:
+            while not await wait_for_stop(stop_event, file_watcher.poll_interval):
+                changed_files: Set[Path] = file_watcher.get_changes()
+                is_settings_changed: bool = reload_settings_if_changed()
+
+                if not is_settings_changed and not any(self.is_prompt_input(file_path, prompt_log, prompt_options) for file_path in changed_files):
+                    continue
+
+                if is_settings_changed:
+                    files_document = None
+
+                if is_settings_changed and self.apply_reloaded_settings(prompt_options):
+                    file_watcher.close()
+                    file_watcher = create_file_watcher(self.project_root, self.should_ignore)
+                    self.console.print(f"PROJECT_ROOT_PATH changed. Watching '{self.project_root}' for changes.", style="bold green")
+
+                    if prompt_options["mode"] == "traverse" and not path_exists(prompt_options["start_file"]):
+                        self.console.print(f"File {prompt_options['start_file']} does not exist.", style="bold red")
+                        continue
+
+                if await wait_for_stop(stop_event, WATCH_DEBOUNCE_SECONDS):
+                    break
+
+                changed_files |= file_watcher.get_changes()
+                input_files: Set[Path] = {file_path for file_path in changed_files if self.is_prompt_input(file_path, prompt_log, prompt_options)}
+
+                started_at: float = time.perf_counter()
+
+                with trace_span("prompt.update", files=len(input_files)):
+                    is_updated: bool = files_document is not None and self.update_files_document(files_document, input_files, prompt_options)
+
+                if not is_updated:
+                    get_module_index().invalidate()
+
+                    with trace_span("prompt.files", mode=prompt_options["mode"]):
+                        files_document = self.build_files_document(prompt_options)
+
+                self.write_prompt_log(prompt_log, prompt_options, files_document=files_document)
+                self.console.print(
+                    f"Prompt log {'updated' if is_updated else 'regenerated'} in {(time.perf_counter() - started_at) * 1000:.0f} ms", style="bold green"
+                )
+
+            self.console.print("\nStopped watching for changes.", style="bold yellow")
+        except KeyboardInterrupt:
+            self.console.print("\nStopped watching for changes.", style="bold yellow")
+        finally:
+            if is_sigint_handled:
+                loop.remove_signal_handler(signal.SIGINT)
+                signal.signal(signal.SIGINT, previous_sigint_handler)
+
+            file_watcher.close()
+
+    def update_files_document(self, prompt_document: PromptDocument, changed_files: Set[Path], prompt_options: Dict[str, Any]) -> bool:
+        if prompt_options["mode"] == "all":
+            return self.update_folder_files(prompt_document, changed_files)
+
+        for file_path in changed_files:
+            imports_before: Optional[List[Path]] = self.processed_imports.get(file_path)
+
+            if imports_before is None or list(self.get_local_imports(file_path)[0]) != imports_before:
+                return False
+
+        if prompt_options["traverse_mode"] == "entire file":
+            return self.update_traversed_files(prompt_document, changed_files)
+
+        return self.update_used_code_files(prompt_document, changed_files, prompt_options["start_file"])
+
+    def update_folder_files(self, prompt_document: PromptDocument, changed_files: Set[Path]) -> bool:
+        for file_path in changed_files:
+            content: str | None = self.read_text_file_content(file_path) if file_path in prompt_document.segments else None
+
+            if content is None or not prompt_document.replace_unique_file(file_path, content):
+                return False
+
+        return True
+
+    def update_traversed_files(self, prompt_document: PromptDocument, changed_files: Set[Path]) -> bool:
+        for file_path in changed_files:
+            content: str | None = self.read_text_file_content(file_path) if file_path in prompt_document.segments else None
+
+            if content is None:
+                return False
+
+            prompt_document.segments[file_path].replace(content)
+
+        return True
+
+    def update_used_code_files(self, prompt_document: PromptDocument, changed_files: Set[Path], start_file: Path) -> bool:
+        reached_names_before, full_modules_before = self.reached_symbols
+        symbol_graph: SymbolGraph | None = self.symbol_graph
+
+        if symbol_graph is None or not changed_files <= reached_names_before.keys():
+            return False
+
+        with trace_span("reachability", file=start_file):
+            symbol_graph.invalidate(changed_files)
+            reached_names, full_modules = symbol_graph.find_reachable_symbols(start_file)
+
+        if list(reached_names) != list(reached_names_before):
+            return False
+
+        self.reached_symbols = (reached_names, full_modules)
+
+        for file_path in reached_names:
+            if file_path == start_file:
+                if file_path in changed_files:
+                    content: str | None = read_file_content(file_path)
+
+                    if content is None:
+                        return False
+
+                    prompt_document.segments[file_path].replace(content)
+                continue
+
+            is_full_module: bool = file_path in full_modules
+
+            if file_path not in changed_files and reached_names[file_path] == reached_names_before[file_path] and is_full_module == (file_path in full_modules_before):
+                continue
+
+            self.processed_content[file_path] = SpanSet()
+            code: str | None = self.get_used_code(file_path, symbol_graph, reached_names, full_modules)
+
+            if (code is None) != (file_path not in prompt_document.segments):
+                return False
+
+            if code is not None:
+                prompt_document.segments[file_path].replace(code)
+
+        return True
+
+    def apply_reloaded_settings(self, prompt_options: Dict[str, Any]) -> bool:
+        settings: Settings = get_settings()
+
+        if settings.output_code_format:
+            self.output_format = settings.output_code_format.strip()
+
+        if settings.chain_of_thought is not None:
+            prompt_options["is_chain_of_thought"] = settings.chain_of_thought
+
+        project_root: Path | None = settings.project_root_path
+
+        if project_root is None or project_root == self.project_root or not is_path_directory(project_root):
+            return False
+
+        if prompt_options["mode"] == "traverse":
+            prompt_options["start_file"] = self.rebase_path(prompt_options["start_file"], project_root)
+        else:
+            prompt_options["folders"] = [self.rebase_path(folder, project_root) for folder in prompt_options["folders"]]
+
+        self.project_root = project_root
+        self.gitignore_matcher = get_gitignore_matcher(project_root)
+        get_module_index().invalidate()
+
+        return True
+
+    def rebase_path(self, path: Path, project_root: Path) -> Path:
+        try:
+            return project_root / path.relative_to(self.project_root)
+        except ValueError:
+            return path
+
     async def get_ending_context(self) -> str:
         return await get_user_input("Enter a message to be written as context at the end of the prompt.log file", multiline=True)
 
     async def get_instructions(self) -> str:
         return await get_user_input("Enter a message to be written as instructions at the end of the prompt.log file", multiline=True)
 
-    def should_ignore(self, file_path: Path) -> bool:
-        return should_ignore_file(file_path, self.project_root, self.ignore_patterns, ALLOWED_FILES)
+    def should_ignore(self, file_path: Path, is_dir: Optional[bool] = None) -> bool:
+        with trace_aggregate("gitignore"):
+            return should_ignore_file(file_path, self.gitignore_matcher, ALLOWED_FILES, is_dir)
+
+    def process_multiple_folders(self, folders: List[Path], prompt_document: PromptDocument) -> None:
+        walked_folders: List[Path] = []
 
-    def process_multiple_folders(self, folders: List[Path], log_file) -> None:
         for folder in folders:
             if not path_exists(folder) or not is_path_directory(folder):
                 self.console.print(f"Folder {folder} does not exist or is not a directory. Skipping.", style="bold yellow")
                 continue
-            self.process_folder(folder, log_file)
-            write_log_file(log_file, "\n")
 
-    def process_folder(self, folder_path: Path, log_file) -> None:
-        for file_path in get_files_match_pattern(folder_path, "*"):
-            if file_path.is_file() and not self.should_ignore(file_path):
-                self.write_file_content(file_path, log_file)
+            folder = Path(os.path.normpath(folder))
 
-    def write_file_content(self, file_path: Path, log_file) -> None:
-        if not is_text_file_mimetype_or_allowed_file(file_path, ALLOWED_FILES):
-            return
+            if any(folder == walked_folder or walked_folder in folder.parents for walked_folder in walked_folders):
+                continue
+
+            self.process_folder(folder, prompt_document, {walked_folder for walked_folder in walked_folders if folder in walked_folder.parents})
+            walked_folders.append(folder)
+            prompt_document.write("\n")
+
+    def process_folder(self, folder_path: Path, prompt_document: PromptDocument, walked_folders: Set[Path]) -> None:
+        with trace_span("walk", folder=folder_path):
+            for file_path in walk_files(folder_path, lambda path, is_dir: (is_dir and path in walked_folders) or self.should_ignore(path, is_dir)):
+                self.write_file_content(file_path, prompt_document, is_deduplicated=True)
+
+    def read_text_file_content(self, file_path: Path) -> str | None:
+        with trace_span("read", file=file_path):
+            if not is_text_file(file_path, ALLOWED_FILES, get_settings().max_prompt_file_bytes):
+                return None
+
+            return read_file_content(file_path)
 
-        content: str | None = read_file_content(file_path)
+    def write_file_content(self, file_path: Path, prompt_document: PromptDocument, is_deduplicated: bool = False) -> None:
+        content: str | None = self.read_text_file_content(file_path)
 
         if content is None:
             return
 
-        write_log_file(log_file, create_dashed_filename_marker(file_path, self.project_root))
-        write_log_file(log_file, content)
-        write_log_file(log_file, create_dashed_filename_end_marker(file_path, self.project_root))
-        write_log_file(log_file, "\n\n")
+        if is_deduplicated:
+            prompt_document.add_unique_file(file_path, content)
+        else:
+            prompt_document.add_file(file_path, content)
 
-    def process_file(self, file_path: Path, log_file) -> None:
+    def process_file(self, file_path: Path, prompt_document: PromptDocument) -> None:
         if file_path in self.processed_files or self.should_ignore(file_path):
             return
 
         self.processed_files.add(file_path)
 
-        self.write_file_content(file_path, log_file)
+        self.write_file_content(file_path, prompt_document)
 
         if self.get_mode() == "traverse":
             local_imports, _, alias_mapping = self.get_local_imports(file_path)
             self.processed_alias_mapping.update(alias_mapping)
             for import_path, _ in local_imports.items():
-                self.process_file(import_path, log_file)
+                self.process_file(import_path, prompt_document)
 
-    def process_file_used_code_only(self, file_path: Path, log_file) -> None:
+    def process_file_used_code_only(self, file_path: Path, prompt_document: PromptDocument) -> None:
         if file_path in self.processed_files or self.should_ignore(file_path):
             return
 
         self.processed_files.add(file_path)
 
-        content: str = read_file_content(file_path)
+        with trace_span("read", file=file_path):
+            content: str = read_file_content(file_path)
+
+        prompt_document.add_file(file_path, content)
+
+        with trace_span("reachability", file=file_path):
+            symbol_graph: SymbolGraph = SymbolGraph(self.project_root, self.gitignore_matcher, ALLOWED_FILES, self.should_ignore)
+            reached_names, full_modules = symbol_graph.find_reachable_symbols(file_path)
+
+        self.symbol_graph = symbol_graph
+        self.reached_symbols = (reached_names, full_modules)
+
+        self.process_reached_imports(file_path, symbol_graph, reached_names, full_modules, prompt_document)
 
-        write_log_file(log_file, create_dashed_filename_marker(file_path, self.project_root))
-        write_log_file(log_file, content)
-        write_log_file(log_file, create_dashed_filename_end_marker(file_path, self.project_root))
-        write_log_file(log_file, "\n\n")
+        for reached_path in reached_names:
+            if reached_path not in self.processed_files:
+                self.processed_files.add(reached_path)
+                self.process_import_file(reached_path, symbol_graph, reached_names, full_modules, prompt_document)
 
-        imports, programatically_imports, alias_mapping = self.get_local_imports(file_path)
+    def process_reached_imports(
+        self,
+        file_path: Path,
+        symbol_graph: SymbolGraph,
+        reached_names: Dict[Path, Set[str]],
+        full_modules: Set[Path],
+        prompt_document: PromptDocument,
+    ) -> None:
+        imports, _, alias_mapping = self.get_local_imports(file_path)
         self.processed_alias_mapping.update(alias_mapping)
-        for import_path, imported_names in imports.items():
-            self.process_import_file(import_path, imported_names, file_path, log_file, programatically_imports, alias_mapping)
+
+        for import_path in imports:
+            if import_path in self.processed_files or import_path not in reached_names:
+                continue
+
+            self.processed_files.add(import_path)
+            self.process_import_file(import_path, symbol_graph, reached_names, full_modules, prompt_document)
+            self.process_reached_imports(import_path, symbol_graph, reached_names, full_modules, prompt_document)
 
     def process_import_file(
         self,
         import_path: Path,
-        imported_names: Set[str],
-        importing_file: Path,
-        log_file,
-        programatically_imports: Dict[Path, Set[str]],
-        alias_mapping: Dict[str, str],
+        symbol_graph: SymbolGraph,
+        reached_names: Dict[Path, Set[str]],
+        full_modules: Set[Path],
+        prompt_document: PromptDocument,
     ) -> None:
-        if self.should_ignore(import_path):
-            return
+        code: str | None = self.get_used_code(import_path, symbol_graph, reached_names, full_modules)
+
+        if code is not None:
+            prompt_document.append_to_file(import_path, code)
 
-        content: str = read_file_content(import_path)
+    def get_used_code(self, import_path: Path, symbol_graph: SymbolGraph, reached_names: Dict[Path, Set[str]], full_modules: Set[Path]) -> str | None:
+        with trace_span("read", file=import_path):
+            content: str = read_file_content(import_path)
 
         if content is None:
-            return
+            return None
 
-        tree = ast.parse(content, type_comments=True)
+        with trace_span("used_code", file=import_path):
+            used_nodes: List[NodeSummary] = symbol_graph.get_used_nodes(import_path, reached_names[import_path], import_path in full_modules)
 
-        _, used_nodes = get_unused_code_nodes(content, imported_names, import_path, programatically_imports, alias_mapping, tree=tree)
+        emitted_spans: SpanSet = self.processed_content.setdefault(import_path, SpanSet())
+        import_spans: List[Span] = []
+        non_import_spans: List[Span] = []
 
-        new_nodes = []
         for node in used_nodes:
-            if isinstance(
-                node,
-                (
-                    ast.ClassDef,
-                    ast.FunctionDef,
-                    ast.AsyncFunctionDef,
-                    ast.Assign,
-                    ast.AnnAssign,
-                    ast.Import,
-                    ast.ImportFrom,
-                ),
-            ):
-                node_representation: str = ast.dump(node)
-                if node_representation not in self.processed_content.get(import_path, set()):
-                    self.processed_content.setdefault(import_path, set()).add(node_representation)
-                    new_nodes.append(node)
-            else:
-                continue
-
-        if new_nodes:
-            import_snippets: List[ast.AST] = []
-            non_import_snippets: List[ast.AST] = []
-            for node in new_nodes:
-                source_segment: str | None = get_node_source_code_with_decorators(content, node)
-                if source_segment is None:
-                    source_segment = ast.unparse(node)
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    import_snippets.append(source_segment)
+            if node.kind in EMITTED_NODE_KINDS and emitted_spans.add(node.span):
+                if node.kind in ("Import", "ImportFrom"):
+                    import_spans.append(node.span)
                 else:
-                    non_import_snippets.append(source_segment)
+                    non_import_spans.append(node.span)
 
-            code_parts = []
-            if import_snippets:
-                code_parts.append("\n".join(import_snippets))
-                code_parts.append("")
-            if non_import_snippets:
-                code_parts.append("\n\n".join(non_import_snippets))
+        if not import_spans and not non_import_spans:
+            return None
 
-            code = "\n".join(code_parts)
+        with trace_span("snippets", file=import_path):
+            source_view: SourceView = SourceView(content)
+            import_snippets: List[str] = [source_view.get_source(span) for span in merge_adjacent_spans(source_view, import_spans)]
+            non_import_snippets: List[str] = [source_view.get_source(span) for span in merge_adjacent_spans(source_view, non_import_spans)]
 
-            log_file_content: str = read_log_file(log_file)
-            file_marker: str = create_dashed_filename_marker(import_path, self.project_root, blank_lines=False)
-            ending_marker: str = create_dashed_filename_end_marker(import_path, self.project_root, blank_lines=False)
-            updated_content: str = update_content_dashed_marker(log_file_content, file_marker, code, ending_marker)
-            write_log_file_from_start(log_file, updated_content)
+        code_parts = []
+        if import_snippets:
+            code_parts.append("\n".join(import_snippets))
+            code_parts.append("")
+        if non_import_snippets:
+            code_parts.append("\n\n".join(non_import_snippets))
 
-        if import_path not in self.processed_files:
-            self.processed_files.add(import_path)
-            new_imports, programatically_imports, alias_mapping = self.get_local_imports(import_path)
-            self.processed_alias_mapping.update(alias_mapping)
-            for new_import_path, new_imported_names in new_imports.items():
-                self.process_import_file(
-                    new_import_path,
-                    new_imported_names,
-                    import_path,
-                    log_file,
-                    programatically_imports,
-                    alias_mapping,
-                )
+        return "\n".join(code_parts)
 
     def get_local_imports(self, file_path: Path) -> Tuple[Dict[Path, Set[str]], Dict[Path, Set[str]], Dict[str, str]]:
-        content: str | None = read_file_content(file_path)
+        with trace_span("read", file=file_path):
+            content: str | None = read_file_content(file_path)
 
         if content is None:
             return {}, {}, {}
 
-        return get_local_imports_from_content(content, file_path, self.project_root, self.ignore_patterns, ALLOWED_FILES)
-
-    def format_prompt_log(self):
-        prompt_log_path = self.project_root / self.prompt_log_name
-        try:
-            content: str = read_file_content(prompt_log_path)
-
-            formatted_content: str = remove_non_printable_characters(content)
-            lines: list[str] = content.split("\n")
-            formatted_content: str = remove_blank_lines_from_code_lines(lines)
-
-            with open(prompt_log_path, "w", encoding="utf-8") as file:
-                file.write(formatted_content)
-
-            if self.output_format.upper() == "XML":
-                self.transform_prompt_log_to_xml(prompt_log_path)
-
-            self.console.print("Prompt log has been formatted and unexpected characters removed.", style="bold green")
-
-        except Exception as e:
-            self.console.print(f"An error occurred while formatting the prompt log: {str(e)}", style="bold red")
-
-    def transform_prompt_log_to_xml(self, prompt_log_path: Path) -> None:
-        try:
-            content: str = read_file_content(prompt_log_path)
-            documents: List[Dict[str, object]] = []
-            index: int = 1
-
-            pattern: re.Pattern = re.compile(r"^--- Filename (.*?) ---\n(.*?)^--- End of Filename \1 ---", re.DOTALL | re.MULTILINE)
-            matches: List[tuple[str, str]] = pattern.findall(content)
-
-            for match in matches:
-                source: str = match[0].strip()
-                document_content: str = match[1].rstrip()
-                documents.append({"index": index, "source": source, "content": document_content})
-                index += 1
-
-            remaining_content = pattern.sub("", content).strip()
-
-            xml_elements: List[str] = ["<documents>"]
-
-            for doc in documents:
-                code_lines = doc["content"].splitlines()
-                indented_code_lines = ["      " + line for line in code_lines]
-                indented_content = "\n".join(indented_code_lines)
-
-                xml_element: str = (
-                    f'  <document index="{doc["index"]}">\n'
-                    f'    <source>{doc["source"]}</source>\n'
-                    f"    <document_content>"
-                    f"{indented_content}\n"
-                    f"    </document_content>\n"
-                    f"  </document>"
-                )
-                xml_elements.append(xml_element)
-
-            xml_elements.append("</documents>")
+        local_imports = get_local_imports_from_content(content, file_path, self.project_root, self.gitignore_matcher, ALLOWED_FILES)
+        self.processed_imports[file_path] = list(local_imports[0])
 
-            xml_content: str = "\n".join(xml_elements)
-
-            if remaining_content:
-                final_content = f"{xml_content}\n\n{remaining_content}"
-            else:
-                final_content = xml_content
-
-            with open(prompt_log_path, "w", encoding="utf-8") as file:
-                file.write(final_content)
-
-            self.console.print("Prompt log has been transformed into XML format.", style="bold green")
-
-        except Exception as e:
-            self.console.print(f"An error occurred while transforming the prompt log to XML: {str(e)}", style="bold red")
+        return local_imports
 
     async def set_project_root(self) -> None:
-        if DEFAULT_PROJECT_ROOT:
-            self.project_root = DEFAULT_PROJECT_ROOT
+        if get_settings().project_root_path:
+            self.project_root = get_settings().project_root_path
             return
 
         project_root_input: str = await get_user_input("Enter the project root path (leave blank for prompter project): ", default=str(self.project_root))
@@ -449,8 +726,8 @@ class PromptConstructorCommand(BaseCommand):
             self.project_root = Path(__file__).resolve().parents[5]
 
     async def get_prompt_log_path(self) -> Path | None:
-        if DEFAULT_PROMPT_PATH:
-            return DEFAULT_PROMPT_PATH
+        if get_settings().prompt_root_path:
+            return get_settings().prompt_root_path
 
         output_path_input: str = await get_user_input(
             "Enter the path where to save the prompt.log file (leave blank for default): ", default=str(self.project_root / self.prompt_log_name)
@@ -459,10 +736,12 @@ class PromptConstructorCommand(BaseCommand):
         return Path(output_path_input).resolve()
 
     async def get_output_format(self) -> str:
-        if not self.output_format:
+        output_format: str | None = get_settings().output_code_format or self.output_format
+
+        if not output_format:
             return await get_user_input("Choose output format:", choices=["Filename", "XML"], default="Filename")
 
-        return self.output_format.strip()
+        return output_format.strip()
 
     def get_mode(self) -> str:
         return getattr(self, "_mode", "all")
@@ -1,33 +1,47 @@
-import importlib
-import pkgutil
-from typing import Dict, Any
-from types import ModuleType
+from typing import List, Optional, Tuple
+import time
 
 from rich.console import Console
 from rich.panel import Panel
 
-from src.apps.console.classes.commands.base import BaseCommand
+from src.apps.console.classes.command_registry import COMMAND_MANIFEST, CommandRegistry
 from src.libs.helpers.console import get_user_input
 
-
-def load_commands(app: "ConsoleApp") -> Dict[str, BaseCommand]:
-    commands: Dict[str, BaseCommand] = {}
-    package: ModuleType = importlib.import_module("src.apps.console.classes.commands")
-    for _, module_name, _ in pkgutil.iter_modules(package.__path__):
-        module: ModuleType = importlib.import_module(f"src.apps.console.classes.commands.{module_name}")
-        for item_name in dir(module):
-            item: Any = getattr(module, item_name)
-            if isinstance(item, type) and issubclass(item, BaseCommand) and item is not BaseCommand:
-                command: BaseCommand = item(app)
-                commands[command.name] = command
-    return commands
+STARTUP_BUDGET_SECONDS: float = 0.5
 
 
 class ConsoleApp:
-    def __init__(self):
+    def __init__(self, started_at: Optional[float] = None):
         self.console: Console = Console()
         self.running: bool = True
-        self.commands: Dict[str, BaseCommand] = load_commands(self)
+        self.commands: CommandRegistry = CommandRegistry(self, COMMAND_MANIFEST)
+        self.started_at: Optional[float] = started_at
+        self.startup_seconds: Optional[float] = None
+
+    def check_startup_budget(self) -> None:
+        if self.started_at is None or self.startup_seconds is not None:
+            return
+
+        self.startup_seconds = time.perf_counter() - self.started_at
+
+        if self.startup_seconds > STARTUP_BUDGET_SECONDS:
+            self.console.print(
+                f"Startup took {self.startup_seconds * 1000:.0f} ms, over the budget of {STARTUP_BUDGET_SECONDS * 1000:.0f} ms to the first prompt.", style="yellow"
+            )
+
+    def parse_command(self, user_input: str) -> Optional[Tuple[str, List[str]]]:
+        stripped_input: str = user_input.strip()
+        lowered_input: str = stripped_input.lower()
+
+        if lowered_input in self.commands:
+            return lowered_input, []
+
+        for name in sorted(self.commands, key=len, reverse=True):
+            if lowered_input.startswith(f"{name} "):
+                args: List[str] = stripped_input[len(name) :].split()
+                return name, args
+
+        return None
 
     async def run(self) -> None:
         self.console.print(Panel("Welcome to the Console App!", title="Welcome", style="bold green"))
@@ -35,19 +49,22 @@ class ConsoleApp:
 
         while self.running:
             try:
+                self.check_startup_budget()
                 user_input: str = await get_user_input("You: ")
-                command: str = user_input.lower().strip()
+                parsed_command: Optional[Tuple[str, List[str]]] = self.parse_command(user_input)
 
-                if command not in self.commands:
+                if parsed_command is None:
                     self.console.print(Panel("Unknown command. Type 'help' to see available commands.", title="Error", style="bold red"))
                     continue
 
+                command, args = parsed_command
+
                 if command == "exit":
                     await self.commands["exit"].execute()
                     return
 
                 try:
-                    await self.commands[command].execute()
+                    await self.commands[command].execute(*args)
                 except KeyboardInterrupt:
                     self.console.print("\nCommand execution stopped. Going back to main menu.", style="bold yellow")
                     continue
@@ -0,0 +1,329 @@
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+from rich.console import Console
+
+from src.apps.console.classes.batch_app import BatchApp, normalize_job
+from src.apps.console.classes.commands.prompt import PromptConstructorCommand
+from src.libs.utils.configuration import get_settings, reload_settings_if_changed
+from src.libs.utils.constants import ALLOWED_FILES
+from src.libs.utils.file_system import should_ignore_file, write_log_file
+from src.libs.utils.file_watcher import FileWatcher, create_file_watcher
+from src.libs.utils.module_index import get_module_index
+from src.libs.utils.tracing import trace_span
+
+DEFAULT_SOCKET_PATH: Path = Path(tempfile.gettempdir()) / f"rce-daemon-{os.getuid()}.sock"
+SOCKET_UMASK: int = 0o177
+MAX_REQUEST_BYTES: int = 1024 * 1024
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message).encode("utf-8") + b"\n"
+
+
+"""
+    Sends a single request to a running daemon and waits for its response.
+
+    Args:
+        socket_path (Path): The Unix socket the daemon listens on.
+        request (Dict[str, Any]): The request, as described in 'DaemonApp'.
+        timeout (Optional[float]): Seconds to wait for the connection and the response. Waits indefinitely by default.
+
+    Returns:
+        Dict[str, Any]: The response of the daemon.
+"""
+
+
+def send_daemon_request(socket_path: Path, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(str(socket_path))
+        client.sendall(encode_message(request))
+
+        with client.makefile("rb") as response_file:
+            response_line: bytes = response_file.readline()
+
+    if not response_line:
+        raise ConnectionError("The daemon closed the connection without answering.")
+
+    return json.loads(response_line)
+
+
+def prepare_socket_path(socket_path: Path) -> None:
+    if not socket_path.exists():
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        return
+
+    try:
+        send_daemon_request(socket_path, {"command": "ping"}, timeout=1)
+    except OSError:
+        socket_path.unlink()
+        return
+
+    raise ValueError(f"A daemon is already listening on '{socket_path}'.")
+
+
+"""
+    Long-running server that keeps the state of the batch mode warm between requests from editors and scripts.
+
+    Clients connect to a Unix domain socket and exchange newline-delimited JSON: every line sent is one request and is
+    answered by one line, '{"id": ..., "ok": true, "result": {...}}' or '{"id": ..., "ok": false, "error": "..."}',
+    where 'id' echoes the optional 'id' of the request. A connection may send any number of requests.
+
+    - 'prompt' takes the keys of a batch prompt job and returns the rendered prompt as 'content' together with its
+      'tokens'. The prompt log is written only when the request names an 'output'.
+    - 'context' takes a 'path' and returns its token count, with the breakdown by extension and directory for folders.
+    - 'invalidate' drops everything known about a 'project_root', 'ping' lists the watched projects and 'shutdown' stops
+      the daemon.
+
+    Every project root gets a file watcher the first time it is used. Before a prompt is built the changes since the
+    previous request are collected: any change clears the module index, and a changed '.gitignore' also rebuilds the
+    gitignore matcher and the watcher of that project. Parsed modules and token counts are validated against the file
+    stats on every lookup, so only the changed files are analyzed again.
+
+    Any number of clients can be connected at once. Requests are read and answered on the event loop, while prompt and
+    context requests run one at a time on a worker thread, because they share the command instances and their caches;
+    'ping' and 'shutdown' are answered immediately even while a long prompt is being built. On shutdown the daemon stops
+    accepting connections, lets requests that are already running finish and closes every connection.
+"""
+
+
+class DaemonApp(BatchApp):
+    def __init__(self) -> None:
+        super().__init__(quiet=True)
+        self.status_console: Console = Console(stderr=True)
+        self.file_watchers: Dict[Path, FileWatcher] = {}
+        self.job_lock: Optional[asyncio.Lock] = None
+        self.stopped: Optional[asyncio.Event] = None
+        self.clients: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    def watch_project(self, project_root: Path) -> None:
+        if project_root in self.file_watchers:
+            return
+
+        self.file_watchers[project_root] = create_file_watcher(
+            project_root, lambda path, is_dir: should_ignore_file(path, self.get_gitignore_matcher(project_root), ALLOWED_FILES, is_dir)
+        )
+
+    def invalidate_project(self, project_root: Path) -> None:
+        file_watcher: Optional[FileWatcher] = self.file_watchers.pop(project_root, None)
+
+        if file_watcher is not None:
+            file_watcher.close()
+
+        self.gitignore_matchers.pop(project_root, None)
+        get_module_index().invalidate()
+
+    def refresh_project(self, project_root: Path) -> None:
+        if project_root not in self.file_watchers:
+            self.watch_project(project_root)
+            return
+
+        changes: Set[Path] = self.file_watchers[project_root].get_changes()
+
+        if not changes:
+            return
+
+        if any(path == project_root or path.name == ".gitignore" for path in changes):
+            self.invalidate_project(project_root)
+            self.watch_project(project_root)
+        else:
+            get_module_index().invalidate()
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if request.get("command") == "invalidate":
+            project_root: Path = Path(request.get("project_root") or get_settings().project_root_path or Path.cwd()).resolve()
+            self.invalidate_project(project_root)
+            return {"project_root": str(project_root)}
+
+        job: Dict[str, Any] = normalize_job(request)
+
+        if job["command"] == "context":
+            return self.count_path_tokens(job["path"])
+
+        return self.build_prompt(job, bool(request.get("output")))
+
+    def trace_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        reload_settings_if_changed()
+
+        with trace_span("request", command=request.get("command"), id=request.get("id")):
+            return self.handle_request(request)
+
+    def build_prompt(self, job: Dict[str, Any], should_write_prompt_log: bool) -> Dict[str, Any]:
+        with trace_span("watch.refresh", project_root=job["project_root"]):
+            self.refresh_project(job["project_root"])
+
+        command: PromptConstructorCommand = self.prepare_prompt_command(job)
+        content: str = command.render_prompt_log(job["prompt_options"])
+        output: Optional[str] = None
+
+        if should_write_prompt_log:
+            job["output"].parent.mkdir(parents=True, exist_ok=True)
+
+            with open(job["output"], "w", encoding="utf-8") as log_file:
+                write_log_file(log_file, content)
+
+            output = str(job["output"])
+
+        return {"content": content, "tokens": self.context_command.estimate_tokens(content), "output": output}
+
+    def count_path_tokens(self, path: Path) -> Dict[str, Any]:
+        if path.is_file():
+            return {"path": str(path), "tokens": self.context_command.count_tokens_in_file(path), "files": 1, "skipped": 0}
+
+        token_count, file_count, skipped_count, extension_tokens, directory_tokens = self.context_command.count_tokens_in_folder(path)
+
+        return {
+            "path": str(path),
+            "tokens": token_count,
+            "files": file_count,
+            "skipped": skipped_count,
+            "extensions": extension_tokens,
+            "directories": directory_tokens,
+        }
+
+    async def handle_message(self, line: bytes) -> Dict[str, Any]:
+        try:
+            request: Any = json.loads(line)
+        except ValueError as e:
+            return {"id": None, "ok": False, "error": f"Invalid JSON: {str(e)}"}
+
+        if not isinstance(request, dict):
+            return {"id": None, "ok": False, "error": "A request must be a JSON object."}
+
+        request_id: Any = request.get("id")
+        command: Any = request.get("command")
+
+        if command == "ping":
+            return {"id": request_id, "ok": True, "result": {"projects": sorted(str(project_root) for project_root in list(self.file_watchers))}}
+
+        if command == "shutdown":
+            self.stopped.set()
+            return {"id": request_id, "ok": True, "result": {}}
+
+        started_at: float = time.perf_counter()
+
+        try:
+            async with self.job_lock:
+                result: Dict[str, Any] = await asyncio.to_thread(self.trace_request, request)
+        except Exception as e:
+            return {"id": request_id, "ok": False, "error": str(e)}
+
+        result["seconds"] = time.perf_counter() - started_at
+        return {"id": request_id, "ok": True, "result": result}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        client_task: asyncio.Task = asyncio.current_task()
+        self.clients[client_task] = writer
+
+        try:
+            while True:
+                try:
+                    line: bytes = await reader.readline()
+                except ValueError:
+                    writer.write(encode_message({"id": None, "ok": False, "error": f"Requests are limited to {MAX_REQUEST_BYTES} bytes."}))
+                    await writer.drain()
+                    break
+
+                if not line:
+                    break
+
+                if not line.strip():
+                    continue
+
+                writer.write(encode_message(await self.handle_message(line)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.pop(client_task, None)
+            writer.close()
+
+    async def close_clients(self) -> None:
+        for writer in self.clients.values():
+            writer.close()
+
+        await asyncio.gather(*self.clients, return_exceptions=True)
+
+    async def serve(self, socket_path: Path, project_roots: List[Path]) -> None:
+        for project_root in project_roots:
+            if not project_root.is_dir():
+                raise ValueError(f"The project root '{project_root}' is not a valid directory.")
+
+            self.watch_project(project_root)
+
+        prepare_socket_path(socket_path)
+
+        self.job_lock = asyncio.Lock()
+        self.stopped = asyncio.Event()
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, self.stopped.set)
+
+        previous_umask: int = os.umask(SOCKET_UMASK)
+        try:
+            server: asyncio.AbstractServer = await asyncio.start_unix_server(self.handle_client, path=str(socket_path), limit=MAX_REQUEST_BYTES)
+        finally:
+            os.umask(previous_umask)
+
+        try:
+            async with server:
+                self.status_console.print(f"Listening on '{socket_path}'. Press Ctrl+C to stop.", style="bold green")
+                await self.stopped.wait()
+                server.close()
+                await self.close_clients()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+            for file_watcher in self.file_watchers.values():
+                file_watcher.close()
+
+            self.status_console.print("Daemon stopped.", style="bold yellow")
+
+
+"""
+    Entry point of the 'daemon' and 'request' commands.
+
+    'daemon' serves requests until it receives 'shutdown', SIGINT or SIGTERM. 'request' sends one JSON request, given as
+    an argument or on standard input, to a running daemon and prints the response.
+
+    Args:
+        arguments (Namespace): The parsed command line arguments.
+
+    Returns:
+        int: Exit code, 0 on success, 1 when the daemon could not start or the request failed.
+"""
+
+
+def run_daemon_command(arguments: Namespace) -> int:
+    socket_path: Path = Path(arguments.socket or get_settings().daemon_socket_path or DEFAULT_SOCKET_PATH)
+    console: Console = Console(stderr=True)
+
+    if arguments.command == "request":
+        try:
+            request: Any = json.loads(arguments.request if arguments.request is not None else sys.stdin.read())
+            response: Dict[str, Any] = send_daemon_request(socket_path, request)
+        except (OSError, ValueError) as e:
+            console.print(f"Request failed: {str(e)}", style="bold red")
+            return 1
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        return 0 if response.get("ok") else 1
+
+    try:
+        asyncio.run(DaemonApp().serve(socket_path, [Path(project_root).resolve() for project_root in arguments.project_roots or []]))
+    except (OSError, ValueError) as e:
+        console.print(f"Unable to start the daemon: {str(e)}", style="bold red")
+        return 1
+
+    return 0
@@ -1,8 +1,11 @@
 import asyncio
 import sys
+import time
 from pathlib import Path
 from os import PathLike
-from typing import Coroutine, NoReturn
+from typing import Coroutine, List, NoReturn
+
+STARTED_AT: float = time.perf_counter()
 
 
 project_root: PathLike = Path(__file__).resolve().parents[3]
@@ -11,14 +14,28 @@ src_path: PathLike = project_root / "src"
 sys.path.append(str(project_root))
 sys.path.append(str(src_path))
 
-# flake8: noqa: E402
-from src.apps.console.classes.console_app import ConsoleApp
-
 
 async def main() -> Coroutine[None, None, NoReturn]:
-    app: ConsoleApp = ConsoleApp()
+    from src.apps.console.classes.console_app import ConsoleApp
+
+    app: ConsoleApp = ConsoleApp(started_at=STARTED_AT)
     await app.run()
 
 
-if __name__ == "__main__":
+"""
+    Without arguments the interactive console starts. With arguments the prompt and context commands run headless, for
+    example 'main.py prompt --start-file src/apps/console/main.py' or 'main.py batch jobs.yaml --workers 4'.
+"""
+
+
+def run_cli(argv: List[str]) -> None:
+    if argv:
+        from src.apps.console.classes.batch_app import run_batch
+
+        sys.exit(run_batch(argv))
+
     asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run_cli(sys.argv[1:])
@@ -12,7 +12,7 @@ style: Style = Style.from_dict(
         "prompt": "cyan bold",
     }
 )
-session: PromptSession[str] = PromptSession(style=style)
+session: Optional[PromptSession[str]] = None
 console: Console = Console()
 
 kb = KeyBindings()
@@ -34,9 +34,24 @@ def _(event) -> None:
     event.app.exit(result=event.app.current_buffer.text)
 
 
-async def get_user_input(prompt: str, choices: Optional[List[str]] = None, default: Optional[str] = None, multiline: bool = False) -> Union[str, None]:
+"""
+    Returns the prompt session, creating it on first use. Building a 'PromptSession' probes the terminal, so headless
+    runs that never ask for input must not create one.
+"""
+
+
+def get_prompt_session() -> PromptSession[str]:
     global session
 
+    if session is None:
+        session = PromptSession(style=style)
+
+    return session
+
+
+async def get_user_input(prompt: str, choices: Optional[List[str]] = None, default: Optional[str] = None, multiline: bool = False) -> Union[str, None]:
+    session: PromptSession[str] = get_prompt_session()
+
     if not multiline and not choices:
         return await session.prompt_async(prompt, multiline=False)
 
@@ -1,33 +1,152 @@
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Any
+from queue import SimpleQueue
+from typing import Any, Dict, Optional
+import atexit
 import json
+import logging
+import os
+import sys
 
-from src.libs.utils.configuration import get_config_value
+from src.libs.utils.configuration import Settings, get_settings
 
-LOGGING_LEVEL = get_config_value("LOGGING_LEVEL", "debug")
-ENVIRONMENT = get_config_value("ENVIRONMENT", "development")
+LOGGER_NAME: str = "react_component_engineer"
+RAW_LOG_PATH: Path = Path(__file__).resolve().parents[4] / "raw.log"
+RAW_LOG_MAX_BYTES: int = 10 * 1024 * 1024
+RAW_LOG_BACKUP_COUNT: int = 3
+RAW_LOG_FORMAT: str = "%(asctime)s %(levelname)s %(message)s"
+LOG_LEVELS: Dict[str, int] = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
 
 
-def log(message: Any) -> None:
-    if ENVIRONMENT == "production" or LOGGING_LEVEL == "none":
-        return
+"""
+    Message wrapper that formats an arbitrary object only when a log record is actually emitted.
+
+    Objects with attributes are written as the JSON of their '__dict__', everything else with 'str'.
+"""
+
+
+class LazyMessage:
+    def __init__(self, message: Any) -> None:
+        self.message: Any = message
+
+    def __str__(self) -> str:
+        if hasattr(self.message, "__dict__"):
+            return json.dumps(self.message.__dict__, default=str, indent=2)
+
+        return str(self.message)
+
+
+"""
+    Logging setup of the application, built on the standard 'logging' module.
+
+    'LOGGING_LEVEL' selects the level ('debug', 'info', 'warning', 'error', 'critical' or 'none'), and nothing is logged
+    in production. Every record at or above that level is written to 'raw.log' by a background thread, through a queue,
+    so a log call never waits on the file system. The file is rotated once it reaches 'RAW_LOG_MAX_BYTES', keeping
+    'RAW_LOG_BACKUP_COUNT' previous files. Records at info level and above are also printed to standard output.
+
+    The handlers are created on the first log call of each process, so worker processes started with 'fork' get their
+    own writer thread instead of the one that stayed behind in the parent. They are created again when the settings are
+    reloaded, so a changed level applies to long-running modes without a restart.
+"""
+
+
+class LogSystem:
+    def __init__(self) -> None:
+        self.logger: logging.Logger = logging.getLogger(LOGGER_NAME)
+        self.logger.propagate = False
+        self.listener: Optional[QueueListener] = None
+        self.pid: Optional[int] = None
+        self.settings: Optional[Settings] = None
+        atexit.register(self.stop)
+
+    def get_logger(self) -> logging.Logger:
+        if self.pid != os.getpid() or self.settings is not get_settings():
+            self.configure()
+
+        return self.logger
+
+    def configure(self) -> None:
+        for handler in list(self.logger.handlers):
+            self.logger.removeHandler(handler)
+
+        self.stop()
+        self.pid = os.getpid()
+        self.settings = get_settings()
+
+        level: Optional[int] = LOG_LEVELS.get(self.settings.logging_level)
+
+        if self.settings.environment == "production" or level is None:
+            self.logger.setLevel(logging.CRITICAL + 1)
+            self.logger.addHandler(logging.NullHandler())
+            return
+
+        self.logger.setLevel(level)
 
-    if isinstance(message, str):
-        formatted_message = message
-    elif hasattr(message, "__dict__"):
-        formatted_message = json.dumps(message.__dict__, default=str, indent=2)
-    elif hasattr(message, "__str__"):
-        formatted_message = str(message)
-    else:
-        formatted_message = repr(message)
+        console_handler: logging.StreamHandler = logging.StreamHandler(sys.stdout)
+        console_handler.setLevel(max(level, logging.INFO))
+        self.logger.addHandler(console_handler)
 
-    print(formatted_message)
+        file_handler: RotatingFileHandler = RotatingFileHandler(RAW_LOG_PATH, maxBytes=RAW_LOG_MAX_BYTES, backupCount=RAW_LOG_BACKUP_COUNT, encoding="utf-8", delay=True)
+        file_handler.setFormatter(logging.Formatter(RAW_LOG_FORMAT))
 
-    if LOGGING_LEVEL == "debug":
-        with open(Path(__file__).resolve().parents[4] / "raw.log", "a") as log_file:
-            log_file.write(formatted_message + "\n")
+        log_queue: SimpleQueue = SimpleQueue()
+        self.listener = QueueListener(log_queue, file_handler)
+        self.listener.start()
+        self.logger.addHandler(QueueHandler(log_queue))
+
+    def stop(self) -> None:
+        if self.listener is not None and self.pid == os.getpid():
+            self.listener.stop()
+
+        self.listener = None
+
+    def flush(self) -> None:
+        self.stop()
+        self.configure()
+
+
+LOG_SYSTEM: LogSystem = LogSystem()
+
+
+def get_logger() -> logging.Logger:
+    return LOG_SYSTEM.get_logger()
+
+
+def is_logging_enabled(level: int = logging.DEBUG) -> bool:
+    return get_logger().isEnabledFor(level)
+
+
+"""
+    Logs a message at the given level, debug by default.
+
+    Arguments are merged into string messages with '%' formatting, and other objects are formatted as described in
+    'LazyMessage', both only when the level is enabled. Callers that build expensive values only for logging should
+    check 'is_logging_enabled' first.
+
+    Args:
+        message (Any): A message, optionally with '%' placeholders, or any object to log.
+        *args (Any): Values for the placeholders of the message.
+        level (int): Level of the record.
+"""
+
+
+def log(message: Any, *args: Any, level: int = logging.DEBUG) -> None:
+    logger: logging.Logger = get_logger()
+
+    if not logger.isEnabledFor(level):
+        return
+
+    logger.log(level, message if isinstance(message, str) else LazyMessage(message), *args)
 
 
 def delete_raw_log() -> None:
-    with open(Path(__file__).resolve().parents[4] / "raw.log", "w") as log_file:
+    LOG_SYSTEM.flush()
+
+    with open(RAW_LOG_PATH, "w") as log_file:
         log_file.write("")
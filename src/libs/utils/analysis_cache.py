@@ -0,0 +1,148 @@
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+ANALYSIS_CACHE_DIRECTORY_NAME: str = "rce"
+ANALYSIS_CACHE_VERSION: int = 10
+RACY_MTIME_WINDOW_NS: int = 2_000_000_000
+
+
+def get_content_hash(content: str) -> str:
+    return hashlib.sha1(content.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def get_chunks_content_hash(chunks: Iterable[str]) -> str:
+    content_hash: Any = hashlib.sha1()
+
+    for chunk in chunks:
+        content_hash.update(chunk.encode("utf-8", "surrogatepass"))
+
+    return content_hash.hexdigest()
+
+
+def get_file_stat_key(file_path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat: os.stat_result = os.stat(file_path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+"""
+    Directory of the analysis caches of the current user: '$XDG_CACHE_HOME/rce' (by default '~/.cache/rce'),
+    '~/Library/Caches/rce' on macOS and '%LOCALAPPDATA%\\rce' on Windows.
+
+    Entries are pickled, so they are kept outside of the analyzed projects: a cloned repository cannot ship entries that
+    run code when they are loaded, and the cache never shows up in the working tree.
+"""
+
+
+def get_user_cache_directory() -> Path:
+    if sys.platform == "win32":
+        base_directory: str = os.environ.get("LOCALAPPDATA") or str(Path.home() / "AppData" / "Local")
+    elif sys.platform == "darwin":
+        base_directory = str(Path.home() / "Library" / "Caches")
+    else:
+        base_directory = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+
+    return Path(base_directory) / ANALYSIS_CACHE_DIRECTORY_NAME
+
+
+def get_project_cache_directory(project_root: Path) -> Path:
+    project_key: str = hashlib.sha1(str(project_root.resolve()).encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return get_user_cache_directory() / f"{project_root.name}-{project_key}"
+
+
+"""
+    Persistent per-file cache stored under '<user cache directory>/<project name>-<project hash>/<namespace>'.
+
+    Every entry is keyed by the file path and validated against the file's mtime, size and content hash.
+    When mtime and size match an entry that was written well after the file was last modified the content
+    hash is trusted, otherwise it is recomputed and compared. Callers that stream large files pass the hash of
+    the content instead of the content itself. Entries are written to a temporary file and
+    atomically moved into place, so concurrent console sessions never read a partially written entry.
+"""
+
+
+class AnalysisCache:
+    def __init__(self, project_root: Path, namespace: str) -> None:
+        self.cache_directory: Path = get_project_cache_directory(project_root) / namespace
+        self.memory: Dict[Path, Dict[str, Any]] = {}
+
+    def get_entry_path(self, file_path: Path) -> Path:
+        return self.cache_directory / f"{hashlib.sha1(str(file_path).encode('utf-8', 'surrogatepass')).hexdigest()}.pickle"
+
+    def load_entry(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        if file_path in self.memory:
+            return self.memory[file_path]
+
+        try:
+            with open(self.get_entry_path(file_path), "rb") as entry_file:
+                entry: Dict[str, Any] = pickle.load(entry_file)
+        except Exception:
+            return None
+
+        if entry.get("version") != (ANALYSIS_CACHE_VERSION, sys.version_info[:2]) or entry.get("path") != str(file_path):
+            return None
+
+        self.memory[file_path] = entry
+        return entry
+
+    def get(self, file_path: Path, content: Optional[str] = None, content_hash: Optional[str] = None) -> Optional[Any]:
+        entry: Optional[Dict[str, Any]] = self.load_entry(file_path)
+
+        if entry is None:
+            return None
+
+        stat_key: Optional[Tuple[int, int]] = get_file_stat_key(file_path)
+
+        if stat_key is not None and stat_key == entry["stat_key"] and entry["written_at_ns"] - stat_key[0] > RACY_MTIME_WINDOW_NS:
+            return entry["value"]
+
+        if content_hash is None and content is not None:
+            content_hash = get_content_hash(content)
+
+        if content_hash is None or content_hash != entry["content_hash"]:
+            return None
+
+        return entry["value"]
+
+    def set(self, file_path: Path, content: Optional[str], value: Any, content_hash: Optional[str] = None) -> None:
+        entry: Dict[str, Any] = {
+            "version": (ANALYSIS_CACHE_VERSION, sys.version_info[:2]),
+            "path": str(file_path),
+            "stat_key": get_file_stat_key(file_path),
+            "content_hash": content_hash or get_content_hash(content),
+            "written_at_ns": time.time_ns(),
+            "value": value,
+        }
+        self.memory[file_path] = entry
+        temporary_path: Optional[str] = None
+
+        try:
+            self.cache_directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self.cache_directory, suffix=".tmp")
+            with os.fdopen(file_descriptor, "wb") as entry_file:
+                pickle.dump(entry, entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self.get_entry_path(file_path))
+        except OSError:
+            if temporary_path and os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+
+ANALYSIS_CACHES: Dict[Tuple[Path, str], AnalysisCache] = {}
+
+
+def get_analysis_cache(project_root: Path, namespace: str) -> AnalysisCache:
+    key: Tuple[Path, str] = (project_root, namespace)
+
+    if key not in ANALYSIS_CACHES:
+        ANALYSIS_CACHES[key] = AnalysisCache(project_root, namespace)
+
+    return ANALYSIS_CACHES[key]
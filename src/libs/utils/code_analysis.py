@@ -1,56 +1,22 @@
+from fnmatch import fnmatch
 from pathlib import Path
 import ast
 from typing import Optional, List, Set, Dict, Tuple
 
-from src.libs.utils.file_system import should_ignore_file, is_path_directory, get_files_match_pattern
-from src.libs.services.logger.logger import log
+from src.libs.utils.file_system import should_ignore_file, walk_files
+from src.libs.utils.analysis_cache import AnalysisCache, get_analysis_cache
+from src.libs.utils.module_index import get_module_index
+from src.libs.utils.source_spans import SourceView, Span
+from src.libs.utils.gitignore import GitignoreMatcher
+from src.libs.utils.tracing import trace_span
+from src.libs.utils.configuration import get_settings
+from src.libs.services.logger.logger import is_logging_enabled, log
 
-
-def remove_blank_lines_from_code_lines(lines: List[str]) -> str:
-    formatted_lines = []
-    blank_line_count = 0
-
-    for line in lines:
-        if line.strip():
-            if blank_line_count > 0:
-                formatted_lines.extend([""] * min(blank_line_count, 2))
-            formatted_lines.append(line)
-            blank_line_count = 0
-        else:
-            blank_line_count += 1
-
-    while formatted_lines and not formatted_lines[-1].strip():
-        formatted_lines.pop()
-
-    return "\n".join(formatted_lines)
-
-
-def is_local_module(module_name: str, project_root: Path) -> bool:
-    module_path: Path = project_root / Path(*module_name.split("."))
-
-    return module_path.exists() or module_path.with_suffix(".py").exists() or (module_path / "__init__.py").exists()
+ANALYSIS_CACHE_NAMESPACE: str = "code_analysis"
 
 
 def resolve_import_path(module_name: str, project_root: Path) -> Optional[Path]:
-    module_path = project_root / Path(*module_name.split("."))
-
-    if module_path.is_file():
-        return module_path
-
-    py_file = module_path.with_suffix(".py")
-
-    if py_file.is_file():
-        return py_file
-
-    init_file = module_path / "__init__.py"
-
-    if init_file.is_file():
-        return init_file
-
-    if module_path.is_dir():
-        return module_path
-
-    return None
+    return get_module_index().resolve_module(module_name, project_root)
 
 
 def resolve_relative_import(
@@ -65,24 +31,14 @@ def resolve_relative_import(
     module_parts: list[str] = node.module.split(".") if node.module else []
     module_path: Path = current_package.joinpath(*module_parts)
 
-    possible_files: list[Path] = [
-        module_path / "__init__.py",
-        module_path.with_suffix(".py"),
-        module_path,
-    ]
-
-    for path in possible_files:
-        if path.is_file():
-            return path.resolve()
-
-    return None
+    return get_module_index().resolve_relative_module(module_path)
 
 
 def resolve_absolute_import(
     node: ast.ImportFrom,
     project_root: Path,
 ) -> Optional[Path]:
-    if node.module and is_local_module(node.module, project_root):
+    if node.module:
         return resolve_import_path(node.module, project_root)
     return None
 
@@ -120,10 +76,9 @@ def get_imports_from_import_node(node: ast.Import, project_root: Path) -> Tuple[
     alias_mapping: Dict[str, str] = {}
 
     for alias in node.names:
-        if is_local_module(alias.name, project_root):
-            module_path: Path | None = resolve_import_path(alias.name, project_root)
-            if module_path:
-                process_import_aliases(module_path, [alias], imports, alias_mapping)
+        module_path: Path | None = resolve_import_path(alias.name, project_root)
+        if module_path:
+            process_import_aliases(module_path, [alias], imports, alias_mapping)
 
     return imports, alias_mapping
 
@@ -147,19 +102,19 @@ def get_imports_from_import_from_node(
     return imports, alias_mapping
 
 
-def get_imports_from_programmatic_imports(node: ast.Call, project_root: Path, ignore_patterns: List[str], allowed_files: List[str]) -> Dict[Path, Set[str]]:
+def get_imports_from_programmatic_imports(
+    node: ast.Call, project_root: Path, gitignore_matcher: Optional[GitignoreMatcher], allowed_files: List[str]
+) -> Dict[Path, Set[str]]:
     imports: Dict[Path, Set[str]] = {}
 
     if node.func.attr == "import_module" and isinstance(node.func.value, ast.Name) and node.func.value.id == "importlib":
         if node.args and isinstance(node.args[0], ast.Constant):
             module_name = node.args[0].s
-            if is_local_module(module_name, project_root):
-                module_path = resolve_import_path(module_name, project_root)
-                if module_path and is_path_directory(module_path):
-                    for py_file in get_files_match_pattern(module_path, "*.py"):
-                        if not should_ignore_file(py_file, project_root, ignore_patterns, allowed_files):
-                            relative_module_name = str(py_file.relative_to(project_root)).replace("/", ".").replace("\\", ".")[:-3]
-                            imports.setdefault(py_file, set()).add(relative_module_name)
+            module_path = resolve_import_path(module_name, project_root)
+            if module_path and get_module_index().is_dir(module_path):
+                for py_file in walk_files(module_path, lambda path, is_dir: should_ignore_file(path, gitignore_matcher, allowed_files, is_dir), "*.py"):
+                    relative_module_name = str(py_file.relative_to(project_root)).replace("/", ".").replace("\\", ".")[:-3]
+                    imports.setdefault(py_file, set()).add(relative_module_name)
 
     return imports
 
@@ -168,461 +123,272 @@ def get_local_imports(
     content: str,
     file_path: Path,
     project_root: Path,
-    ignore_patterns: List[str] = [],
+    gitignore_matcher: Optional[GitignoreMatcher] = None,
     allowed_files: List[str] = [],
 ) -> Tuple[Dict[Path, Set[str]], Dict[Path, Set[str]], Dict[str, str]]:
-    tree = ast.parse(content)
+    summary: ModuleSummary = get_module_summary(content, file_path, project_root)
     imports: Dict[Path, Set[str]] = {}
     programmatic_imports: Dict[Path, Set[str]] = {}
     alias_mapping: Dict[str, str] = {}
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            import_dict, alias_m = get_imports_from_import_node(node, project_root)
-            for module_path, names in import_dict.items():
-                imports.setdefault(module_path, set()).update(names)
-            alias_mapping.update(alias_m)
-        elif isinstance(node, ast.ImportFrom):
-            import_dict, alias_m = get_imports_from_import_from_node(node, file_path, project_root)
-            for module_path, names in import_dict.items():
-                imports.setdefault(module_path, set()).update(names)
-            alias_mapping.update(alias_m)
-        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
-            import_dict = get_imports_from_programmatic_imports(node, project_root, ignore_patterns, allowed_files)
-            for module_path, names in import_dict.items():
-                imports.setdefault(module_path, set()).update(names)
-                programmatic_imports.setdefault(module_path, set()).update(names)
+    with trace_span("imports.resolve", file=file_path):
+        for node in summary.import_nodes:
+            if isinstance(node, ast.Import):
+                import_dict, alias_m = get_imports_from_import_node(node, project_root)
+                for module_path, names in import_dict.items():
+                    imports.setdefault(module_path, set()).update(names)
+                alias_mapping.update(alias_m)
+            elif isinstance(node, ast.ImportFrom):
+                import_dict, alias_m = get_imports_from_import_from_node(node, file_path, project_root)
+                for module_path, names in import_dict.items():
+                    imports.setdefault(module_path, set()).update(names)
+                alias_mapping.update(alias_m)
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+                import_dict = get_imports_from_programmatic_imports(node, project_root, gitignore_matcher, allowed_files)
+                for module_path, names in import_dict.items():
+                    imports.setdefault(module_path, set()).update(names)
+                    programmatic_imports.setdefault(module_path, set()).update(names)
 
     return imports, programmatic_imports, alias_mapping
 
 
-def collect_defined_names(tree: ast.AST) -> Set[str]:
-    defined_names: Set[str] = set()
+class NodeSummary:
+    def __init__(self, node: ast.stmt, source_view: SourceView) -> None:
+        self.kind: str = type(node).__name__
+        self.name: Optional[str] = getattr(node, "name", None)
+        self.assigned_names: Set[str] = set()
+        self.end_lineno: int = node.end_lineno
+        self.end_col_offset: int = node.end_col_offset
 
-    class DefinitionCollector(ast.NodeVisitor):
-        def __init__(self):
-            self.current_class = None
+        if isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                self.assigned_names.update(extract_assigned_names(target))
 
-        def visit_ClassDef(self, node: ast.ClassDef):
-            defined_names.add(node.name)
-            self.current_class = node.name
-            self.generic_visit(node)
-            self.current_class = None
+        if hasattr(node, "decorator_list") and node.decorator_list:
+            first_decorator = node.decorator_list[0]
+            self.start_lineno: int = first_decorator.lineno
 
-        def visit_FunctionDef(self, node: ast.FunctionDef):
-            if self.current_class:
-                function_name = f"{self.current_class}.{node.name}"
-            else:
-                function_name = node.name
-            defined_names.add(function_name)
-            self.generic_visit(node)
+            at_pos = source_view.get_line(first_decorator.lineno).encode("utf-8", "surrogatepass").rfind(b"@", 0, first_decorator.col_offset)
 
-        def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-            self.visit_FunctionDef(node)
+            self.start_col_offset: int = at_pos if at_pos != -1 else 0
+        else:
+            self.start_lineno: int = node.lineno
+            self.start_col_offset: int = node.col_offset
 
-        def visit_Assign(self, node: ast.Assign):
-            for target in node.targets:
-                defined_names.update(extract_assigned_names(target))
-            self.generic_visit(node)
+        self.span: Span = ((self.start_lineno, self.start_col_offset), (self.end_lineno, self.end_col_offset))
 
-        def visit_AnnAssign(self, node: ast.AnnAssign):
-            defined_names.update(extract_assigned_names(node.target))
-            self.generic_visit(node)
 
-    collector = DefinitionCollector()
-    collector.visit(tree)
-    return defined_names
+"""
+    Content-derived analysis results of a single module.
 
+    Everything the prompt command needs from a module is collected here right after parsing, so the summary can be
+    stored in the analysis cache and warm runs never have to parse the module again.
+"""
 
-def collect_used_names(tree: ast.AST, reachable_functions: Set[str], alias_mapping: Dict[str, str], imported_names: Set[str]) -> Set[str]:
-    used_names: Set[str] = set()
 
-    class UsageCollector(ast.NodeVisitor):
-        def __init__(self):
-            self.current_function = None
-            self.current_class = None
+class ModuleSummary:
+    def __init__(self, content: str) -> None:
+        with trace_span("parse"):
+            tree: ast.Module = ast.parse(content)
+            source_view: SourceView = SourceView(content)
 
-        def visit_ClassDef(self, node: ast.ClassDef):
-            if node.name in reachable_functions:
-                self.current_class = node.name
-                self.generic_visit(node)
-                self.current_class = None
+        with trace_span("analyze"):
+            analyzer: ModuleAnalyzer = ModuleAnalyzer()
+            analyzer.analyze(tree)
 
-        def visit_FunctionDef(self, node: ast.FunctionDef):
-            if self.current_class:
-                function_name = f"{self.current_class}.{node.name}"
-            else:
-                function_name = node.name
-
-            if function_name in reachable_functions:
-                self.current_function = function_name
-                used_names.add(function_name)
-                self.generic_visit(node)
-                self.current_function = None
-
-        def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-            self.visit_FunctionDef(node)
-
-        def visit_Call(self, node: ast.Call):
-            if self.current_function:
-                func = node.func
-                if isinstance(func, ast.Name):
-                    name = func.id
-                elif isinstance(func, ast.Attribute):
-                    if isinstance(func.value, ast.Name):
-                        name = f"{func.value.id}.{func.attr}"
-                    else:
-                        name = func.attr
-                else:
-                    name = None
-
-                if name and name in alias_mapping:
-                    name = alias_mapping[name]
-
-                if name:
-                    used_names.add(name)
-            self.generic_visit(node)
-
-        def visit_Name(self, node: ast.Name):
-            if self.current_function and isinstance(node.ctx, ast.Load):
-                name = node.id
-                if name in alias_mapping:
-                    name = alias_mapping[name]
-                used_names.add(name)
-            self.generic_visit(node)
-
-    class ModuleLevelUsageCollector(ast.NodeVisitor):
-        def __init__(self):
-            self.used_names = set()
-
-        def visit_Module(self, node):
-            for stmt in node.body:
-                self.visit(stmt)
-
-        def visit_Call(self, node):
-            func = node.func
-            if isinstance(func, ast.Name):
-                name = func.id
-            elif isinstance(func, ast.Attribute):
-                name = func.attr
+        self.import_nodes: List[ast.AST] = analyzer.get_import_nodes()
+        self.decorated_underscore_functions: List[str] = analyzer.decorated_underscore_functions
+        self.symbol_references: Dict[str, Dict[str, None]] = analyzer.symbol_references
+        self.class_methods: Dict[str, List[str]] = analyzer.class_methods
+        self.module_references: Dict[str, None] = analyzer.module_references
+        self.nodes: List[NodeSummary] = [NodeSummary(node, source_view) for node in tree.body]
+
+
+def get_module_summary(content: str, file_path: Path, project_root: Optional[Path] = None) -> ModuleSummary:
+    if project_root is None:
+        return ModuleSummary(content)
+
+    analysis_cache: AnalysisCache = get_analysis_cache(project_root, ANALYSIS_CACHE_NAMESPACE)
+
+    with trace_span("analysis_cache.get", file=file_path):
+        summary: Optional[ModuleSummary] = analysis_cache.get(file_path, content)
+
+    if summary is None:
+        with trace_span("analysis", file=file_path):
+            summary = ModuleSummary(content)
+
+        with trace_span("analysis_cache.set", file=file_path):
+            analysis_cache.set(file_path, content, summary)
+
+    return summary
+
+
+def get_dotted_name(node: ast.AST) -> Optional[str]:
+    parts: List[str] = []
+
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+
+    if not isinstance(node, ast.Name):
+        return None
+
+    parts.append(node.id)
+    return ".".join(reversed(parts))
+
+
+"""
+    Single-pass analyzer that collects everything a module summary needs in one traversal of the syntax tree.
+
+    Collected data:
+        - import nodes: 'import' and 'from ... import' statements and 'importlib.import_module' calls at any depth,
+          in breadth-first order.
+        - decorated underscore functions: top-level private functions with decorators, which are registered as a side
+          effect of importing the module.
+        - symbol references: the names loaded by every top-level definition and class method, and by the remaining
+          module level statements.
+
+    References are kept as dicts with None values, used as ordered sets, so they come out in source order and the
+    traversals built on them do not depend on string hashing.
+"""
+
+
+class ModuleAnalyzer:
+    def __init__(self) -> None:
+        self.indexed_import_nodes: List[Tuple[int, ast.AST]] = []
+        self.decorated_underscore_functions: List[str] = []
+        self.symbol_references: Dict[str, Dict[str, None]] = {}
+        self.class_methods: Dict[str, List[str]] = {}
+        self.module_references: Dict[str, None] = {}
+        self.reference_sinks: List[Dict[str, None]] = []
+        self.method_reference_sinks: Dict[int, Dict[str, None]] = {}
+
+    def analyze(self, tree: ast.Module) -> None:
+        for stmt in tree.body:
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)) and stmt.name.startswith("_") and stmt.decorator_list:
+                self.decorated_underscore_functions.append(stmt.name)
+
+            if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                self.reference_sinks = [self.symbol_references.setdefault(stmt.name, {})]
+
+                if isinstance(stmt, ast.ClassDef):
+                    methods: List[str] = self.class_methods.setdefault(stmt.name, [])
+
+                    for child in stmt.body:
+                        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                            method_name: str = f"{stmt.name}.{child.name}"
+                            methods.append(method_name)
+                            self.method_reference_sinks[id(child)] = self.symbol_references.setdefault(method_name, {})
+
+                self.visit(stmt, 1)
+            elif isinstance(stmt, (ast.Assign, ast.AnnAssign)):
+                references: Dict[str, None] = {}
+                self.reference_sinks = [references]
+                self.visit(stmt, 1)
+
+                targets = stmt.targets if isinstance(stmt, ast.Assign) else [stmt.target]
+                for name in extract_assigned_names(targets):
+                    self.symbol_references.setdefault(name, {}).update(references)
+            elif isinstance(stmt, (ast.Import, ast.ImportFrom)):
+                self.reference_sinks = []
+                self.visit(stmt, 1)
             else:
-                name = None
+                self.reference_sinks = [self.module_references]
+                self.visit(stmt, 1)
+
+    def get_import_nodes(self) -> List[ast.AST]:
+        return [node for _, node in sorted(self.indexed_import_nodes, key=lambda indexed_node: indexed_node[0])]
 
-            if name and name in alias_mapping:
-                name = alias_mapping[name]
+    def visit_children(self, node: ast.AST, depth: int) -> None:
+        for child in ast.iter_child_nodes(node):
+            self.visit(child, depth)
 
-            if name:
-                self.used_names.add(name)
+    def visit(self, node: ast.AST, depth: int) -> None:
+        node_type: type = type(node)
 
-        def visit_Name(self, node):
+        if node_type is ast.Name:
             if isinstance(node.ctx, ast.Load):
-                name = node.id
-                if name in alias_mapping:
-                    name = alias_mapping[name]
-                self.used_names.add(name)
-
-        def visit_FunctionDef(self, node):
-            if node.name.startswith("_") and node.decorator_list:
-                self.used_names.add(node.name)
-
-        def visit_ClassDef(self, node):
-            pass
-
-        def visit_AsyncFunctionDef(self, node):
-            if node.name.startswith("_") and node.decorator_list:
-                self.used_names.add(node.name)
-
-        def visit_With(self, node):
-            for item in node.items:
-                context_expr = item.context_expr
-                if isinstance(context_expr, ast.Call):
-                    func = context_expr.func
-                    if isinstance(func, ast.Name):
-                        name = func.id
-                    elif isinstance(func, ast.Attribute):
-                        name = func.attr
-                    else:
-                        name = None
-
-                    if name and name in alias_mapping:
-                        name = alias_mapping[name]
-
-                    if name:
-                        self.used_names.add(name)
-
-        def generic_visit(self, node):
-            pass
-
-    usage_collector = UsageCollector()
-    usage_collector.visit(tree)
-
-    module_level_usage_collector = ModuleLevelUsageCollector()
-    module_level_usage_collector.visit(tree)
-
-    used_names.update(module_level_usage_collector.used_names)
-    used_names.update(imported_names)
-    used_names.update(reachable_functions)
-
-    return used_names
-
-
-def find_reachable_functions(call_graph: Dict[str, Set[str]], entry_points: Set[str], defined_names: Set[str]) -> Set[str]:
-    reachable_functions: Set[str] = set()
-    stack = list(entry_points)
-
-    while stack:
-        function_name = stack.pop()
-        if function_name in defined_names and function_name not in reachable_functions:
-            reachable_functions.add(function_name)
-            called_functions = call_graph.get(function_name, set()) & defined_names
-            stack.extend(called_functions)
-
-            for name in defined_names:
-                if name.startswith(f"{function_name}."):
-                    method_name = name
-                    if method_name not in reachable_functions:
-                        reachable_functions.add(method_name)
-                        stack.append(method_name)
-    return reachable_functions
-
-
-def build_imported_names_graph(call_graph: Dict[str, Set[str]], imported_names: Set[str], defined_names: Set[str]) -> Dict[str, Set[str]]:
-    imported_names_graph = {}
-
-    def depth_first_seach(func: str, visited: Set[str]) -> Set[str]:
-        if func not in call_graph or func in visited:
-            return set()
-        visited.add(func)
-        called_funcs = call_graph[func] & defined_names
-        result = set(called_funcs)
-        for called_func in called_funcs:
-            result.update(depth_first_seach(called_func, visited))
-        return result
-
-    for func in imported_names:
-        visited = set()
-        imported_names_graph[func] = depth_first_seach(func, visited)
-
-    return imported_names_graph
-
-
-def collect_defined_and_used_names(tree: ast.AST, imported_names: Set[str], alias_mapping: Dict[str, str], should_log: bool) -> Tuple[Set[str], Set[str]]:
-    class CallGraphBuilder(ast.NodeVisitor):
-        def __init__(self):
-            self.call_graph: Dict[str, Set[str]] = {}
-            self.function_stack: List[str] = []
-            self.current_class = None
-
-        def visit_ClassDef(self, node: ast.ClassDef):
-            self.current_class = node.name
-            self.generic_visit(node)
-            self.current_class = None
-
-        def visit_FunctionDef(self, node: ast.FunctionDef):
-            if self.current_class:
-                function_name = f"{self.current_class}.{node.name}"
-            else:
-                function_name = node.name
-            self.function_stack.append(function_name)
-            self.call_graph.setdefault(function_name, set())
-            self.generic_visit(node)
-            self.function_stack.pop()
-
-        def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-            self.visit_FunctionDef(node)
-
-        def visit_Call(self, node: ast.Call):
-            if self.function_stack:
-                current_function = self.function_stack[-1]
-                func = node.func
-                if isinstance(func, ast.Name):
-                    called_function = func.id
-                elif isinstance(func, ast.Attribute):
-                    if isinstance(func.value, ast.Name):
-                        called_function = f"{func.value.id}.{func.attr}"
-                    else:
-                        called_function = func.attr
-                else:
-                    called_function = None
-
-                if called_function:
-                    self.call_graph[current_function].add(called_function)
-            self.generic_visit(node)
-
-    class ModuleLevelCallCollector(ast.NodeVisitor):
-        def __init__(self):
-            self.module_level_calls = set()
-
-        def visit_Module(self, node):
-            for stmt in node.body:
-                self.visit(stmt)
-
-        def visit_Expr(self, node):
-            if isinstance(node.value, ast.Call):
-                func = node.value.func
-                if isinstance(func, ast.Name):
-                    func_name = func.id
-                elif isinstance(func, ast.Attribute):
-                    func_name = func.attr
-                else:
-                    func_name = None
-
-                if func_name and func_name in defined_names:
-                    self.module_level_calls.add(func_name)
-
-        def visit_Assign(self, node):
-            if isinstance(node.value, ast.Call):
-                func = node.value.func
-                if isinstance(func, ast.Name):
-                    func_name = func.id
-                elif isinstance(func, ast.Attribute):
-                    func_name = func.attr
-                else:
-                    func_name = None
-
-                if func_name and func_name in defined_names:
-                    self.module_level_calls.add(func_name)
-
-        def visit_FunctionDef(self, node):
-            pass
-
-        def visit_ClassDef(self, node):
-            pass
-
-        def visit_With(self, node):
-            if isinstance(node, ast.With):
-                for item in node.items:
-                    context_expr = item.context_expr
-                    if isinstance(context_expr, ast.Call):
-                        func = context_expr.func
-                        if isinstance(func, ast.Name):
-                            func_name = func.id
-                        elif isinstance(func, ast.Attribute):
-                            func_name = func.attr
-                        else:
-                            func_name = None
-
-                        if func_name and func_name in defined_names:
-                            self.module_level_calls.add(func_name)
-
-    class DecoratedUnderscoreFunctionCollector(ast.NodeVisitor):
-        def __init__(self):
-            self.decorated_underscore_functions = set()
-
-        def visit_Module(self, node):
-            for stmt in node.body:
-                if isinstance(stmt, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    if stmt.name.startswith("_") and stmt.decorator_list:
-                        self.decorated_underscore_functions.add(stmt.name)
-
-        def visit_FunctionDef(self, node):
-            pass
-
-        def visit_AsyncFunctionDef(self, node):
-            pass
-
-        def visit_ClassDef(self, node):
-            pass
-
-    defined_names = collect_defined_names(tree)
-    call_graph_builder = CallGraphBuilder()
-    call_graph_builder.visit(tree)
-    call_graph = call_graph_builder.call_graph
-
-    imported_names_graph: Dict[str, Set[str]] = build_imported_names_graph(call_graph, imported_names, defined_names)
-
-    reachable_from_imports = find_reachable_functions(call_graph, imported_names, defined_names)
-
-    module_level_calls = set()
-
-    module_level_collector = ModuleLevelCallCollector()
-    module_level_collector.visit(tree)
-    module_level_calls = module_level_collector.module_level_calls
-
-    reachable_from_module_level = find_reachable_functions(call_graph, module_level_calls, defined_names)
-
-    reachable_functions = reachable_from_imports.union(reachable_from_module_level)
-
-    decorated_underscore_collector = DecoratedUnderscoreFunctionCollector()
-    decorated_underscore_collector.visit(tree)
-    decorated_underscore_functions = decorated_underscore_collector.decorated_underscore_functions
-
-    reachable_functions = reachable_functions.union(decorated_underscore_functions)
-
-    used_names = collect_used_names(tree, reachable_functions, alias_mapping, imported_names)
-
-    if should_log:
-        log("defined_names")
-        log(defined_names)
-        log("used_names")
-        log(used_names)
-        log("reachable_from_imports")
-        log(reachable_from_imports)
-        log("reachable_from_module_level")
-        log(reachable_from_module_level)
-        log("reachable_functions")
-        log(reachable_functions)
-        log("call_graph")
-        log(call_graph)
-        log("module_level_calls")
-        log(module_level_calls)
-        log("imported_names")
-        log(imported_names)
-        log("imported_names_graph")
-        log(imported_names_graph)
-
-    return defined_names, used_names
-
-
-def extract_assigned_names(node: ast.AST) -> Set[str]:
-    assigned_names: Set[str] = set()
+                for sink in self.reference_sinks:
+                    sink[node.id] = None
+            return
+
+        if node_type is ast.Attribute:
+            dotted_name: Optional[str] = get_dotted_name(node)
+            if dotted_name:
+                for sink in self.reference_sinks:
+                    sink[dotted_name] = None
+        elif node_type is ast.Call:
+            if isinstance(node.func, ast.Attribute) and node.func.attr == "import_module":
+                self.indexed_import_nodes.append((depth, node))
+        elif node_type is ast.Import or node_type is ast.ImportFrom:
+            self.indexed_import_nodes.append((depth, node))
+        elif node_type is ast.FunctionDef or node_type is ast.AsyncFunctionDef:
+            self.visit_function(node, depth)
+            return
+
+        self.visit_children(node, depth + 1)
+
+    def visit_function(self, node: ast.AST, depth: int) -> None:
+        method_reference_sink: Optional[Dict[str, None]] = self.method_reference_sinks.get(id(node))
+
+        if method_reference_sink is not None:
+            self.reference_sinks = self.reference_sinks + [method_reference_sink]
+
+        self.visit_children(node, depth + 1)
+
+        if method_reference_sink is not None:
+            self.reference_sinks = self.reference_sinks[:-1]
+
+
+def extract_assigned_names(node: ast.AST) -> List[str]:
+    assigned_names: List[str] = []
 
     if isinstance(node, list):
         for n in node:
-            assigned_names.update(extract_assigned_names(n))
+            assigned_names.extend(extract_assigned_names(n))
     elif isinstance(node, ast.Name):
-        assigned_names.add(node.id)
+        assigned_names.append(node.id)
     elif isinstance(node, (ast.Tuple, ast.List)):
         for elt in node.elts:
-            assigned_names.update(extract_assigned_names(elt))
+            assigned_names.extend(extract_assigned_names(elt))
     elif isinstance(node, ast.Attribute):
-        assigned_names.add(node.attr)
+        assigned_names.append(node.attr)
     elif isinstance(node, ast.Subscript):
         pass
     elif isinstance(node, ast.Starred):
-        assigned_names.update(extract_assigned_names(node.value))
+        assigned_names.extend(extract_assigned_names(node.value))
 
     return assigned_names
 
 
+def should_log_analysis(file_path: Path) -> bool:
+    return is_logging_enabled() and any(fnmatch(file_path.name, pattern) for pattern in get_settings().log_analysis_files)
+
+
 def find_unused_code_nodes(
-    tree: ast.AST, used_names: Set[str], defined_names: Set[str], file_path: Path, programatically_imports: Dict[Path, Set[str]], should_log: bool
-) -> Tuple[List[ast.AST], List[ast.AST]]:
-    unused_nodes: List[ast.AST] = []
-    used_nodes: List[ast.AST] = []
+    summary: ModuleSummary, used_names: Set[str], file_path: Path, programatically_imports: Dict[Path, Set[str]], should_log: bool
+) -> Tuple[List[NodeSummary], List[NodeSummary]]:
+    unused_nodes: List[NodeSummary] = []
+    used_nodes: List[NodeSummary] = []
 
     is_file_path_in_programatically_imports: bool = file_path in programatically_imports
 
-    for node in tree.body:
+    for node in summary.nodes:
         if should_log:
-            log("node")
-            log(ast.dump(node))
+            log("node: %s %s %s", node.kind, node.name, node.span)
 
         if is_file_path_in_programatically_imports:
             used_nodes.append(node)
             continue
 
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        if node.kind in ("FunctionDef", "AsyncFunctionDef", "ClassDef"):
             if node.name in used_names:
                 used_nodes.append(node)
             else:
                 unused_nodes.append(node)
-        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
-            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
-            assigned_names = set()
-            for target in targets:
-                assigned_names.update(extract_assigned_names(target))
-            if assigned_names & used_names:
+        elif node.kind in ("Assign", "AnnAssign"):
+            if node.assigned_names & used_names:
                 used_nodes.append(node)
             else:
                 unused_nodes.append(node)
@@ -631,23 +397,6 @@ def find_unused_code_nodes(
     return unused_nodes, used_nodes
 
 
-def get_unused_code_nodes(
-    content: str, imported_names: Set[str], file_path: Path, programatically_imports: Dict[Path, Set[str]], alias_mapping: Dict[str, str], tree: Optional[ast.AST] = None
-) -> Tuple[List[ast.AST], List[ast.AST]]:
-    if tree is None:
-        tree = ast.parse(content)
-
-    should_log: bool = False
-    if file_path.name == "code_analysis.py":
-        should_log = True
-
-    defined_names, used_names = collect_defined_and_used_names(tree, imported_names, alias_mapping, should_log)
-
-    unused_nodes, used_nodes = find_unused_code_nodes(tree, used_names, defined_names, file_path, programatically_imports, should_log)
-
-    return unused_nodes, used_nodes
-
-
 def filter_lines(lines: List[str], lines_to_remove: Set[int]) -> List[str]:
     return [line for i, line in enumerate(lines) if i not in lines_to_remove]
 
@@ -669,41 +418,45 @@ def process_lines(lines: List[str]) -> List[str]:
     return new_lines
 
 
-def get_node_source_code_with_decorators(source: str, node: ast.AST) -> Optional[str]:
-    if not hasattr(node, "lineno") or not hasattr(node, "end_lineno"):
-        return None
+def get_signature_stub(node: ast.AST) -> ast.AST:
+    ellipsis: ast.Expr = ast.Expr(value=ast.Constant(value=Ellipsis))
 
-    lines = source.splitlines()
+    if isinstance(node, ast.ClassDef):
+        methods: List[ast.AST] = [get_signature_stub(child) for child in node.body if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))]
+        node.body = methods or [ellipsis]
+    else:
+        node.body = [ellipsis]
 
-    if hasattr(node, "decorator_list") and node.decorator_list:
-        first_decorator = node.decorator_list[0]
-        start_lineno = first_decorator.lineno
-        decorator_col_offset = first_decorator.col_offset
+    return node
 
-        start_line = lines[start_lineno - 1]
 
-        at_pos = start_line.rfind("@", 0, decorator_col_offset)
+"""
+    Reduces a module to its outline: imports, single-line module level assignments and the signatures of its classes,
+    methods and functions with their bodies replaced by '...'.
 
-        if at_pos != -1:
-            start_col_offset = at_pos
-        else:
-            start_col_offset = 0
-    else:
-        start_lineno = node.lineno
-        start_col_offset = node.col_offset
+    Args:
+        content (str): Source code of the module.
 
-    end_lineno = node.end_lineno
-    end_col_offset = node.end_col_offset
+    Returns:
+        str: The outline of the module.
 
-    start_lineno -= 1
-    end_lineno -= 1
+    Raises:
+        SyntaxError: If the module cannot be parsed.
+"""
 
-    if start_lineno == end_lineno:
-        return lines[start_lineno][start_col_offset:end_col_offset]
 
-    texts: list = [lines[start_lineno][start_col_offset:]]
-    if end_lineno - start_lineno > 1:
-        texts.extend(lines[start_lineno + 1 : end_lineno])
-    texts.append(lines[end_lineno][:end_col_offset])
+def get_signature_outline(content: str) -> str:
+    tree: ast.Module = ast.parse(content)
+    outline_parts: List[str] = []
+    is_previous_simple: bool = False
 
-    return "\n".join(texts)
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            outline_parts.append(("\n\n\n" if outline_parts else "") + ast.unparse(get_signature_stub(node)))
+            is_previous_simple = False
+        elif isinstance(node, (ast.Import, ast.ImportFrom)) or (isinstance(node, (ast.Assign, ast.AnnAssign)) and node.lineno == node.end_lineno):
+            separator: str = "\n" if is_previous_simple else "\n\n"
+            outline_parts.append((separator if outline_parts else "") + ast.get_source_segment(content, node))
+            is_previous_simple = True
+
+    return "".join(outline_parts)
@@ -1,20 +1,164 @@
-from typing import Dict, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 import os
-from dotenv import load_dotenv
+import warnings
+from dotenv import dotenv_values, find_dotenv
 
-load_dotenv()
+CONFIG_KEYS: List[str] = [
+    "ENVIRONMENT",
+    "LOGGING_LEVEL",
+    "LOG_ANALYSIS_FILES",
+    "PROJECT_ROOT_PATH",
+    "PROMPT_ROOT_PATH",
+    "OUTPUT_CODE_FORMAT",
+    "CHAIN_OF_THOUGHT",
+    "TOKENIZER_VOCABULARY_PATH",
+    "PROMPT_TOKEN_BUDGET",
+    "MAX_PROMPT_FILE_BYTES",
+    "DAEMON_SOCKET_PATH",
+    "TRACE_PATH",
+    "TRACE_FORMAT",
+]
+DEFAULT_MAX_PROMPT_FILE_BYTES: int = 1024 * 1024
+ENV_FILE_PATH: Path = Path(find_dotenv() or Path(__file__).resolve().parents[3] / ".env")
+ENVIRONMENT_KEYS: Set[str] = set(os.environ)
+LOADED_ENV_KEYS: Set[str] = set()
+
+
+def get_optional_path(value: Optional[str]) -> Optional[Path]:
+    return Path(value) if value else None
+
+
+"""
+    Parses the positive integer setting 'key', e.g. 'PROMPT_TOKEN_BUDGET=200000'.
+
+    A value that is not a positive integer must not stop the console from starting, or a running watch or daemon from
+    reloading the '.env' file, so it is reported with a warning naming the key and the default is used instead.
+
+    Returns:
+        Optional[int]: The parsed value, or 'default' when the value is unset or invalid.
+"""
+
+
+def get_positive_int(values: Dict[str, Optional[str]], key: str, default: Optional[int] = None) -> Optional[int]:
+    value: Optional[str] = values[key]
+
+    if not value:
+        return default
+
+    try:
+        parsed_value: int = int(value)
+    except ValueError:
+        parsed_value = 0
+
+    if parsed_value <= 0:
+        fallback: str = "" if default is None else f" Using {default} instead."
+        warnings.warn(f"Ignoring {key}={value!r}: expected a positive integer.{fallback}", stacklevel=2)
+        return default
+
+    return parsed_value
+
+
+"""
+    Typed view of the configuration, built once from the environment and the '.env' file.
+
+    Unset values are None, except 'environment', 'logging_level', 'log_analysis_files' and 'max_prompt_file_bytes', which
+    fall back to 'development', 'debug', no files and 1 MB. Invalid numbers fall back the same way, with a warning.
+    'chain_of_thought' is None when 'CHAIN_OF_THOUGHT' is unset, so the prompt command can still ask for it. The raw
+    strings stay available in 'values' for 'get_config_value'.
+"""
+
+
+class Settings:
+    def __init__(self, values: Dict[str, Optional[str]]) -> None:
+        self.values: Dict[str, Optional[str]] = values
+        self.environment: str = values["ENVIRONMENT"] or "development"
+        self.logging_level: str = (values["LOGGING_LEVEL"] or "debug").strip().lower()
+        self.log_analysis_files: List[str] = [pattern.strip() for pattern in (values["LOG_ANALYSIS_FILES"] or "").split(",") if pattern.strip()]
+        self.project_root_path: Optional[Path] = get_optional_path(values["PROJECT_ROOT_PATH"])
+        self.prompt_root_path: Optional[Path] = get_optional_path(values["PROMPT_ROOT_PATH"])
+        self.output_code_format: Optional[str] = values["OUTPUT_CODE_FORMAT"] or None
+        self.chain_of_thought: Optional[bool] = values["CHAIN_OF_THOUGHT"] == "true" if values["CHAIN_OF_THOUGHT"] else None
+        self.tokenizer_vocabulary_path: Optional[Path] = get_optional_path(values["TOKENIZER_VOCABULARY_PATH"])
+        self.prompt_token_budget: Optional[int] = get_positive_int(values, "PROMPT_TOKEN_BUDGET")
+        self.max_prompt_file_bytes: int = get_positive_int(values, "MAX_PROMPT_FILE_BYTES", DEFAULT_MAX_PROMPT_FILE_BYTES)
+        self.daemon_socket_path: Optional[Path] = get_optional_path(values["DAEMON_SOCKET_PATH"])
+        self.trace_path: Optional[Path] = get_optional_path(values["TRACE_PATH"])
+        self.trace_format: Optional[str] = (values["TRACE_FORMAT"] or "").strip().lower() or None
+
+
+def get_env_file_key() -> Optional[Tuple[int, int]]:
+    try:
+        stat: os.stat_result = os.stat(ENV_FILE_PATH)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+"""
+    Loads the '.env' file into the environment and builds the settings from it.
+
+    As with 'load_dotenv', variables that were already set when the process started take precedence over the file.
+    Variables that an earlier version of the file defined and the current one no longer does are removed again.
+
+    Returns:
+        Settings: The new settings.
+"""
+
+
+def load_settings() -> Settings:
+    global ENV_FILE_KEY
+
+    ENV_FILE_KEY = get_env_file_key()
+    file_values: Dict[str, Optional[str]] = dotenv_values(ENV_FILE_PATH) if ENV_FILE_KEY is not None else {}
+
+    for key in LOADED_ENV_KEYS - file_values.keys():
+        os.environ.pop(key, None)
+
+    LOADED_ENV_KEYS.clear()
+
+    for key, value in file_values.items():
+        if key not in ENVIRONMENT_KEYS and value is not None:
+            os.environ[key] = value
+            LOADED_ENV_KEYS.add(key)
+
+    return Settings({key: os.getenv(key) for key in CONFIG_KEYS})
+
+
+ENV_FILE_KEY: Optional[Tuple[int, int]] = None
+SETTINGS: Settings = load_settings()
+
+
+def get_settings() -> Settings:
+    return SETTINGS
+
+
+"""
+    Reloads the settings when the '.env' file was created, changed or deleted since it was last loaded.
+
+    Long-running modes call this before each unit of work; everything that reads 'get_settings()' at that point sees
+    the new values.
+
+    Returns:
+        bool: Whether the settings were reloaded.
+"""
+
+
+def reload_settings_if_changed() -> bool:
+    global SETTINGS
+
+    if get_env_file_key() == ENV_FILE_KEY:
+        return False
+
+    SETTINGS = load_settings()
+    return True
 
 
 def get_config() -> Dict[str, Optional[str]]:
-    return {
-        "ENVIRONMENT": os.getenv("ENVIRONMENT"),
-        "LOGGING_LEVEL": os.getenv("LOGGING_LEVEL"),
-        "PROJECT_ROOT_PATH": os.getenv("PROJECT_ROOT_PATH"),
-        "PROMPT_ROOT_PATH": os.getenv("PROMPT_ROOT_PATH"),
-        "OUTPUT_CODE_FORMAT": os.getenv("OUTPUT_CODE_FORMAT"),
-        "CHAIN_OF_THOUGHT": os.getenv("CHAIN_OF_THOUGHT"),
-    }
+    return dict(SETTINGS.values)
 
 
 def get_config_value(key: str, default: Optional[str] = None) -> Optional[str]:
-    return get_config().get(key, default)
+    value: Optional[str] = SETTINGS.values.get(key)
+    return default if value is None else value
@@ -1,3 +1,5 @@
+from typing import List
+
 INDEX_HTML_CONTENT: str = (
     """
   <html lang="en">
@@ -236,6 +238,8 @@ Ensure only <CONTEXT_WINDOW_EXCEEDED> is in the response and nothing else.
 
 CLAUDE_CONTEXT_WINDOW: int = 200000
 
+ALLOWED_FILES: List[str] = [".gitignore", ".env.example", "pyproject.toml", ".flake8"]
+
 DASHED_MARKERS_EXPLANATION: str = """
 The markers --- Filename path/to/file.py --- and --- End of Filename path/to/file.py --- 
 indicate the start and end of the full content of the specified file. 
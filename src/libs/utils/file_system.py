@@ -1,11 +1,14 @@
 from pathlib import Path
-from typing import Union, List, Optional
+from typing import Union, List, Optional, Callable, Iterator
+import os
+import re
 import shutil
-import mimetypes
 import fnmatch
 
 import pyperclip
 
+from src.libs.utils.gitignore import GitignoreMatcher
+
 
 def delete_directory_recursive(directory_path: Union[str, Path]) -> bool:
     try:
@@ -23,26 +26,18 @@ def copy_to_clipboard(file_path: Path) -> dict[str, str]:
     try:
         with open(file_path, "r", encoding="utf-8") as file:
             content = file.read()
-        pyperclip.copy(content)
-        return {"message": "The file content was successfully copied to the clipboard", "success": True}
     except Exception:
         return {"message": "An error occurred while trying to copy the file content to the clipboard", "success": False}
 
+    return copy_text_to_clipboard(content)
 
-def is_text_file_mimetype_or_allowed_file(file_path: Path, allowed_files: List[str]) -> bool:
-    if is_text_file_mimetype(file_path) or file_path.name in allowed_files:
-        return True
-
-    return False
-
-
-def is_text_file_mimetype(file_path: Path) -> bool:
-    mime_type, _ = mimetypes.guess_type(file_path)
-
-    if mime_type is None or not mime_type.startswith("text"):
-        return False
 
-    return True
+def copy_text_to_clipboard(content: str) -> dict[str, str]:
+    try:
+        pyperclip.copy(content)
+        return {"message": "The file content was successfully copied to the clipboard", "success": True}
+    except Exception:
+        return {"message": "An error occurred while trying to copy the file content to the clipboard", "success": False}
 
 
 def read_file_content(file_path: Path) -> Optional[str]:
@@ -78,31 +73,80 @@ def path_exists(path: Path) -> bool:
     return path.exists()
 
 
-def get_files_match_pattern(directory: Path, pattern: str) -> List[Path]:
-    return list(directory.rglob(pattern))
+"""
+    Walks a directory tree with os.scandir and yields the files whose name matches the pattern.
 
+    Entries of every directory are visited in sorted order, so files come out sorted by path. Directories for which the
+    ignore predicate returns True are pruned before descending into them, and symlinked directories are not followed.
 
-def get_gitignore_patters_list(project_root: Path) -> List[str]:
-    gitignore_path = project_root / ".gitignore"
+    Args:
+        directory (Path): The directory to walk.
+        should_ignore (Optional[Callable[[Path, bool], bool]]): Receives the entry path and whether it is a directory.
+        pattern (str): Glob pattern matched against file names.
 
-    if not gitignore_path.exists():
-        return []
+    Returns:
+        Iterator[Path]: The matching files.
+"""
 
-    with open(gitignore_path, "r") as f:
-        patterns = [line.strip() for line in f if line.strip() and not line.startswith("#")]
 
-    return patterns
+def walk_files(directory: Path, should_ignore: Optional[Callable[[Path, bool], bool]] = None, pattern: str = "*") -> Iterator[Path]:
+    name_matcher: Optional[re.Pattern] = None if pattern == "*" else re.compile(fnmatch.translate(pattern))
 
+    return walk_directory(directory, should_ignore, name_matcher)
 
-def should_ignore_file(file_path: Path, project_root: Path, ignore_patterns: List[str], allowed_files: List[str] = []) -> bool:
-    if file_path.name in allowed_files:
-        return False
 
-    relative_path: Path = file_path.relative_to(project_root)
+def walk_directory(directory: Path, should_ignore: Optional[Callable[[Path, bool], bool]], name_matcher: Optional[re.Pattern]) -> Iterator[Path]:
+    try:
+        with os.scandir(directory) as scanned_entries:
+            entries: List[os.DirEntry] = sorted(scanned_entries, key=lambda entry: entry.name)
+    except OSError:
+        return
 
-    for pattern in ignore_patterns:
-        if fnmatch.fnmatch(str(relative_path), pattern) or fnmatch.fnmatch(relative_path.name, pattern):
-            return True
-        if pattern.endswith("/") and str(relative_path).startswith(pattern):
-            return True
-    return False
+    for entry in entries:
+        entry_path: Path = directory / entry.name
+
+        try:
+            is_dir: bool = entry.is_dir(follow_symlinks=False)
+            is_file: bool = not is_dir and entry.is_file()
+        except OSError:
+            continue
+
+        if not is_dir and (not is_file or (name_matcher is not None and not name_matcher.match(entry.name))):
+            continue
+
+        if should_ignore is not None and should_ignore(entry_path, is_dir):
+            continue
+
+        if is_dir:
+            yield from walk_directory(entry_path, should_ignore, name_matcher)
+        else:
+            yield entry_path
+
+
+def walk_directories(directory: Path, should_ignore: Optional[Callable[[Path, bool], bool]] = None) -> Iterator[Path]:
+    yield directory
+
+    try:
+        with os.scandir(directory) as scanned_entries:
+            entries: List[os.DirEntry] = sorted(scanned_entries, key=lambda entry: entry.name)
+    except OSError:
+        return
+
+    for entry in entries:
+        entry_path: Path = directory / entry.name
+
+        try:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+        except OSError:
+            continue
+
+        if should_ignore is None or not should_ignore(entry_path, True):
+            yield from walk_directories(entry_path, should_ignore)
+
+
+def should_ignore_file(file_path: Path, gitignore_matcher: Optional[GitignoreMatcher], allowed_files: List[str] = [], is_dir: Optional[bool] = None) -> bool:
+    if file_path.name in allowed_files or gitignore_matcher is None:
+        return False
+
+    return gitignore_matcher.is_ignored(file_path, is_dir)
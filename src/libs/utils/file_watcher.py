@@ -0,0 +1,163 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set, Tuple
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+
+from src.libs.utils.file_system import walk_directories, walk_files
+
+IN_MODIFY: int = 0x00000002
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_Q_OVERFLOW: int = 0x00004000
+IN_IGNORED: int = 0x00008000
+IN_ISDIR: int = 0x40000000
+IN_NONBLOCK: int = os.O_NONBLOCK
+IN_CLOEXEC: int = 0o2000000
+INOTIFY_WATCH_MASK: int = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+INOTIFY_EVENT_HEADER: struct.Struct = struct.Struct("iIII")
+INOTIFY_POLL_INTERVAL_SECONDS: float = 0.05
+POLLING_INTERVAL_SECONDS: float = 0.5
+
+
+class FileWatcher(ABC):
+    poll_interval: float = POLLING_INTERVAL_SECONDS
+
+    def __init__(self, project_root: Path, should_ignore: Callable[[Path, bool], bool]) -> None:
+        self.project_root: Path = project_root
+        self.should_ignore: Callable[[Path, bool], bool] = should_ignore
+
+    @abstractmethod
+    def get_changes(self) -> Set[Path]:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class PollingFileWatcher(FileWatcher):
+    poll_interval: float = POLLING_INTERVAL_SECONDS
+
+    def __init__(self, project_root: Path, should_ignore: Callable[[Path, bool], bool]) -> None:
+        super().__init__(project_root, should_ignore)
+        self.snapshot: Dict[Path, Tuple[int, int]] = self.take_snapshot()
+
+    def take_snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+
+        for file_path in walk_files(self.project_root, self.should_ignore):
+            try:
+                stat: os.stat_result = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+    def get_changes(self) -> Set[Path]:
+        snapshot: Dict[Path, Tuple[int, int]] = self.take_snapshot()
+        changes: Set[Path] = {file_path for file_path in snapshot.keys() | self.snapshot.keys() if snapshot.get(file_path) != self.snapshot.get(file_path)}
+        self.snapshot = snapshot
+        return changes
+
+
+"""
+    File watcher backed by the Linux inotify API, loaded through ctypes so no extra dependency is needed.
+
+    Every directory of the project that is not ignored gets a watch, and directories created later are added as their
+    creation events arrive. When the kernel event queue overflows the project root itself is reported as changed.
+"""
+
+
+class InotifyFileWatcher(FileWatcher):
+    poll_interval: float = INOTIFY_POLL_INTERVAL_SECONDS
+
+    def __init__(self, project_root: Path, should_ignore: Callable[[Path, bool], bool]) -> None:
+        super().__init__(project_root, should_ignore)
+        self.libc: ctypes.CDLL = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.file_descriptor: int = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if self.file_descriptor < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.watched_directories: Dict[int, Path] = {}
+
+        try:
+            for directory in walk_directories(project_root, should_ignore):
+                self.add_watch(directory)
+        except OSError:
+            self.close()
+            raise
+
+    def add_watch(self, directory: Path) -> None:
+        watch_descriptor: int = self.libc.inotify_add_watch(self.file_descriptor, os.fsencode(directory), INOTIFY_WATCH_MASK)
+
+        if watch_descriptor < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for '{directory}'")
+
+        self.watched_directories[watch_descriptor] = directory
+
+    def get_changes(self) -> Set[Path]:
+        changes: Set[Path] = set()
+
+        while True:
+            try:
+                buffer: bytes = os.read(self.file_descriptor, 64 * 1024)
+            except BlockingIOError:
+                return changes
+
+            offset: int = 0
+            while offset < len(buffer):
+                watch_descriptor, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(buffer, offset)
+                name: bytes = buffer[offset + INOTIFY_EVENT_HEADER.size : offset + INOTIFY_EVENT_HEADER.size + name_length].rstrip(b"\0")
+                offset += INOTIFY_EVENT_HEADER.size + name_length
+
+                if mask & IN_Q_OVERFLOW:
+                    changes.add(self.project_root)
+                    continue
+
+                if mask & IN_IGNORED:
+                    self.watched_directories.pop(watch_descriptor, None)
+                    continue
+
+                directory: Optional[Path] = self.watched_directories.get(watch_descriptor)
+
+                if directory is None or not name:
+                    continue
+
+                path: Path = directory / os.fsdecode(name)
+                is_dir: bool = bool(mask & IN_ISDIR)
+
+                if self.should_ignore(path, is_dir):
+                    continue
+
+                if is_dir and mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        for new_directory in walk_directories(path, self.should_ignore):
+                            self.add_watch(new_directory)
+                            changes.update(walk_files(new_directory, self.should_ignore))
+                    except OSError:
+                        changes.add(self.project_root)
+
+                changes.add(path)
+
+    def close(self) -> None:
+        if self.file_descriptor >= 0:
+            os.close(self.file_descriptor)
+            self.file_descriptor = -1
+
+
+def create_file_watcher(project_root: Path, should_ignore: Callable[[Path, bool], bool]) -> FileWatcher:
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyFileWatcher(project_root, should_ignore)
+        except (OSError, AttributeError):
+            pass
+
+    return PollingFileWatcher(project_root, should_ignore)
@@ -0,0 +1,217 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+
+GITIGNORE_FILE_NAME: str = ".gitignore"
+ALWAYS_IGNORED_PATTERNS: List[str] = [".git"]
+
+CompiledRules = Tuple[Optional[re.Pattern], List[bool]]
+
+
+class GitignoreRule:
+    def __init__(self, regex: str, negated: bool, directory_only: bool) -> None:
+        self.regex: str = regex
+        self.negated: bool = negated
+        self.directory_only: bool = directory_only
+
+
+def translate_gitignore_pattern(pattern: str) -> str:
+    parts: List[str] = []
+    index: int = 0
+    length: int = len(pattern)
+
+    while index < length:
+        char: str = pattern[index]
+
+        if char == "*":
+            stars_end: int = index
+            while stars_end < length and pattern[stars_end] == "*":
+                stars_end += 1
+
+            is_double_star: bool = stars_end - index == 2 and (index == 0 or pattern[index - 1] == "/")
+
+            if is_double_star and stars_end == length:
+                parts.append(".*")
+            elif is_double_star and pattern[stars_end] == "/":
+                parts.append("(?:.*/)?")
+                stars_end += 1
+            else:
+                parts.append("[^/]*")
+
+            index = stars_end
+            continue
+
+        if char == "?":
+            parts.append("[^/]")
+        elif char == "\\" and index + 1 < length:
+            parts.append(re.escape(pattern[index + 1]))
+            index += 2
+            continue
+        elif char == "[":
+            class_end: int = index + 1
+            if class_end < length and pattern[class_end] in "!^":
+                class_end += 1
+            if class_end < length and pattern[class_end] == "]":
+                class_end += 1
+            while class_end < length and pattern[class_end] != "]":
+                class_end += 1
+
+            if class_end >= length:
+                parts.append(re.escape(char))
+            else:
+                class_content: str = pattern[index + 1 : class_end].replace("\\", "\\\\")
+                if class_content[0] in "!^":
+                    class_content = "^" + class_content[1:]
+                parts.append(f"[{class_content}]")
+                index = class_end + 1
+                continue
+        else:
+            parts.append(re.escape(char))
+
+        index += 1
+
+    return "".join(parts)
+
+
+def parse_gitignore_line(line: str, base: str) -> Optional[GitignoreRule]:
+    line = line.rstrip("\r\n")
+
+    while line.endswith(" ") and not line.endswith("\\ "):
+        line = line[:-1]
+
+    if not line or line.startswith("#"):
+        return None
+
+    negated: bool = line.startswith("!")
+    if negated:
+        line = line[1:]
+
+    directory_only: bool = line.endswith("/")
+    if directory_only:
+        line = line[:-1]
+
+    if not line:
+        return None
+
+    anchored: bool = "/" in line
+    if line.startswith("/"):
+        line = line[1:]
+
+    regex: str = translate_gitignore_pattern(line)
+
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+
+    if base:
+        regex = re.escape(base + "/") + regex
+
+    return GitignoreRule(regex, negated, directory_only)
+
+
+def compile_gitignore_rules(rules: List[GitignoreRule]) -> CompiledRules:
+    if not rules:
+        return None, []
+
+    alternatives: List[str] = [f"(?P<r{index}>{rule.regex})" for index, rule in reversed(list(enumerate(rules)))]
+
+    return re.compile("|".join(alternatives), re.DOTALL), [rule.negated for rule in rules]
+
+
+"""
+    Gitignore engine for a project tree.
+
+    Rules from the project root '.gitignore' and every nested '.gitignore' are translated to regular expressions relative
+    to the project root. For every directory the rules that apply to its entries are combined into a single regular
+    expression whose alternatives are ordered by priority, so one match answers the question with the "last matching
+    pattern wins" semantics, including negated patterns. Directory verdicts are cached and a path inside an ignored
+    directory is always ignored, which lets a walker skip ignored directories without visiting their children.
+"""
+
+
+class GitignoreMatcher:
+    def __init__(self, project_root: Path) -> None:
+        self.project_root: Path = project_root
+        self.rules: Dict[Path, List[GitignoreRule]] = {}
+        self.compiled_rules: Dict[Tuple[Path, bool], CompiledRules] = {}
+        self.ignored_directories: Dict[Path, bool] = {}
+
+    def read_gitignore_rules(self, directory: Path) -> List[GitignoreRule]:
+        relative_directory: str = directory.relative_to(self.project_root).as_posix()
+        base: str = "" if relative_directory == "." else relative_directory
+        lines: List[str] = []
+
+        if not base:
+            lines.extend(ALWAYS_IGNORED_PATTERNS)
+
+        try:
+            with open(directory / GITIGNORE_FILE_NAME, "r", encoding="utf-8") as gitignore_file:
+                lines.extend(gitignore_file.readlines())
+        except (OSError, UnicodeDecodeError):
+            pass
+
+        return [rule for rule in (parse_gitignore_line(line, base) for line in lines) if rule is not None]
+
+    def get_rules(self, directory: Path) -> List[GitignoreRule]:
+        if directory in self.rules:
+            return self.rules[directory]
+
+        parent_rules: List[GitignoreRule] = [] if directory == self.project_root else self.get_rules(directory.parent)
+        own_rules: List[GitignoreRule] = self.read_gitignore_rules(directory)
+
+        self.rules[directory] = parent_rules + own_rules if own_rules else parent_rules
+        return self.rules[directory]
+
+    def get_compiled_rules(self, directory: Path, is_dir: bool) -> CompiledRules:
+        key: Tuple[Path, bool] = (directory, is_dir)
+
+        if key in self.compiled_rules:
+            return self.compiled_rules[key]
+
+        rules: List[GitignoreRule] = self.get_rules(directory)
+
+        if directory != self.project_root and rules is self.get_rules(directory.parent):
+            compiled_rules: CompiledRules = self.get_compiled_rules(directory.parent, is_dir)
+        else:
+            compiled_rules = compile_gitignore_rules([rule for rule in rules if is_dir or not rule.directory_only])
+
+        self.compiled_rules[key] = compiled_rules
+        return compiled_rules
+
+    def matches(self, path: Path, is_dir: bool) -> bool:
+        pattern, negated_rules = self.get_compiled_rules(path.parent, is_dir)
+
+        if pattern is None:
+            return False
+
+        match: Optional[re.Match] = pattern.fullmatch(path.relative_to(self.project_root).as_posix())
+
+        if match is None:
+            return False
+
+        return not negated_rules[int(match.lastgroup[1:])]
+
+    def is_directory_ignored(self, directory: Path) -> bool:
+        if directory == self.project_root:
+            return False
+
+        if directory not in self.ignored_directories:
+            self.ignored_directories[directory] = self.is_directory_ignored(directory.parent) or self.matches(directory, True)
+
+        return self.ignored_directories[directory]
+
+    def is_ignored(self, path: Path, is_dir: Optional[bool] = None) -> bool:
+        if path == self.project_root or self.project_root not in path.parents:
+            return False
+
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+
+        if is_dir:
+            return self.is_directory_ignored(path)
+
+        return self.is_directory_ignored(path.parent) or self.matches(path, False)
+
+
+def get_gitignore_matcher(project_root: Path) -> GitignoreMatcher:
+    return GitignoreMatcher(project_root)
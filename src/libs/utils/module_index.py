@@ -0,0 +1,105 @@
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+import os
+
+DirectoryListing = Tuple[Set[str], Set[str], Set[str]]
+
+
+"""
+    Index used to resolve module names to files without probing the filesystem for every import.
+
+    Each directory is scanned at most once with os.scandir, and every existence, file and directory check is answered
+    from those listings. Directories are listed the first time an import points into them, so large trees that are never
+    imported from (node_modules, build output, ...) are never scanned. Resolved module paths are memoized, including
+    negative lookups for names that do not belong to the project.
+"""
+
+
+class ModuleIndex:
+    def __init__(self) -> None:
+        self.directories: Dict[Path, Optional[DirectoryListing]] = {}
+        self.modules: Dict[Tuple[Path, str], Optional[Path]] = {}
+        self.relative_modules: Dict[Path, Optional[Path]] = {}
+
+    def list_directory(self, directory: Path) -> Optional[DirectoryListing]:
+        if directory in self.directories:
+            return self.directories[directory]
+
+        listing: Optional[DirectoryListing] = None
+
+        try:
+            with os.scandir(directory) as entries:
+                names: Set[str] = set()
+                files: Set[str] = set()
+                directories: Set[str] = set()
+                for entry in entries:
+                    names.add(entry.name)
+                    if entry.is_file():
+                        files.add(entry.name)
+                    elif entry.is_dir():
+                        directories.add(entry.name)
+                listing = (names, files, directories)
+        except OSError:
+            listing = None
+
+        self.directories[directory] = listing
+        return listing
+
+    def exists(self, path: Path) -> bool:
+        listing: Optional[DirectoryListing] = self.list_directory(path.parent)
+        return listing is not None and path.name in listing[0]
+
+    def is_file(self, path: Path) -> bool:
+        listing: Optional[DirectoryListing] = self.list_directory(path.parent)
+        return listing is not None and path.name in listing[1]
+
+    def is_dir(self, path: Path) -> bool:
+        listing: Optional[DirectoryListing] = self.list_directory(path.parent)
+        return listing is not None and path.name in listing[2]
+
+    def resolve_module(self, module_name: str, project_root: Path) -> Optional[Path]:
+        key: Tuple[Path, str] = (project_root, module_name)
+
+        if key in self.modules:
+            return self.modules[key]
+
+        module_path: Path = project_root / Path(*module_name.split("."))
+        resolved_path: Optional[Path] = None
+
+        if self.is_file(module_path):
+            resolved_path = module_path
+        elif self.is_file(module_path.with_suffix(".py")):
+            resolved_path = module_path.with_suffix(".py")
+        elif self.is_file(module_path / "__init__.py"):
+            resolved_path = module_path / "__init__.py"
+        elif self.is_dir(module_path):
+            resolved_path = module_path
+
+        self.modules[key] = resolved_path
+        return resolved_path
+
+    def resolve_relative_module(self, module_path: Path) -> Optional[Path]:
+        if module_path in self.relative_modules:
+            return self.relative_modules[module_path]
+
+        resolved_path: Optional[Path] = None
+
+        for path in [module_path / "__init__.py", module_path.with_suffix(".py"), module_path]:
+            if self.is_file(path):
+                resolved_path = path.resolve()
+                break
+
+        self.relative_modules[module_path] = resolved_path
+        return resolved_path
+
+    def invalidate(self) -> None:
+        self.directories.clear()
+        self.modules.clear()
+        self.relative_modules.clear()
+
+
+MODULE_INDEX: ModuleIndex = ModuleIndex()
+
+
+def get_module_index() -> ModuleIndex:
+    return MODULE_INDEX
@@ -0,0 +1,26 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+import multiprocessing
+
+"""
+    Creates a process pool whose workers start from a fresh interpreter instead of a fork of the current process.
+
+    The console runs threads, like the queue listener of the logger, and forking a process with live threads copies
+    their locks in whatever state they are in, which can deadlock the workers. The 'forkserver' start method is used
+    where it is available, since it forks workers from a clean server process; 'spawn' elsewhere. Workers import the
+    modules of the functions they run, so those must be importable from the project root.
+
+    Args:
+        max_workers (int): Number of worker processes.
+        initializer (Optional[Callable[..., Any]]): Called with 'initargs' once in every worker.
+        initargs (Tuple[Any, ...]): Arguments of 'initializer'.
+
+    Returns:
+        ProcessPoolExecutor: The process pool.
+"""
+
+
+def create_process_pool(max_workers: int, initializer: Optional[Callable[..., Any]] = None, initargs: Tuple[Any, ...] = ()) -> ProcessPoolExecutor:
+    start_method: str = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(start_method), initializer=initializer, initargs=initargs)
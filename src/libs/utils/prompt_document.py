@@ -0,0 +1,146 @@
+from pathlib import Path
+from typing import Dict, List, Union
+
+from src.libs.utils.analysis_cache import get_content_hash
+from src.libs.utils.prompting import create_dashed_filename_marker, create_dashed_filename_end_marker
+
+
+class FileSegment:
+    def __init__(self, file_path: Path, content: str) -> None:
+        self.file_path: Path = file_path
+        self.parts: List[str] = [content]
+
+    def append(self, content: str) -> None:
+        self.parts.append(content)
+
+    def replace(self, content: str) -> None:
+        self.parts = [content]
+
+    def copy(self) -> "FileSegment":
+        segment: FileSegment = FileSegment(self.file_path, "")
+        segment.parts = list(self.parts)
+        return segment
+
+    def get_content(self) -> str:
+        leading_new_lines: int = 0
+        pieces: List[str] = [self.parts[0]]
+
+        for part in self.parts[1:]:
+            leading_new_lines += 1
+
+            while pieces and not pieces[-1].strip():
+                pieces.pop()
+
+            if pieces:
+                pieces[-1] = pieces[-1].rstrip()
+            else:
+                leading_new_lines = 0
+
+            pieces.extend(["\n\n", part])
+
+        return "\n" * leading_new_lines + "".join(pieces)
+
+    def render(self, project_root: Path) -> str:
+        file_marker: str = create_dashed_filename_marker(self.file_path, project_root, blank_lines=False)
+        ending_marker: str = create_dashed_filename_end_marker(self.file_path, project_root, blank_lines=False)
+
+        return f"{file_marker}\n\n{self.get_content()}\n\n{ending_marker}"
+
+
+"""
+    In-memory representation of the prompt.log file.
+
+    Raw text and per-file segments are kept in output order. Snippets appended to a file that is already
+    part of the document are stored in its segment instead of rewriting the whole log, and the document
+    is rendered once when the prompt is complete.
+
+    Files added with 'add_unique_file' are deduplicated by the hash of their content: a file whose content was already
+    added under another path is written as a one-line reference to that path, recorded in 'references', unless the
+    reference would be longer than the content itself.
+
+    A document can be copied cheaply, sharing nothing that packing modifies, so the file segments built once can be kept
+    and updated while every render works on its own copy.
+"""
+
+
+class PromptDocument:
+    def __init__(self, project_root: Path) -> None:
+        self.project_root: Path = project_root
+        self.entries: List[Union[str, FileSegment]] = []
+        self.segments: Dict[Path, FileSegment] = {}
+        self.content_owners: Dict[str, Path] = {}
+        self.references: Dict[Path, Path] = {}
+
+    def write(self, content: str) -> None:
+        self.entries.append(content)
+
+    def add_file(self, file_path: Path, content: str) -> None:
+        segment: FileSegment = FileSegment(file_path, content)
+        self.segments[file_path] = segment
+        self.entries.append(segment)
+        self.entries.append("\n\n\n")
+
+    def add_unique_file(self, file_path: Path, content: str) -> None:
+        original_path: Path = self.content_owners.setdefault(get_content_hash(content), file_path)
+
+        if original_path == file_path:
+            self.add_file(file_path, content)
+            return
+
+        reference: str = f"Identical to {original_path.relative_to(self.project_root)}"
+
+        if len(reference) >= len(content):
+            self.add_file(file_path, content)
+            return
+
+        self.add_file(file_path, reference)
+        self.references[file_path] = original_path
+
+    def replace_unique_file(self, file_path: Path, content: str) -> bool:
+        content_hash: str = get_content_hash(content)
+        previous_hashes: List[str] = [previous_hash for previous_hash, owner in self.content_owners.items() if owner == file_path]
+
+        if file_path in self.references or file_path in self.references.values() or self.content_owners.get(content_hash, file_path) != file_path:
+            return False
+
+        for previous_hash in previous_hashes:
+            del self.content_owners[previous_hash]
+
+        self.content_owners[content_hash] = file_path
+        self.segments[file_path].replace(content)
+
+        return True
+
+    def append_to_file(self, file_path: Path, content: str) -> None:
+        if file_path in self.segments:
+            self.segments[file_path].append(content)
+            return
+
+        segment: FileSegment = FileSegment(file_path, content)
+        self.segments[file_path] = segment
+        self.entries.extend(["\n\n", segment, "\n"])
+
+    def remove_file(self, file_path: Path) -> None:
+        segment: FileSegment = self.segments.pop(file_path)
+        self.references.pop(file_path, None)
+        index: int = next(index for index, entry in enumerate(self.entries) if entry is segment)
+        end_index: int = index + 1
+
+        if end_index < len(self.entries) and isinstance(self.entries[end_index], str) and not self.entries[end_index].strip():
+            end_index += 1
+
+        del self.entries[index:end_index]
+
+    def copy(self) -> "PromptDocument":
+        prompt_document: PromptDocument = PromptDocument(self.project_root)
+        segment_copies: Dict[int, FileSegment] = {id(segment): segment.copy() for segment in self.segments.values()}
+
+        prompt_document.entries = [entry if isinstance(entry, str) else segment_copies[id(entry)] for entry in self.entries]
+        prompt_document.segments = {file_path: segment_copies[id(segment)] for file_path, segment in self.segments.items()}
+        prompt_document.content_owners = dict(self.content_owners)
+        prompt_document.references = dict(self.references)
+
+        return prompt_document
+
+    def render(self) -> str:
+        return "".join(entry if isinstance(entry, str) else entry.render(self.project_root) for entry in self.entries)
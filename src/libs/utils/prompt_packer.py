@@ -0,0 +1,115 @@
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, List, Set, Tuple
+
+from src.libs.utils.prompt_document import PromptDocument
+
+FULL_SOURCE_LEVEL: str = "full source"
+USED_CODE_LEVEL: str = "used code"
+SIGNATURES_LEVEL: str = "signatures"
+OMITTED_LEVEL: str = "omitted"
+PACKING_LEVELS: Tuple[str, ...] = (FULL_SOURCE_LEVEL, USED_CODE_LEVEL, SIGNATURES_LEVEL, OMITTED_LEVEL)
+
+
+class PackingCandidate:
+    def __init__(self, file_path: Path, distance: int, level: str, alternatives: Dict[str, str]) -> None:
+        self.file_path: Path = file_path
+        self.distance: int = distance
+        self.initial_level: str = level
+        self.level: str = level
+        self.alternatives: Dict[str, str] = alternatives
+
+    def can_degrade_to(self, level: str) -> bool:
+        if PACKING_LEVELS.index(level) <= PACKING_LEVELS.index(self.level):
+            return False
+
+        return level == OMITTED_LEVEL or level in self.alternatives
+
+
+class PackingReport:
+    def __init__(self, token_budget: int, initial_tokens: int, final_tokens: int, degraded: List[PackingCandidate]) -> None:
+        self.token_budget: int = token_budget
+        self.initial_tokens: int = initial_tokens
+        self.final_tokens: int = final_tokens
+        self.degraded: List[PackingCandidate] = degraded
+
+    def is_over_budget(self) -> bool:
+        return self.final_tokens > self.token_budget
+
+
+def get_import_distances(start_file: Path, get_imports: Callable[[Path], Iterable[Path]]) -> Dict[Path, int]:
+    distances: Dict[Path, int] = {start_file: 0}
+    queue: Deque[Path] = deque([start_file])
+
+    while queue:
+        file_path: Path = queue.popleft()
+
+        for import_path in get_imports(file_path):
+            if import_path not in distances:
+                distances[import_path] = distances[file_path] + 1
+                queue.append(import_path)
+
+    return distances
+
+
+"""
+    Fits a prompt document into a token budget by degrading its file segments.
+
+    Nothing changes when the document is already within the budget. Otherwise files are degraded in priority order, the
+    farthest from the start file first and the largest first among files at the same distance, one level at a time: every
+    file that can be reduced from its full source to its used-code slice is reduced before any file is reduced to its
+    signatures, and every file is reduced to its signatures before any file is omitted. Packing stops as soon as the
+    document fits.
+
+    Deduplicated files are pinned: a one-line reference and the file it points to are never degraded, so a reference
+    always points to the full content of its original.
+
+    Args:
+        prompt_document (PromptDocument): The document to pack, modified in place.
+        candidates (List[PackingCandidate]): The file segments that may be degraded and their alternative contents.
+        token_budget (int): Maximum number of tokens of the rendered document.
+        count_tokens (Callable[[str], int]): Token counter used for the estimates.
+
+    Returns:
+        PackingReport: Token totals before and after packing and the degraded files.
+"""
+
+
+def pack_prompt_document(prompt_document: PromptDocument, candidates: List[PackingCandidate], token_budget: int, count_tokens: Callable[[str], int]) -> PackingReport:
+    initial_tokens: int = count_tokens(prompt_document.render())
+
+    if initial_tokens <= token_budget:
+        return PackingReport(token_budget, initial_tokens, initial_tokens, [])
+
+    project_root: Path = prompt_document.project_root
+    pinned_files: Set[Path] = set(prompt_document.references) | set(prompt_document.references.values())
+    candidates = [candidate for candidate in candidates if candidate.file_path not in pinned_files]
+    segment_tokens: Dict[Path, int] = {
+        candidate.file_path: count_tokens(prompt_document.segments[candidate.file_path].render(project_root)) for candidate in candidates
+    }
+    ordered_candidates: List[PackingCandidate] = sorted(candidates, key=lambda candidate: (-candidate.distance, -segment_tokens[candidate.file_path]))
+    total_tokens: int = initial_tokens
+
+    for level in PACKING_LEVELS[1:]:
+        for candidate in ordered_candidates:
+            if total_tokens <= token_budget:
+                break
+
+            if not candidate.can_degrade_to(level):
+                continue
+
+            if level == OMITTED_LEVEL:
+                prompt_document.remove_file(candidate.file_path)
+                new_tokens: int = 0
+            else:
+                segment = prompt_document.segments[candidate.file_path]
+                segment.replace(candidate.alternatives[level])
+                new_tokens = count_tokens(segment.render(project_root))
+
+            total_tokens += new_tokens - segment_tokens[candidate.file_path]
+            segment_tokens[candidate.file_path] = new_tokens
+            candidate.level = level
+
+    degraded: List[PackingCandidate] = [candidate for candidate in ordered_candidates if candidate.level != candidate.initial_level]
+
+    return PackingReport(token_budget, initial_tokens, count_tokens(prompt_document.render()), degraded)
@@ -0,0 +1,178 @@
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List
+
+from src.libs.utils.prompt_document import FileSegment, PromptDocument
+
+XML_OUTPUT_FORMAT: str = "XML"
+XML_CONTENT_INDENT: str = "      "
+
+
+"""
+    Streaming blank line normalizer for the code written to the prompt log.
+
+    Text can be written in chunks of any size. Whitespace-only lines become empty, runs of blank lines between two lines
+    with content are capped at two, and trailing blank lines are dropped when the normalizer is closed, exactly as if the
+    whole text had been split into lines and formatted at once. 'mark_content' makes the current line count as content
+    even if it stays blank, as the line a removed document leaves behind does.
+"""
+
+
+class BlankLineNormalizer:
+    def __init__(self) -> None:
+        self.parts: List[str] = []
+        self.partial_line: str = ""
+        self.is_partial_line_content: bool = False
+        self.blank_line_count: int = 0
+        self.has_content: bool = False
+
+    def write(self, text: str) -> None:
+        lines: List[str] = (self.partial_line + text).split("\n")
+        self.partial_line = lines.pop()
+
+        if lines:
+            self.add_lines(lines, self.is_partial_line_content)
+            self.is_partial_line_content = False
+
+    def mark_content(self) -> None:
+        self.is_partial_line_content = True
+
+    def add_lines(self, lines: List[str], is_first_line_content: bool = False) -> None:
+        parts: List[str] = self.parts
+        blank_line_count: int = self.blank_line_count
+        separator: str = "\n" if self.has_content else ""
+
+        for index, line in enumerate(lines):
+            if not line.strip() and not (is_first_line_content and index == 0):
+                blank_line_count += 1
+                continue
+
+            if blank_line_count:
+                parts.append(separator + "\n" * min(blank_line_count, 2))
+                blank_line_count = 0
+            elif separator:
+                parts.append(separator)
+
+            parts.append(line)
+            separator = "\n"
+
+        self.blank_line_count = blank_line_count
+        self.has_content = bool(separator)
+
+    def close(self) -> str:
+        self.add_lines([self.partial_line], self.is_partial_line_content)
+        self.partial_line = ""
+        self.is_partial_line_content = False
+
+        return "".join(self.parts)
+
+
+def normalize_blank_lines(text: str) -> str:
+    normalizer: BlankLineNormalizer = BlankLineNormalizer()
+    normalizer.write(text)
+    return normalizer.close()
+
+
+"""
+    Destination of a rendered prompt document.
+
+    A prompt document is written into a sink once by 'write_prompt_document', entry by entry, with 'write' for the text
+    between files and 'write_document' for every file segment. The sink emits the final, normalized output format in
+    that single pass, and 'get_content' returns the finished prompt so it can be written to the prompt log and copied to
+    the clipboard from the same buffer.
+"""
+
+
+class PromptSink(ABC):
+    def __init__(self, project_root: Path) -> None:
+        self.project_root: Path = project_root
+
+    def write_prompt_document(self, prompt_document: PromptDocument) -> None:
+        for entry in prompt_document.entries:
+            if isinstance(entry, str):
+                self.write(entry)
+            else:
+                self.write_document(entry)
+
+    @abstractmethod
+    def write(self, text: str) -> None:
+        pass
+
+    @abstractmethod
+    def write_document(self, segment: FileSegment) -> None:
+        pass
+
+    @abstractmethod
+    def get_content(self) -> str:
+        pass
+
+
+class FilenamePromptSink(PromptSink):
+    def __init__(self, project_root: Path) -> None:
+        super().__init__(project_root)
+        self.normalizer: BlankLineNormalizer = BlankLineNormalizer()
+
+    def write(self, text: str) -> None:
+        self.normalizer.write(text)
+
+    def write_document(self, segment: FileSegment) -> None:
+        self.normalizer.write(segment.render(self.project_root))
+
+    def get_content(self) -> str:
+        return self.normalizer.close()
+
+
+"""
+    Sink that emits every file segment as an indexed '<document>' element of a '<documents>' block, followed by the text
+    written around the files.
+
+    Document contents are normalized on their own, as they appear between their dashed markers in the Filename format,
+    and every line is indented under '<document_content>'. The text between files is normalized separately, with every
+    document leaving an empty line in its place, and stripped, so the text below the documents has the same blank lines
+    as the Filename format with the documents cut out.
+"""
+
+
+class XmlPromptSink(PromptSink):
+    def __init__(self, project_root: Path) -> None:
+        super().__init__(project_root)
+        self.parts: List[str] = ["<documents>"]
+        self.document_count: int = 0
+        self.remaining: BlankLineNormalizer = BlankLineNormalizer()
+
+    def write(self, text: str) -> None:
+        self.remaining.write(text)
+
+    def write_document(self, segment: FileSegment) -> None:
+        self.document_count += 1
+        self.remaining.mark_content()
+
+        source: str = str(segment.file_path.relative_to(self.project_root)).strip()
+        content: str = normalize_blank_lines("\n" + segment.get_content()).rstrip()
+        indented_content: str = "\n".join(XML_CONTENT_INDENT + line for line in content.splitlines())
+
+        self.parts.append(
+            f'\n  <document index="{self.document_count}">\n'
+            f"    <source>{source}</source>\n"
+            f"    <document_content>"
+            f"{indented_content}\n"
+            f"    </document_content>\n"
+            f"  </document>"
+        )
+
+    def get_content(self) -> str:
+        self.parts.append("\n</documents>")
+        xml_content: str = "".join(self.parts)
+        remaining_content: str = self.remaining.close().strip()
+
+        if remaining_content:
+            return f"{xml_content}\n\n{remaining_content}"
+
+        return xml_content
+
+
+def create_prompt_sink(output_format: str, project_root: Path) -> PromptSink:
+    if output_format.upper() == XML_OUTPUT_FORMAT:
+        return XmlPromptSink(project_root)
+
+    return FilenamePromptSink(project_root)
@@ -0,0 +1,127 @@
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+import re
+
+LINE_BREAK_PATTERN: re.Pattern = re.compile(r"\r\n|\r|\n")
+
+Position = Tuple[int, int]
+Span = Tuple[Position, Position]
+
+
+"""
+    Read-only view of a source file with the offset of every line start precomputed.
+
+    Lines are split on the same line breaks the Python tokenizer uses, so the line numbers reported by 'ast' always
+    address the right line, even in files that contain form feeds or other characters 'str.splitlines' treats as line
+    breaks. Column offsets reported by 'ast' count UTF-8 bytes; they are converted to character offsets on the line they
+    belong to, and only lines that are not pure ASCII pay for the conversion. A span is sliced straight from the original
+    buffer, so extracting a snippet costs time proportional to the snippet, not to the file.
+"""
+
+
+class SourceView:
+    def __init__(self, content: str) -> None:
+        self.content: str = content
+        self.line_starts: List[int] = [0]
+        self.line_starts.extend(match.end() for match in LINE_BREAK_PATTERN.finditer(content))
+
+    def get_line(self, lineno: int) -> str:
+        start: int = self.line_starts[lineno - 1]
+        end: int = self.line_starts[lineno] if lineno < len(self.line_starts) else len(self.content)
+
+        return self.content[start:end].rstrip("\r\n")
+
+    def get_offset(self, position: Position) -> int:
+        lineno, col_offset = position
+        start: int = self.line_starts[lineno - 1]
+
+        if self.content[start : start + col_offset].isascii():
+            return start + col_offset
+
+        return start + len(self.get_line(lineno).encode("utf-8", "surrogatepass")[:col_offset].decode("utf-8", "ignore"))
+
+    def get_source(self, span: Span) -> str:
+        source: str = self.content[self.get_offset(span[0]) : self.get_offset(span[1])]
+
+        if "\r" in source:
+            source = source.replace("\r\n", "\n").replace("\r", "\n")
+
+        return source
+
+
+"""
+    Source spans of a single file that were already emitted, kept as sorted, disjoint (start, end) intervals of
+    (line, column) positions.
+
+    A span is new unless a single interval covers it entirely. Adding a span merges it with every interval it overlaps
+    or touches, so repeated snippets of the same file are recognized with a binary search and the structure never holds
+    more intervals than there are separate regions of emitted code.
+"""
+
+
+class SpanSet:
+    def __init__(self) -> None:
+        self.starts: List[Position] = []
+        self.ends: List[Position] = []
+
+    def contains(self, span: Span) -> bool:
+        index: int = bisect_right(self.starts, span[0]) - 1
+        return index >= 0 and self.ends[index] >= span[1]
+
+    def add(self, span: Span) -> bool:
+        if self.contains(span):
+            return False
+
+        start, end = span
+        first: int = bisect_left(self.ends, start)
+        last: int = bisect_right(self.starts, end)
+
+        if first < last:
+            start = min(start, self.starts[first])
+            end = max(end, self.ends[last - 1])
+
+        self.starts[first:last] = [start]
+        self.ends[first:last] = [end]
+        return True
+
+    def copy(self) -> "SpanSet":
+        span_set: SpanSet = SpanSet()
+        span_set.starts = list(self.starts)
+        span_set.ends = list(self.ends)
+        return span_set
+
+
+"""
+    Merges spans that overlap or are adjacent in the source, in the order given.
+
+    Two consecutive spans are merged when the only text between them is whitespace and statement separators and at most
+    one line break, as with statements separated by ';' or written on consecutive lines, so they are emitted as one
+    snippet exactly as they appear in the file.
+
+    Args:
+        source_view (SourceView): The source file.
+        spans (List[Span]): Spans to merge, in source order.
+
+    Returns:
+        List[Span]: The merged spans.
+"""
+
+
+def merge_adjacent_spans(source_view: SourceView, spans: List[Span]) -> List[Span]:
+    merged_spans: List[Span] = []
+
+    for span in spans:
+        if merged_spans:
+            previous_start, previous_end = merged_spans[-1]
+
+            if span[0] <= previous_end:
+                merged_spans[-1] = (previous_start, max(previous_end, span[1]))
+                continue
+
+            if span[0][0] - previous_end[0] <= 1 and not source_view.get_source((previous_end, span[0])).replace(";", "").strip():
+                merged_spans[-1] = (previous_start, span[1])
+                continue
+
+        merged_spans.append(span)
+
+    return merged_spans
@@ -0,0 +1,333 @@
+from collections import deque
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+import ast
+
+from src.libs.utils.code_analysis import (
+    ModuleSummary,
+    NodeSummary,
+    find_unused_code_nodes,
+    get_imports_from_programmatic_imports,
+    get_module_summary,
+    should_log_analysis,
+    resolve_absolute_import,
+    resolve_import_path,
+    resolve_relative_import,
+)
+from src.libs.utils.file_system import read_file_content
+from src.libs.utils.gitignore import GitignoreMatcher
+from src.libs.utils.module_index import get_module_index
+from src.libs.services.logger.logger import log
+
+MODULE_SYMBOL: str = ""
+
+Symbol = Tuple[Path, str]
+Binding = Tuple[Path, Optional[str]]
+
+
+"""
+    Symbols of a single module: its top-level definitions and the names its imports bind.
+
+    A binding maps a local name either to a module ('import a.b as c', 'from a import submodule') or to a name inside a
+    module ('from a.b import c as d'). Modules star-imported with 'from a import *' are kept apart and searched for names
+    the module neither defines nor binds.
+"""
+
+
+class ModuleSymbols:
+    def __init__(self, file_path: Path, summary: ModuleSummary, project_root: Path) -> None:
+        self.file_path: Path = file_path
+        self.summary: ModuleSummary = summary
+        self.bindings: Dict[str, Binding] = {}
+        self.star_sources: List[Path] = []
+
+        for node in summary.import_nodes:
+            if isinstance(node, ast.Import):
+                self.add_import_bindings(node, project_root)
+            elif isinstance(node, ast.ImportFrom):
+                self.add_import_from_bindings(node, project_root)
+
+    def add_import_bindings(self, node: ast.Import, project_root: Path) -> None:
+        for alias in node.names:
+            module_path: Optional[Path] = resolve_import_path(alias.name, project_root)
+            if module_path is not None:
+                self.bindings[alias.asname or alias.name] = (module_path, None)
+
+    def add_import_from_bindings(self, node: ast.ImportFrom, project_root: Path) -> None:
+        if node.level == 0:
+            module_path: Optional[Path] = resolve_absolute_import(node, project_root)
+        else:
+            module_path = resolve_relative_import(node, self.file_path)
+            if module_path is None:
+                package_path: Path = self.file_path.parent
+                for _ in range(node.level - 1):
+                    package_path = package_path.parent
+                module_path = package_path.joinpath(*node.module.split(".")) if node.module else package_path
+                if not get_module_index().is_dir(module_path):
+                    return
+
+        if module_path is None:
+            return
+
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_sources.append(module_path)
+            elif module_path.suffix == ".py":
+                self.bindings[alias.asname or alias.name] = (module_path, alias.name)
+            else:
+                submodule_path: Optional[Path] = find_submodule(module_path, alias.name)
+                if submodule_path is not None:
+                    self.bindings[alias.asname or alias.name] = (submodule_path, None)
+
+    def is_defined(self, name: str) -> bool:
+        return name in self.summary.symbol_references
+
+
+def find_submodule(package_path: Path, name: str) -> Optional[Path]:
+    module_index = get_module_index()
+    package_directory: Path = package_path.parent if package_path.name == "__init__.py" else package_path
+
+    for candidate in [package_directory / f"{name}.py", package_directory / name / "__init__.py"]:
+        if module_index.is_file(candidate):
+            return candidate
+
+    if module_index.is_dir(package_directory / name):
+        return package_directory / name
+
+    return None
+
+
+"""
+    Project-level symbol graph used by the used-code-only traversal of the prompt command.
+
+    Nodes are (module, qualified name) pairs. A definition points to every symbol its body references, resolved through
+    the imports of its module, so calls, plain references, 'module.attribute' accesses and re-exports through other
+    modules all become edges. Modules are loaded from the analysis cache the first time a symbol inside them is reached,
+    and the successors of every node are computed once, so reachability from the entry file is a single breadth-first
+    traversal instead of a separate analysis of every file each time it is imported.
+
+    Successors and module roots are kept as dicts with None values, in the order their references appear in the source,
+    so the traversal visits modules in the same order on every run regardless of string hashing.
+
+    A module that is reached at all also contributes its module level statements, its decorated private functions and
+    the modules it loads with 'importlib.import_module', which are included in full like the entry file.
+    'find_reachable_symbols' returns the reached qualified names of every reached module, in the order the modules were
+    reached, together with the modules that are included in full.
+
+    The graph can be kept while files change: 'invalidate' drops the changed modules and every module whose edges were
+    resolved through them, found by following the reverse edges recorded for star imports, and the next traversal
+    recomputes only those.
+"""
+
+
+class SymbolGraph:
+    def __init__(self, project_root: Path, gitignore_matcher: Optional[GitignoreMatcher], allowed_files: List[str], should_ignore: Callable[[Path], bool]) -> None:
+        self.project_root: Path = project_root
+        self.gitignore_matcher: Optional[GitignoreMatcher] = gitignore_matcher
+        self.allowed_files: List[str] = allowed_files
+        self.should_ignore: Callable[[Path], bool] = should_ignore
+        self.modules: Dict[Path, Optional[ModuleSymbols]] = {}
+        self.successors: Dict[Symbol, Dict[Symbol, None]] = {}
+        self.module_roots: Dict[Path, Dict[Symbol, None]] = {}
+        self.star_importers: Dict[Path, Set[Path]] = {}
+
+    def get_module(self, file_path: Path) -> Optional[ModuleSymbols]:
+        if file_path in self.modules:
+            return self.modules[file_path]
+
+        module: Optional[ModuleSymbols] = None
+
+        if file_path.suffix == ".py" and not self.should_ignore(file_path):
+            content: Optional[str] = read_file_content(file_path)
+            if content is not None:
+                try:
+                    module = ModuleSymbols(file_path, get_module_summary(content, file_path, self.project_root), self.project_root)
+                except (SyntaxError, ValueError):
+                    module = None
+
+        self.modules[file_path] = module
+        return module
+
+    def resolve_in_module(self, module_path: Path, parts: List[str]) -> List[Symbol]:
+        if not parts:
+            return [(module_path, MODULE_SYMBOL)]
+
+        if module_path.suffix == ".py":
+            return [(module_path, ".".join(parts))]
+
+        submodule_path: Optional[Path] = find_submodule(module_path, parts[0])
+
+        if submodule_path is None:
+            return []
+
+        return self.resolve_in_module(submodule_path, parts[1:])
+
+    def resolve_name(self, module: ModuleSymbols, dotted_name: str) -> List[Symbol]:
+        parts: List[str] = dotted_name.split(".")
+
+        if len(parts) > 1 and module.is_defined(f"{parts[0]}.{parts[1]}"):
+            return [(module.file_path, f"{parts[0]}.{parts[1]}")]
+
+        if module.is_defined(parts[0]):
+            return [(module.file_path, parts[0])]
+
+        for index in range(len(parts), 0, -1):
+            binding: Optional[Binding] = module.bindings.get(".".join(parts[:index]))
+
+            if binding is None:
+                continue
+
+            target_path, imported_name = binding
+            remaining_parts: List[str] = parts[index:] if imported_name is None else [imported_name] + parts[index:]
+
+            return self.resolve_in_module(target_path, remaining_parts)
+
+        symbols: List[Symbol] = []
+
+        for star_source in module.star_sources:
+            self.star_importers.setdefault(star_source, set()).add(module.file_path)
+            star_module: Optional[ModuleSymbols] = self.get_module(star_source)
+            if star_module is not None and (star_module.is_defined(parts[0]) or parts[0] in star_module.bindings):
+                symbols.extend(self.resolve_in_module(star_source, parts))
+
+        if not symbols and module.file_path.name == "__init__.py":
+            submodule_path: Optional[Path] = find_submodule(module.file_path, parts[0])
+            if submodule_path is not None:
+                symbols.extend(self.resolve_in_module(submodule_path, parts[1:]))
+
+        return symbols
+
+    def get_successors(self, symbol: Symbol) -> Dict[Symbol, None]:
+        if symbol in self.successors:
+            return self.successors[symbol]
+
+        file_path, name = symbol
+        module: Optional[ModuleSymbols] = self.get_module(file_path)
+        successors: Dict[Symbol, None] = {}
+
+        if module is not None and name != MODULE_SYMBOL:
+            if module.is_defined(name):
+                for reference in module.summary.symbol_references[name]:
+                    successors.update(dict.fromkeys(self.resolve_name(module, reference)))
+
+                if "." in name:
+                    successors[(file_path, name.split(".", 1)[0])] = None
+                else:
+                    successors.update(dict.fromkeys((file_path, method_name) for method_name in module.summary.class_methods.get(name, ())))
+            else:
+                successors.update(dict.fromkeys(self.resolve_name(module, name)))
+
+            successors.pop(symbol, None)
+
+        self.successors[symbol] = successors
+        return successors
+
+    def get_module_roots(self, file_path: Path) -> Dict[Symbol, None]:
+        if file_path in self.module_roots:
+            return self.module_roots[file_path]
+
+        module: Optional[ModuleSymbols] = self.get_module(file_path)
+        roots: Dict[Symbol, None] = {}
+
+        if module is not None:
+            for reference in module.summary.module_references:
+                roots.update(dict.fromkeys(self.resolve_name(module, reference)))
+
+            roots.update(dict.fromkeys((file_path, name) for name in module.summary.decorated_underscore_functions))
+
+        self.module_roots[file_path] = roots
+        return roots
+
+    def get_programmatic_imports(self, file_path: Path) -> List[Path]:
+        module: Optional[ModuleSymbols] = self.get_module(file_path)
+
+        if module is None:
+            return []
+
+        imported_paths: List[Path] = []
+
+        for node in module.summary.import_nodes:
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+                imported_paths.extend(get_imports_from_programmatic_imports(node, self.project_root, self.gitignore_matcher, self.allowed_files))
+
+        return imported_paths
+
+    def invalidate(self, file_paths: Set[Path]) -> None:
+        stale_files: Set[Path] = set(file_paths)
+
+        for file_path in file_paths:
+            stale_files.update(self.star_importers.pop(file_path, set()))
+
+        for file_path in stale_files:
+            self.modules.pop(file_path, None)
+            self.module_roots.pop(file_path, None)
+
+        self.successors = {symbol: successors for symbol, successors in self.successors.items() if symbol[0] not in stale_files}
+
+    def find_reachable_symbols(self, entry_file: Path) -> Tuple[Dict[Path, Set[str]], Set[Path]]:
+        reached_names: Dict[Path, Set[str]] = {}
+        full_modules: Set[Path] = set()
+        visited: Set[Symbol] = set()
+        queue: Deque[Symbol] = deque()
+
+        def reach_module(file_path: Path) -> None:
+            if file_path in reached_names or self.get_module(file_path) is None:
+                return
+
+            reached_names[file_path] = set()
+            queue.extend(self.get_module_roots(file_path))
+
+            for imported_path in self.get_programmatic_imports(file_path):
+                include_module(imported_path)
+
+        def include_module(file_path: Path) -> None:
+            module: Optional[ModuleSymbols] = self.get_module(file_path)
+
+            if module is None or file_path in full_modules:
+                return
+
+            full_modules.add(file_path)
+            reach_module(file_path)
+            queue.extend((file_path, name) for name in module.summary.symbol_references)
+
+        include_module(entry_file)
+
+        while queue:
+            symbol: Symbol = queue.popleft()
+
+            if symbol in visited:
+                continue
+
+            visited.add(symbol)
+            file_path, name = symbol
+            module: Optional[ModuleSymbols] = self.get_module(file_path)
+
+            if module is None:
+                continue
+
+            reach_module(file_path)
+
+            if module.is_defined(name):
+                reached_names[file_path].add(name)
+
+            queue.extend(self.get_successors(symbol))
+
+        return reached_names, full_modules
+
+    def get_used_nodes(self, file_path: Path, names: Set[str], is_full_module: bool) -> List[NodeSummary]:
+        module: Optional[ModuleSymbols] = self.get_module(file_path)
+
+        if module is None:
+            return []
+
+        used_names: Set[str] = names | {name.split(".", 1)[0] for name in names}
+        programatically_imports: Dict[Path, Set[str]] = {file_path: set()} if is_full_module else {}
+        should_log: bool = should_log_analysis(file_path)
+
+        if should_log:
+            log("used_names: %s", used_names)
+            log("is_full_module: %s", is_full_module)
+
+        _, used_nodes = find_unused_code_nodes(module.summary, used_names, file_path, programatically_imports, should_log)
+
+        return used_nodes
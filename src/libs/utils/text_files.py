@@ -0,0 +1,85 @@
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import codecs
+import os
+import stat
+
+SNIFF_SIZE: int = 8192
+TEXT_FILE_VERDICTS: Dict[Path, Tuple[Tuple[int, int], bool]] = {}
+
+
+"""
+    Checks whether the first bytes of a file look like UTF-8 text: no NUL byte and a valid UTF-8 sequence.
+
+    Args:
+        head (bytes): The first bytes of the file.
+        is_complete (bool): Whether 'head' is the whole file. Otherwise a multi-byte character cut off at its end is not
+            an error.
+
+    Returns:
+        bool: Whether the content is text.
+"""
+
+
+def is_text_content(head: bytes, is_complete: bool) -> bool:
+    if b"\0" in head:
+        return False
+
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=is_complete)
+    except UnicodeDecodeError:
+        return False
+
+    return True
+
+
+def sniff_text_file(file_path: Path, file_size: int) -> bool:
+    try:
+        with open(file_path, "rb") as file:
+            head: bytes = file.read(SNIFF_SIZE)
+    except OSError:
+        return False
+
+    return is_text_content(head, file_size <= SNIFF_SIZE)
+
+
+"""
+    Classifies a file as text or binary from its content instead of its extension.
+
+    Files named in 'allowed_files' are always text. Anything that is not a regular file, and files larger than 'max_size',
+    are rejected from their stat alone, without being opened. Otherwise the first 'SNIFF_SIZE' bytes are sniffed with
+    'is_text_content'. Verdicts are cached per path together with the mtime and size they were made for, so a file is
+    sniffed again only after it changed.
+
+    Args:
+        file_path (Path): The file to classify.
+        allowed_files (List[str]): File names that are always treated as text.
+        max_size (Optional[int]): Size in bytes above which a file is rejected. No limit when None.
+
+    Returns:
+        bool: Whether the file should be read as text.
+"""
+
+
+def is_text_file(file_path: Path, allowed_files: List[str] = [], max_size: Optional[int] = None) -> bool:
+    if file_path.name in allowed_files:
+        return True
+
+    try:
+        file_stat: os.stat_result = os.stat(file_path)
+    except OSError:
+        return False
+
+    if not stat.S_ISREG(file_stat.st_mode) or (max_size is not None and file_stat.st_size > max_size):
+        return False
+
+    fingerprint: Tuple[int, int] = (file_stat.st_mtime_ns, file_stat.st_size)
+    verdict: Optional[Tuple[Tuple[int, int], bool]] = TEXT_FILE_VERDICTS.get(file_path)
+
+    if verdict is not None and verdict[0] == fingerprint:
+        return verdict[1]
+
+    is_text: bool = sniff_text_file(file_path, file_stat.st_size)
+    TEXT_FILE_VERDICTS[file_path] = (fingerprint, is_text)
+
+    return is_text
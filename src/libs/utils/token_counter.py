@@ -0,0 +1,411 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+import base64
+import hashlib
+import os
+import re
+
+from src.libs.utils.analysis_cache import AnalysisCache, get_analysis_cache, get_chunks_content_hash
+from src.libs.utils.configuration import get_settings
+from src.libs.utils.process_pool import create_process_pool
+from src.libs.utils.text_files import is_text_file
+
+TOKEN_COUNT_CACHE_NAMESPACE: str = "token_counts"
+HEURISTIC_TOKENIZER_NAME: str = "heuristic"
+HEURISTIC_TOKEN_PATTERN: re.Pattern = re.compile(r"\w+|[^\w\s]|\s+")
+BPE_PRETOKENIZE_PATTERN: re.Pattern = re.compile(r"'(?:[sdmt]|ll|ve|re)| ?[^\W\d_]+| ?\d{1,3}| ?(?:[^\s\w]|_)+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+", re.IGNORECASE)
+MAX_CACHED_BPE_PIECES: int = 1 << 16
+TOKEN_COUNT_CHUNK_SIZE: int = 128
+MIN_PARALLEL_TOKEN_COUNT_FILES: int = 256
+MAX_READER_THREADS: int = 16
+STREAMING_THRESHOLD_BYTES: int = 1024 * 1024
+STREAM_CHUNK_SIZE: int = 256 * 1024
+STREAM_CUT_WINDOW: int = 4096
+MAX_STREAM_CARRY: int = 4 * STREAM_CHUNK_SIZE
+REVERSED_WORD_END_PATTERN: re.Pattern = re.compile(r"\W(?=[^\W_])")
+
+
+"""
+    Heuristic token estimate: every word, every punctuation character and every whitespace run counts as one token.
+
+    The matches are counted by the regex engine itself with a single substitution pass, so no match strings or match
+    objects are materialized.
+
+    Args:
+        text (str): Text to count.
+
+    Returns:
+        int: Estimated number of tokens.
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return HEURISTIC_TOKEN_PATTERN.subn("", text)[1]
+
+
+def read_text_file(file_path: Path) -> Optional[str]:
+    try:
+        with open(file_path, "r", encoding="utf-8") as file:
+            return file.read()
+    except (UnicodeDecodeError, OSError):
+        return None
+
+
+"""
+    Reads a text file in chunks of at most 'chunk_size' characters.
+
+    The text layer decodes UTF-8 incrementally and translates newlines like a full 'read' does, so a multi-byte character
+    or a CRLF pair split by a chunk boundary still comes out whole and the chunks join to exactly the same text.
+
+    Raises:
+        UnicodeDecodeError: When the file is not valid UTF-8.
+"""
+
+
+def read_text_chunks(file_path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    with open(file_path, "r", encoding="utf-8") as file:
+        while True:
+            chunk: str = file.read(chunk_size)
+
+            if not chunk:
+                return
+
+            yield chunk
+
+
+def is_large_file(file_path: Path) -> bool:
+    try:
+        return os.path.getsize(file_path) >= STREAMING_THRESHOLD_BYTES
+    except OSError:
+        return False
+
+
+"""
+    Finds the last point of a text where it can be cut without changing how either tokenizer splits it.
+
+    That is the last end of a word: a letter or digit followed by a non-word character. An underscore does not end a word
+    here, since the BPE pattern joins it with the punctuation and line breaks after it. Neither the heuristic pattern nor
+    the BPE pre-tokenization pattern has a match that crosses such a cut or looks past it, so counting the text before the cut and
+    the text after it separately gives the same total as counting the whole text. The tail of the text is searched first,
+    reversed, so the search usually stops after a few characters.
+
+    Text without any word end, like a huge run of word characters or of punctuation, has no such point. Once the text
+    exceeds 'max_carry' characters it is cut at its end anyway, trading an exact count at that boundary for memory that
+    stays bounded by the chunk size.
+
+    Args:
+        text (str): Text to cut.
+        max_carry (int): Length above which text without a word end is cut at its end.
+
+    Returns:
+        int: Index of the cut, 0 when the text contains no word end and is not longer than 'max_carry'.
+"""
+
+
+def find_stream_cut(text: str, max_carry: int = MAX_STREAM_CARRY) -> int:
+    window: int = STREAM_CUT_WINDOW
+
+    while True:
+        tail: str = text[-window:]
+        match: Optional[re.Match] = REVERSED_WORD_END_PATTERN.search(tail[::-1])
+
+        if match is not None:
+            return len(text) - 1 - match.start()
+
+        if window >= len(text):
+            return len(text) if len(text) > max_carry else 0
+
+        window *= 4
+
+
+"""
+    Byte-level BPE tokenizer loaded from a local vocabulary file in the tiktoken format, one '<base64 token> <rank>'
+    pair per line.
+
+    Text is split into pieces with a pre-tokenization regex and every piece is merged by rank. Token counts of pieces are
+    memoized, since source code repeats the same identifiers and indentation runs over and over.
+"""
+
+
+class BpeTokenizer:
+    def __init__(self, ranks: Dict[bytes, int], name: str) -> None:
+        self.ranks: Dict[bytes, int] = ranks
+        self.name: str = name
+        self.piece_counts: Dict[str, int] = {}
+
+    def count_piece_tokens(self, piece: bytes) -> int:
+        if piece in self.ranks:
+            return 1
+
+        parts: List[bytes] = [piece[index : index + 1] for index in range(len(piece))]
+
+        while len(parts) > 1:
+            best_rank: Optional[int] = None
+            best_index: int = -1
+
+            for index in range(len(parts) - 1):
+                rank: Optional[int] = self.ranks.get(parts[index] + parts[index + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = index
+
+            if best_rank is None:
+                break
+
+            parts[best_index : best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+
+        return len(parts)
+
+    def count_tokens(self, text: str) -> int:
+        total: int = 0
+
+        for match in BPE_PRETOKENIZE_PATTERN.finditer(text):
+            piece: str = match.group()
+            count: Optional[int] = self.piece_counts.get(piece)
+
+            if count is None:
+                count = self.count_piece_tokens(piece.encode("utf-8", "surrogatepass"))
+                if len(self.piece_counts) >= MAX_CACHED_BPE_PIECES:
+                    self.piece_counts.clear()
+                self.piece_counts[piece] = count
+
+            total += count
+
+        return total
+
+
+def load_bpe_tokenizer(vocabulary_path: Path) -> BpeTokenizer:
+    with open(vocabulary_path, "rb") as vocabulary_file:
+        vocabulary: bytes = vocabulary_file.read()
+
+    ranks: Dict[bytes, int] = {}
+
+    for line_number, line in enumerate(vocabulary.splitlines(), start=1):
+        if not line.strip():
+            continue
+
+        try:
+            token, rank = line.split()
+            ranks[base64.b64decode(token, validate=True)] = int(rank)
+        except ValueError:
+            raise ValueError(f"Invalid vocabulary entry at line {line_number} of '{vocabulary_path}'")
+
+    return BpeTokenizer(ranks, f"bpe-{hashlib.sha1(vocabulary).hexdigest()[:16]}")
+
+
+TOKENIZERS: Dict[Path, BpeTokenizer] = {}
+
+
+def get_configured_tokenizer() -> Optional[BpeTokenizer]:
+    vocabulary_path: Optional[Path] = get_settings().tokenizer_vocabulary_path
+
+    if vocabulary_path is None:
+        return None
+
+    if vocabulary_path not in TOKENIZERS:
+        TOKENIZERS[vocabulary_path] = load_bpe_tokenizer(vocabulary_path)
+
+    return TOKENIZERS[vocabulary_path]
+
+
+"""
+    Token counter with a persistent per-file cache.
+
+    File counts are stored in the analysis cache under a namespace that includes the tokenizer identity, so switching
+    vocabularies never reuses stale counts. A file whose mtime and size still match its entry is not even read, and a
+    file that was only touched is recognized by its content hash and not counted again.
+
+    Whole folders are counted with 'count_files_tokens': cache misses are split into chunks that reader threads load from
+    disk, and the chunks are tokenized in a process pool when there are enough of them and more than one CPU. At most two
+    chunks per reader thread are in flight, so memory stays bounded on large trees, and progress is reported per chunk.
+    Reader threads skip the files that 'is_text_file' rejects without reading them whole.
+
+    Files of at least 'STREAMING_THRESHOLD_BYTES' are never read whole: they are decoded in fixed-size chunks and every
+    chunk is counted up to its last word end, see 'find_stream_cut', carrying the rest over to the next chunk. Memory
+    stays at one chunk regardless of the file size, and the total is the same as for the whole text. With a cache, their
+    content hash is computed in a first streaming pass, so a large file that was only touched is not counted again.
+
+    Args:
+        cache_root (Optional[Path]): Project root the persistent cache is kept for. No persistent cache when None.
+        tokenizer (Optional[BpeTokenizer]): BPE tokenizer to count with. The heuristic estimate is used when None.
+"""
+
+
+class TokenCounter:
+    def __init__(self, cache_root: Optional[Path] = None, tokenizer: Optional[BpeTokenizer] = None) -> None:
+        self.tokenizer: Optional[BpeTokenizer] = tokenizer
+        self.name: str = tokenizer.name if tokenizer else HEURISTIC_TOKENIZER_NAME
+        self.cache: Optional[AnalysisCache] = get_analysis_cache(cache_root, f"{TOKEN_COUNT_CACHE_NAMESPACE}/{self.name}") if cache_root else None
+
+    def count_tokens(self, text: str) -> int:
+        if self.tokenizer is not None:
+            return self.tokenizer.count_tokens(text)
+
+        return estimate_tokens(text)
+
+    def count_stream_tokens(self, chunks: Iterable[str]) -> int:
+        total: int = 0
+        carry: str = ""
+
+        for chunk in chunks:
+            text: str = carry + chunk
+            cut: int = find_stream_cut(text, MAX_STREAM_CARRY)
+            total += self.count_tokens(text[:cut])
+            carry = text[cut:]
+
+        return total + self.count_tokens(carry)
+
+    def count_large_file_tokens(self, file_path: Path) -> int:
+        content_hash: Optional[str] = None
+
+        if self.cache is not None:
+            content_hash = get_chunks_content_hash(read_text_chunks(file_path))
+            cached_count: Optional[int] = self.cache.get(file_path, content_hash=content_hash)
+
+            if cached_count is not None:
+                self.cache.set(file_path, None, cached_count, content_hash=content_hash)
+                return cached_count
+
+        count: int = self.count_stream_tokens(read_text_chunks(file_path))
+
+        if self.cache is not None:
+            self.cache.set(file_path, None, count, content_hash=content_hash)
+
+        return count
+
+    def count_file_tokens(self, file_path: Path) -> int:
+        file_path = file_path.resolve()
+
+        if self.cache is not None:
+            cached_count: Optional[int] = self.cache.get(file_path)
+            if cached_count is not None:
+                return cached_count
+
+        if is_large_file(file_path):
+            return self.count_large_file_tokens(file_path)
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            content: str = file.read()
+
+        if self.cache is None:
+            return self.count_tokens(content)
+
+        count: Optional[int] = self.cache.get(file_path, content)
+
+        if count is None:
+            count = self.count_tokens(content)
+
+        self.cache.set(file_path, content, count)
+        return count
+
+    def count_files_tokens(
+        self,
+        file_paths: List[Path],
+        max_workers: Optional[int] = None,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Dict[Path, Optional[int]]:
+        max_workers = max_workers or os.cpu_count() or 1
+        results: Dict[Path, Optional[int]] = {}
+        pending: List[Path] = []
+
+        for file_path in file_paths:
+            cached_count: Optional[int] = self.cache.get(file_path.resolve()) if self.cache is not None else None
+
+            if cached_count is None:
+                pending.append(file_path)
+            else:
+                results[file_path] = cached_count
+
+        if on_progress is not None and results:
+            on_progress(len(results))
+
+        if not pending:
+            return results
+
+        process_pool: Optional[ProcessPoolExecutor] = None
+
+        if max_workers > 1 and len(pending) >= MIN_PARALLEL_TOKEN_COUNT_FILES:
+            process_pool = create_process_pool(max_workers, initializer=initialize_token_count_worker, initargs=(self.tokenizer,))
+
+        reader_threads: int = min(MAX_READER_THREADS, max_workers * 2)
+        in_flight: Deque[Future] = deque()
+
+        try:
+            with ThreadPoolExecutor(max_workers=reader_threads) as reader:
+                for index in range(0, len(pending), TOKEN_COUNT_CHUNK_SIZE):
+                    in_flight.append(reader.submit(self.count_chunk_tokens, pending[index : index + TOKEN_COUNT_CHUNK_SIZE], process_pool))
+
+                    while len(in_flight) >= reader_threads * 2:
+                        self.collect_chunk_counts(in_flight.popleft(), results, on_progress)
+
+                while in_flight:
+                    self.collect_chunk_counts(in_flight.popleft(), results, on_progress)
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown(cancel_futures=True)
+
+        return results
+
+    def count_chunk_tokens(self, chunk: List[Path], process_pool: Optional[ProcessPoolExecutor]) -> List[Tuple[Path, Optional[int]]]:
+        text_files: List[bool] = [is_text_file(file_path) for file_path in chunk]
+        large_files: List[bool] = [is_text and is_large_file(file_path) for file_path, is_text in zip(chunk, text_files)]
+        contents: List[Optional[str]] = [
+            read_text_file(file_path) if is_text and not is_large else None for file_path, is_text, is_large in zip(chunk, text_files, large_files)
+        ]
+        counts: List[Optional[int]] = [None] * len(chunk)
+        uncounted: List[int] = []
+
+        for index, content in enumerate(contents):
+            if large_files[index]:
+                try:
+                    counts[index] = self.count_large_file_tokens(chunk[index].resolve())
+                except (UnicodeDecodeError, OSError):
+                    pass
+                continue
+
+            if content is None:
+                continue
+
+            if self.cache is not None:
+                counts[index] = self.cache.get(chunk[index].resolve(), content)
+
+            if counts[index] is None:
+                uncounted.append(index)
+
+        texts: List[str] = [contents[index] for index in uncounted]
+
+        if process_pool is not None and texts:
+            new_counts: List[int] = process_pool.submit(count_texts_tokens, texts).result()
+        else:
+            new_counts = [self.count_tokens(text) for text in texts]
+
+        for index, count in zip(uncounted, new_counts):
+            counts[index] = count
+
+        if self.cache is not None:
+            for index, content in enumerate(contents):
+                if content is not None:
+                    self.cache.set(chunk[index].resolve(), content, counts[index])
+
+        return list(zip(chunk, counts))
+
+    def collect_chunk_counts(self, future: Future, results: Dict[Path, Optional[int]], on_progress: Optional[Callable[[int], None]]) -> None:
+        chunk_counts: List[Tuple[Path, Optional[int]]] = future.result()
+        results.update(chunk_counts)
+
+        if on_progress is not None:
+            on_progress(len(chunk_counts))
+
+
+WORKER_TOKEN_COUNTER: Optional[TokenCounter] = None
+
+
+def initialize_token_count_worker(tokenizer: Optional[BpeTokenizer]) -> None:
+    global WORKER_TOKEN_COUNTER
+    WORKER_TOKEN_COUNTER = TokenCounter(None, tokenizer)
+
+
+def count_texts_tokens(texts: List[str]) -> List[int]:
+    return [WORKER_TOKEN_COUNTER.count_tokens(text) for text in texts]
@@ -0,0 +1,228 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import atexit
+import json
+import multiprocessing
+import os
+import threading
+import time
+
+from src.libs.utils.configuration import get_settings
+
+CHROME_TRACE_FORMAT: str = "chrome"
+SUMMARY_TRACE_FORMAT: str = "summary"
+TRACE_FORMATS: List[str] = [CHROME_TRACE_FORMAT, SUMMARY_TRACE_FORMAT]
+
+TraceEvent = Tuple[str, int, int, int, int, Dict[str, Any]]
+
+
+class NullSpan:
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+NULL_SPAN: NullSpan = NullSpan()
+
+
+class TraceSpan:
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]) -> None:
+        self.tracer: Tracer = tracer
+        self.name: str = name
+        self.args: Dict[str, Any] = args
+        self.child_ns: int = 0
+
+    def __enter__(self) -> "TraceSpan":
+        self.stack: List[TraceSpan] = self.tracer.get_stack()
+        self.stack.append(self)
+        self.started_at: int = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration: int = time.perf_counter_ns() - self.started_at
+        self.stack.pop()
+
+        if self.stack:
+            self.stack[-1].child_ns += duration
+
+        self.tracer.events.append((self.name, self.started_at, duration, duration - self.child_ns, threading.get_ident(), self.args))
+
+
+class AggregateSpan:
+    def __init__(self, tracer: "Tracer", name: str) -> None:
+        self.tracer: Tracer = tracer
+        self.name: str = name
+
+    def __enter__(self) -> "AggregateSpan":
+        self.started_at: int = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        duration: int = time.perf_counter_ns() - self.started_at
+        stack: List[TraceSpan] = self.tracer.get_stack()
+
+        if stack:
+            stack[-1].child_ns += duration
+
+        self.tracer.add_aggregate(self.name, duration)
+
+
+"""
+    Collects the spans of one process and writes them when tracing stops.
+
+    Spans nest per thread, and the self time of a span excludes the time of the spans opened inside it, so the summary
+    shows where the time actually went. The Chrome format is a trace event file that chrome://tracing and Perfetto open
+    directly, with one complete event per span. The summary format aggregates the spans by name into their count, total,
+    self and maximum time. Span arguments are converted to strings only when the trace is written.
+
+    Aggregated spans, for work done once per path or per item, only add to a running count and total per name. Their
+    time is excluded from the self time of the enclosing span like a child span, they are listed next to the other spans
+    in the summary, and they are written under 'otherData' in the Chrome format, which has no event for them.
+"""
+
+
+class Tracer:
+    def __init__(self, output_path: Path, output_format: str = CHROME_TRACE_FORMAT) -> None:
+        if output_format not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format '{output_format}'. Expected one of: {', '.join(TRACE_FORMATS)}.")
+
+        self.output_path: Path = output_path
+        self.output_format: str = output_format
+        self.events: List[TraceEvent] = []
+        self.aggregates: Dict[str, List[int]] = {}
+        self.aggregates_lock: threading.Lock = threading.Lock()
+        self.local: threading.local = threading.local()
+        self.started_at: int = time.perf_counter_ns()
+        self.pid: int = os.getpid()
+
+    def get_stack(self) -> List[TraceSpan]:
+        stack: Optional[List[TraceSpan]] = getattr(self.local, "stack", None)
+
+        if stack is None:
+            stack = self.local.stack = []
+
+        return stack
+
+    def add_aggregate(self, name: str, duration: int) -> None:
+        with self.aggregates_lock:
+            total: List[int] = self.aggregates.setdefault(name, [0, 0, 0])
+            total[0] += 1
+            total[1] += duration
+            total[2] = max(total[2], duration)
+
+    def get_aggregate_spans(self) -> List[Dict[str, Any]]:
+        return [
+            {"name": name, "count": count, "total_ms": total_ns / 1e6, "self_ms": total_ns / 1e6, "max_ms": max_ns / 1e6}
+            for name, (count, total_ns, max_ns) in self.aggregates.items()
+        ]
+
+    def get_chrome_trace(self) -> Dict[str, Any]:
+        trace_events: List[Dict[str, Any]] = []
+
+        for name, started_at, duration, _, thread_id, args in self.events:
+            trace_events.append(
+                {
+                    "name": name,
+                    "cat": name.split(".", 1)[0],
+                    "ph": "X",
+                    "ts": (started_at - self.started_at) / 1000,
+                    "dur": duration / 1000,
+                    "pid": self.pid,
+                    "tid": thread_id,
+                    "args": args,
+                }
+            )
+
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms", "otherData": {"aggregates": self.get_aggregate_spans()}}
+
+    def get_summary(self) -> Dict[str, Any]:
+        totals: Dict[str, List[int]] = {}
+
+        for name, _, duration, self_duration, _, _ in self.events:
+            total: List[int] = totals.setdefault(name, [0, 0, 0, 0])
+            total[0] += 1
+            total[1] += duration
+            total[2] += self_duration
+            total[3] = max(total[3], duration)
+
+        spans: List[Dict[str, Any]] = [
+            {"name": name, "count": count, "total_ms": total_ns / 1e6, "self_ms": self_ns / 1e6, "max_ms": max_ns / 1e6}
+            for name, (count, total_ns, self_ns, max_ns) in totals.items()
+        ]
+        spans.extend(self.get_aggregate_spans())
+        spans.sort(key=lambda span: span["self_ms"], reverse=True)
+
+        return {"elapsed_ms": (time.perf_counter_ns() - self.started_at) / 1e6, "spans": spans}
+
+    def write(self) -> None:
+        content: Dict[str, Any] = self.get_chrome_trace() if self.output_format == CHROME_TRACE_FORMAT else self.get_summary()
+
+        self.output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(self.output_path, "w", encoding="utf-8") as trace_file:
+            json.dump(content, trace_file, default=str)
+
+
+TRACER: Optional[Tracer] = None
+
+
+"""
+    Opens a span around the block of a 'with' statement, e.g. 'with trace_span("parse", file=file_path):'.
+
+    When tracing is disabled a shared no-op span is returned, so an instrumented block costs one call and one global
+    lookup. Spans are meant for phases and files, not for work done once per AST node or per line. Work done once per
+    path, like the gitignore checks of a walk, is measured with 'trace_aggregate' instead.
+
+    Args:
+        name (str): Name of the phase. The part before the first '.' is used as the Chrome trace category.
+        **args (Any): Values attached to the span, such as the file being processed.
+
+    Returns:
+        TraceSpan | NullSpan: The context manager of the span.
+"""
+
+
+def trace_span(name: str, **args: Any) -> TraceSpan | NullSpan:
+    if TRACER is None:
+        return NULL_SPAN
+
+    return TraceSpan(TRACER, name, args)
+
+
+def trace_aggregate(name: str) -> AggregateSpan | NullSpan:
+    if TRACER is None:
+        return NULL_SPAN
+
+    return AggregateSpan(TRACER, name)
+
+
+def start_tracing(output_path: Path, output_format: str = CHROME_TRACE_FORMAT) -> Tracer:
+    global TRACER
+
+    if TRACER is None:
+        atexit.register(stop_tracing)
+    else:
+        TRACER.write()
+
+    TRACER = Tracer(output_path, output_format)
+    return TRACER
+
+
+def stop_tracing() -> Optional[Path]:
+    global TRACER
+
+    if TRACER is None or TRACER.pid != os.getpid():
+        return None
+
+    tracer: Tracer = TRACER
+    TRACER = None
+    tracer.write()
+
+    return tracer.output_path
+
+
+# Worker processes of the process pools import this module too; only the main process writes the trace.
+if get_settings().trace_path and multiprocessing.parent_process() is None:
+    start_tracing(get_settings().trace_path, get_settings().trace_format or CHROME_TRACE_FORMAT)
@@ -0,0 +1,111 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+import os
+
+from src.libs.utils.analysis_cache import AnalysisCache, get_analysis_cache
+from src.libs.utils.code_analysis import ANALYSIS_CACHE_NAMESPACE, ModuleSummary, get_local_imports
+from src.libs.utils.file_system import read_file_content
+from src.libs.utils.gitignore import GitignoreMatcher
+from src.libs.utils.process_pool import create_process_pool
+
+MIN_PARALLEL_FRONTIER_SIZE: int = 8
+
+
+def summarize_module_content(content: str) -> Optional[ModuleSummary]:
+    try:
+        return ModuleSummary(content)
+    except Exception:
+        return None
+
+
+"""
+    Breadth-first walk over the local import graph of a start file.
+
+    Every frontier of newly discovered files that are not in the analysis cache is parsed and summarized: in a process
+    pool when it has at least 'MIN_PARALLEL_FRONTIER_SIZE' files, in this process otherwise. Files are read once, here,
+    and workers receive their content, so only the content goes out and the module summaries travel back. The summaries
+    are stored in the analysis cache, so the depth-first passes of the prompt command that run afterwards find every
+    module already analyzed and keep their output order, and later runs do not parse unchanged modules again. Files that fail to parse are left for the prompt command
+    to handle as before.
+
+    Args:
+        start_file (Path): File the traversal starts from.
+        project_root (Path): The root of the project, used for import resolution and the analysis cache.
+        gitignore_matcher (GitignoreMatcher): Gitignore rules of the project.
+        allowed_files (List[str]): File names that are never ignored.
+        should_ignore (Callable[[Path], bool]): Predicate for files the traversal must not enter.
+        max_workers (Optional[int]): Size of the process pool. Defaults to the number of CPUs.
+
+    Returns:
+        Set[Path]: Every file reached from the start file.
+"""
+
+
+def prefetch_import_graph(
+    start_file: Path,
+    project_root: Path,
+    gitignore_matcher: GitignoreMatcher,
+    allowed_files: List[str],
+    should_ignore: Callable[[Path], bool],
+    max_workers: Optional[int] = None,
+) -> Set[Path]:
+    analysis_cache: AnalysisCache = get_analysis_cache(project_root, ANALYSIS_CACHE_NAMESPACE)
+    max_workers = max_workers or os.cpu_count() or 1
+    executor: Optional[ProcessPoolExecutor] = None
+    visited: Set[Path] = {start_file}
+    frontier: List[Path] = [start_file]
+
+    try:
+        while frontier:
+            contents: Dict[Path, str] = {}
+            pending: List[Path] = []
+
+            for file_path in frontier:
+                content: Optional[str] = read_file_content(file_path)
+
+                if content is None:
+                    continue
+
+                contents[file_path] = content
+
+                if analysis_cache.get(file_path, content) is None:
+                    pending.append(file_path)
+
+            pending_contents: List[str] = [contents[file_path] for file_path in pending]
+            summaries: Iterable[Optional[ModuleSummary]]
+
+            if max_workers > 1 and len(pending) >= MIN_PARALLEL_FRONTIER_SIZE:
+                if executor is None:
+                    executor = create_process_pool(max_workers)
+
+                summaries = executor.map(summarize_module_content, pending_contents, chunksize=max(1, len(pending) // (max_workers * 4)))
+            else:
+                summaries = map(summarize_module_content, pending_contents)
+
+            for file_path, summary in zip(pending, summaries):
+                if summary is not None:
+                    analysis_cache.set(file_path, contents[file_path], summary)
+
+            next_frontier: List[Path] = []
+
+            for file_path in frontier:
+                if file_path not in contents:
+                    continue
+
+                try:
+                    imports, _, _ = get_local_imports(contents[file_path], file_path, project_root, gitignore_matcher, allowed_files)
+                except Exception:
+                    continue
+
+                for import_path in imports:
+                    if import_path not in visited and not should_ignore(import_path):
+                        visited.add(import_path)
+                        next_frontier.append(import_path)
+
+            frontier = next_frontier
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return visited
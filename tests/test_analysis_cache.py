@@ -0,0 +1,21 @@
+from pathlib import Path
+
+import pytest
+
+from src.libs.utils.analysis_cache import AnalysisCache
+
+
+def test_cache_is_stored_outside_of_the_project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    project_root: Path = tmp_path / "project"
+    project_root.mkdir()
+    file_path: Path = project_root / "module.py"
+    file_path.write_text("value = 1\n")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr("sys.platform", "linux")
+
+    AnalysisCache(project_root, "summaries").set(file_path, "value = 1\n", {"names": ["value"]})
+
+    assert [path.name for path in project_root.iterdir()] == ["module.py"]
+    assert AnalysisCache(project_root, "summaries").get(file_path, "value = 1\n") == {"names": ["value"]}
+    assert AnalysisCache(project_root, "summaries").get(file_path, "value = 2\n") is None
+    assert list((tmp_path / "cache" / "rce").iterdir())[0].name.startswith("project-")
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+from argparse import Namespace
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 12), reason="src/libs/helpers/console.py uses Python 3.12 f-strings")
+
+project_root: Path = Path(__file__).resolve().parents[1]
+
+
+def get_batch_jobs(tmp_path: Path, job_file: Dict[str, Any], workers: Any = None) -> Any:
+    from src.apps.console.classes.batch_app import get_jobs
+
+    job_file_path: Path = tmp_path / "jobs.json"
+    job_file_path.write_text(json.dumps(job_file))
+
+    return get_jobs(Namespace(command="batch", job_file=str(job_file_path), workers=workers))
+
+
+def test_invalid_yaml_is_a_value_error(tmp_path: Path) -> None:
+    pytest.importorskip("yaml")
+    from src.apps.console.classes.batch_app import load_job_file
+
+    job_file_path: Path = tmp_path / "jobs.yaml"
+    job_file_path.write_text("jobs: [\n  - a: 1\n bad")
+
+    with pytest.raises(ValueError, match="not valid YAML"):
+        load_job_file(job_file_path)
+
+
+@pytest.mark.parametrize("workers", [0, -2, "4", 2.5, True])
+def test_workers_must_be_a_positive_integer(tmp_path: Path, workers: Any) -> None:
+    with pytest.raises(ValueError, match="'workers' must be a positive integer"):
+        get_batch_jobs(tmp_path, {"workers": workers, "jobs": []})
+
+    if not isinstance(workers, bool) and isinstance(workers, int):
+        with pytest.raises(ValueError, match="'workers' must be a positive integer"):
+            get_batch_jobs(tmp_path, {"jobs": []}, workers)
+
+
+def test_workers_default_to_the_job_file(tmp_path: Path) -> None:
+    assert get_batch_jobs(tmp_path, {"workers": 3, "jobs": [{"folders": "src"}]})[1] == 3
+    assert get_batch_jobs(tmp_path, {"workers": 3, "jobs": []}, 2)[1] == 2
+    assert get_batch_jobs(tmp_path, {"jobs": []})[1] == 1
+
+
+def test_non_string_instructions_are_converted(tmp_path: Path) -> None:
+    from src.apps.console.classes.batch_app import normalize_job
+
+    (tmp_path / "src").mkdir()
+    job: Dict[str, Any] = normalize_job({"project_root": str(tmp_path), "folders": "src", "instructions": 42, "context": 7})
+
+    assert job["prompt_options"]["instructions"] == "42\n"
+    assert job["prompt_options"]["ending_context"] == "7"
+
+
+def test_headless_batch_never_builds_a_prompt_session(tmp_path: Path) -> None:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("VALUE = 1\n")
+    job_file_path: Path = tmp_path / "jobs.json"
+    job_file_path.write_text(json.dumps({"jobs": [{"project_root": str(tmp_path), "folders": "src", "instructions": "Explain.", "output": str(tmp_path / "out.txt")}]}))
+    environment: Dict[str, str] = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"), "LOGGING_LEVEL": "none"}
+
+    result: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "src/apps/console/main.py", "batch", str(job_file_path)],
+        cwd=project_root,
+        env=environment,
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert "not a terminal" not in result.stdout + result.stderr
+    assert "VALUE = 1" in (tmp_path / "out.txt").read_text()
@@ -0,0 +1,29 @@
+from typing import Dict, Optional
+
+import pytest
+
+from src.libs.utils.configuration import CONFIG_KEYS, DEFAULT_MAX_PROMPT_FILE_BYTES, Settings
+
+
+def create_settings(**values: str) -> Settings:
+    settings_values: Dict[str, Optional[str]] = {key: None for key in CONFIG_KEYS}
+    settings_values.update(values)
+    return Settings(settings_values)
+
+
+def test_numeric_settings_are_parsed() -> None:
+    settings: Settings = create_settings(PROMPT_TOKEN_BUDGET="2000", MAX_PROMPT_FILE_BYTES="4096")
+
+    assert (settings.prompt_token_budget, settings.max_prompt_file_bytes) == (2000, 4096)
+
+
+@pytest.mark.parametrize("value", ["abc", "1.5", "0", "-3"])
+def test_invalid_numeric_settings_fall_back_with_a_warning(value: str) -> None:
+    with pytest.warns(UserWarning, match="PROMPT_TOKEN_BUDGET"):
+        budget_settings: Settings = create_settings(PROMPT_TOKEN_BUDGET=value)
+
+    with pytest.warns(UserWarning, match="MAX_PROMPT_FILE_BYTES"):
+        size_settings: Settings = create_settings(MAX_PROMPT_FILE_BYTES=value)
+
+    assert budget_settings.prompt_token_budget is None
+    assert size_settings.max_prompt_file_bytes == DEFAULT_MAX_PROMPT_FILE_BYTES
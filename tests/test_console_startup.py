@@ -0,0 +1,75 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+project_root: Path = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES: List[str] = [
+    "src.apps.console.classes.commands.context",
+    "src.apps.console.classes.commands.create_react_structure",
+    "src.apps.console.classes.commands.prompt",
+    "src.libs.utils.analysis_cache",
+    "src.libs.utils.code_analysis",
+    "src.libs.utils.module_index",
+    "src.libs.utils.prompt_packer",
+    "src.libs.utils.symbol_graph",
+    "src.libs.utils.token_counter",
+    "src.libs.utils.traversal",
+]
+
+STARTUP_SCRIPT: str = """
+import json
+import sys
+import time
+
+started_at = time.perf_counter()
+
+from src.apps.console import main
+from src.apps.console.classes.console_app import STARTUP_BUDGET_SECONDS, ConsoleApp
+
+app = ConsoleApp(started_at=started_at)
+app.parse_command("prompt --watch")
+app.parse_command("help")
+startup_seconds = time.perf_counter() - started_at
+
+print(json.dumps({"modules": sorted(sys.modules), "seconds": startup_seconds, "budget": STARTUP_BUDGET_SECONDS}))
+"""
+
+requires_console = pytest.mark.skipif(sys.version_info < (3, 12), reason="src/libs/helpers/console.py uses Python 3.12 f-strings")
+
+
+def run_startup() -> Dict[str, Any]:
+    result: subprocess.CompletedProcess = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT], cwd=project_root, stdin=subprocess.DEVNULL, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@requires_console
+def test_startup_skips_heavy_modules() -> None:
+    startup: Dict[str, Any] = run_startup()
+
+    assert [module for module in HEAVY_MODULES if module in startup["modules"]] == []
+
+
+@requires_console
+def test_startup_is_within_budget() -> None:
+    startup: Dict[str, Any] = run_startup()
+
+    assert startup["seconds"] < startup["budget"]
+
+
+@requires_console
+def test_manifest_matches_commands() -> None:
+    from src.apps.console.classes.command_registry import COMMAND_MANIFEST
+    from src.apps.console.classes.console_app import ConsoleApp
+
+    app: ConsoleApp = ConsoleApp()
+
+    for spec in COMMAND_MANIFEST:
+        command = app.commands[spec.name]
+        assert (command.name, command.description) == (spec.name, spec.description)
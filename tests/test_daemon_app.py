@@ -0,0 +1,139 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 12), reason="src/libs/helpers/console.py uses Python 3.12 f-strings")
+
+project_root: Path = Path(__file__).resolve().parents[1]
+
+DAEMON_START_TIMEOUT_SECONDS: float = 20.0
+
+
+@pytest.fixture
+def analyzed_project(tmp_path: Path) -> Path:
+    analyzed_project_root: Path = tmp_path / "project"
+    (analyzed_project_root / "src").mkdir(parents=True)
+    (analyzed_project_root / "src" / "app.py").write_text("def run():\n    return 1\n")
+    return analyzed_project_root
+
+
+@pytest.fixture
+def daemon_socket(tmp_path: Path, analyzed_project: Path) -> Iterator[Path]:
+    from src.apps.console.classes.daemon_app import send_daemon_request
+
+    socket_path: Path = tmp_path / "daemon.sock"
+    environment: Dict[str, str] = {**os.environ, "XDG_CACHE_HOME": str(tmp_path / "cache"), "LOGGING_LEVEL": "none"}
+    environment.pop("TRACE_PATH", None)
+    daemon: subprocess.Popen = subprocess.Popen(
+        [sys.executable, "src/apps/console/main.py", "daemon", "--socket", str(socket_path), "--project-root", str(analyzed_project)],
+        cwd=project_root,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    deadline: float = time.monotonic() + DAEMON_START_TIMEOUT_SECONDS
+
+    while True:
+        try:
+            send_daemon_request(socket_path, {"command": "ping"}, timeout=1)
+            break
+        except OSError:
+            if daemon.poll() is not None or time.monotonic() > deadline:
+                daemon.kill()
+                pytest.fail(f"The daemon did not start: {daemon.communicate()[1].decode()}")
+
+            time.sleep(0.05)
+
+    try:
+        yield socket_path
+    finally:
+        if daemon.poll() is None:
+            daemon.kill()
+
+        daemon.communicate()
+
+
+def test_ping_prompt_and_shutdown(daemon_socket: Path, analyzed_project: Path) -> None:
+    from src.apps.console.classes.daemon_app import send_daemon_request
+
+    prompt_request: Dict[str, Any] = {"id": 1, "command": "prompt", "project_root": str(analyzed_project), "folders": "src", "instructions": "Explain."}
+
+    ping_response: Dict[str, Any] = send_daemon_request(daemon_socket, {"id": "ping", "command": "ping"}, timeout=10)
+    assert ping_response["ok"] and ping_response["id"] == "ping"
+    assert ping_response["result"]["projects"] == [str(analyzed_project.resolve())]
+
+    first_response: Dict[str, Any] = send_daemon_request(daemon_socket, prompt_request, timeout=30)
+    assert first_response["ok"], first_response
+    assert "return 1" in first_response["result"]["content"] and first_response["result"]["output"] is None
+    assert first_response["result"]["tokens"] > 0
+
+    (analyzed_project / "src" / "app.py").write_text("def run():\n    return 'edited'\n")
+
+    second_response: Dict[str, Any] = send_daemon_request(daemon_socket, prompt_request, timeout=30)
+    assert second_response["ok"], second_response
+    assert "return 'edited'" in second_response["result"]["content"] and "return 1" not in second_response["result"]["content"]
+    assert not (analyzed_project / "prompt.log").exists()
+
+    assert send_daemon_request(daemon_socket, {"command": "shutdown"}, timeout=10)["ok"]
+
+    deadline: float = time.monotonic() + 10
+
+    while daemon_socket.exists() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert not daemon_socket.exists()
+
+
+def test_invalid_and_oversized_requests_are_rejected(daemon_socket: Path) -> None:
+    from src.apps.console.classes.daemon_app import MAX_REQUEST_BYTES, send_daemon_request
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(10)
+        client.connect(str(daemon_socket))
+
+        with client.makefile("rwb") as connection:
+            connection.write(b"{not json\n[1, 2]\n")
+            connection.flush()
+            responses: List[bytes] = [connection.readline(), connection.readline()]
+
+    assert b"Invalid JSON" in responses[0] and b"must be a JSON object" in responses[1]
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(10)
+        client.connect(str(daemon_socket))
+
+        with client.makefile("rwb") as connection:
+            connection.write(b'{"command": "ping", "padding": "' + b"x" * MAX_REQUEST_BYTES + b'"}\n')
+            connection.flush()
+            response: bytes = connection.readline()
+
+    assert f"Requests are limited to {MAX_REQUEST_BYTES} bytes".encode() in response
+    assert send_daemon_request(daemon_socket, {"command": "ping"}, timeout=10)["ok"]
+
+
+def test_prepare_socket_path_removes_stale_sockets(tmp_path: Path) -> None:
+    from src.apps.console.classes.daemon_app import prepare_socket_path
+
+    socket_path: Path = tmp_path / "stale.sock"
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale_server:
+        stale_server.bind(str(socket_path))
+
+    assert socket_path.exists()
+    prepare_socket_path(socket_path)
+    assert not socket_path.exists()
+
+
+def test_prepare_socket_path_keeps_running_daemons(daemon_socket: Path) -> None:
+    from src.apps.console.classes.daemon_app import prepare_socket_path
+
+    with pytest.raises(ValueError, match="already listening"):
+        prepare_socket_path(daemon_socket)
+
+    assert daemon_socket.exists()
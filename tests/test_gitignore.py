@@ -0,0 +1,96 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from src.libs.utils.gitignore import GitignoreMatcher
+
+ROOT_GITIGNORE: str = "*.log\n!keep.log\n/build\n!/build/keep.py\ndocs/*.tmp\n**/cache/\nlogs/**/debug.txt\nout/\n"
+NESTED_GITIGNORE: str = "*.txt\n!important.txt\n"
+
+# Verdicts of 'git check-ignore' on the same tree.
+EXPECTED_VERDICTS: Dict[str, bool] = {
+    "a.log": True,
+    "keep.log": False,
+    "sub/deep/b.log": True,
+    "build/x.py": True,
+    "build/keep.py": True,
+    "src/build/x.py": False,
+    "docs/a.tmp": True,
+    "docs/nested/a.tmp": False,
+    "other/docs/a.tmp": False,
+    "x/y/cache/f.py": True,
+    "z/cache": False,
+    "logs/debug.txt": True,
+    "logs/a/b/debug.txt": True,
+    "out/f.py": True,
+    "src/out": False,
+    "sub/notes.txt": True,
+    "sub/important.txt": False,
+    "sub/deep/notes.txt": True,
+    "notes.txt": False,
+    "src/keep.py": False,
+}
+
+
+@pytest.fixture
+def project_root(tmp_path: Path) -> Path:
+    (tmp_path / ".gitignore").write_text(ROOT_GITIGNORE)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / ".gitignore").write_text(NESTED_GITIGNORE)
+
+    for relative_path in EXPECTED_VERDICTS:
+        file_path: Path = tmp_path / relative_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.touch()
+
+    return tmp_path
+
+
+def get_ignored_paths(matcher: GitignoreMatcher, project_root: Path, relative_paths: List[str]) -> List[str]:
+    return [relative_path for relative_path in relative_paths if matcher.is_ignored(project_root / relative_path)]
+
+
+def test_negation_overrides_earlier_patterns(project_root: Path) -> None:
+    matcher: GitignoreMatcher = GitignoreMatcher(project_root)
+
+    assert get_ignored_paths(matcher, project_root, ["a.log", "keep.log", "sub/important.txt", "sub/notes.txt"]) == ["a.log", "sub/notes.txt"]
+
+
+def test_negation_does_not_reinclude_files_of_ignored_directories(project_root: Path) -> None:
+    assert GitignoreMatcher(project_root).is_ignored(project_root / "build" / "keep.py")
+
+
+def test_anchored_and_unanchored_patterns(project_root: Path) -> None:
+    matcher: GitignoreMatcher = GitignoreMatcher(project_root)
+
+    assert get_ignored_paths(matcher, project_root, ["build/x.py", "src/build/x.py", "docs/a.tmp", "docs/nested/a.tmp", "other/docs/a.tmp", "sub/deep/b.log"]) == [
+        "build/x.py",
+        "docs/a.tmp",
+        "sub/deep/b.log",
+    ]
+
+
+def test_double_star_matches_any_number_of_directories(project_root: Path) -> None:
+    matcher: GitignoreMatcher = GitignoreMatcher(project_root)
+
+    assert get_ignored_paths(matcher, project_root, ["x/y/cache/f.py", "logs/debug.txt", "logs/a/b/debug.txt"]) == ["x/y/cache/f.py", "logs/debug.txt", "logs/a/b/debug.txt"]
+
+
+def test_directory_only_patterns_skip_files(project_root: Path) -> None:
+    matcher: GitignoreMatcher = GitignoreMatcher(project_root)
+
+    assert get_ignored_paths(matcher, project_root, ["out/f.py", "src/out", "z/cache"]) == ["out/f.py"]
+    assert matcher.is_ignored(project_root / "out", is_dir=True)
+
+
+def test_nested_gitignore_applies_only_below_its_directory(project_root: Path) -> None:
+    matcher: GitignoreMatcher = GitignoreMatcher(project_root)
+
+    assert get_ignored_paths(matcher, project_root, ["notes.txt", "sub/notes.txt", "sub/deep/notes.txt"]) == ["sub/notes.txt", "sub/deep/notes.txt"]
+
+
+def test_matches_git_check_ignore(project_root: Path) -> None:
+    matcher: GitignoreMatcher = GitignoreMatcher(project_root)
+
+    assert {relative_path: matcher.is_ignored(project_root / relative_path) for relative_path in EXPECTED_VERDICTS} == EXPECTED_VERDICTS
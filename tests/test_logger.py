@@ -0,0 +1,68 @@
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pytest
+
+from src.libs.services.logger import logger
+from src.libs.services.logger.logger import LogSystem
+from src.libs.utils.configuration import CONFIG_KEYS, Settings
+
+
+@pytest.fixture
+def raw_log_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    monkeypatch.setattr(logger, "RAW_LOG_PATH", tmp_path / "raw.log")
+    yield tmp_path / "raw.log"
+    logger.LOG_SYSTEM.pid = None
+
+
+def create_log_system(monkeypatch: pytest.MonkeyPatch, logging_level: str) -> LogSystem:
+    settings_values: Dict[str, Optional[str]] = {key: None for key in CONFIG_KEYS}
+    settings_values["LOGGING_LEVEL"] = logging_level
+    settings: Settings = Settings(settings_values)
+    monkeypatch.setattr(logger, "get_settings", lambda: settings)
+
+    return LogSystem()
+
+
+def test_stop_flushes_queued_records(raw_log_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log_system: LogSystem = create_log_system(monkeypatch, "debug")
+
+    for index in range(500):
+        log_system.get_logger().debug("record %d", index)
+
+    log_system.stop()
+    lines: List[str] = raw_log_path.read_text().splitlines()
+
+    assert len(lines) == 500
+    assert lines[0].endswith("DEBUG record 0") and lines[-1].endswith("DEBUG record 499")
+
+
+def test_raw_log_is_rotated(raw_log_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(logger, "RAW_LOG_MAX_BYTES", 1024)
+    log_system: LogSystem = create_log_system(monkeypatch, "debug")
+
+    for index in range(200):
+        log_system.get_logger().debug("record %d %s", index, "x" * 40)
+
+    log_system.stop()
+
+    assert sorted(path.name for path in raw_log_path.parent.iterdir()) == ["raw.log", "raw.log.1", "raw.log.2", "raw.log.3"]
+    assert all(path.stat().st_size <= 1024 for path in raw_log_path.parent.iterdir())
+    assert raw_log_path.read_text().splitlines()[-1].endswith(f"record 199 {'x' * 40}")
+
+
+def test_records_below_the_level_are_dropped(raw_log_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log_system: LogSystem = create_log_system(monkeypatch, "error")
+    log_system.get_logger().debug("hidden")
+    log_system.get_logger().error("shown")
+    log_system.stop()
+
+    assert [line.split(" ", 2)[2] for line in raw_log_path.read_text().splitlines()] == ["ERROR shown"]
+
+
+def test_nothing_is_written_when_logging_is_off(raw_log_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    log_system: LogSystem = create_log_system(monkeypatch, "none")
+    log_system.get_logger().critical("hidden")
+    log_system.stop()
+
+    assert not raw_log_path.exists()
@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from src.libs.utils.prompt_document import PromptDocument
+
+
+def test_copy_is_independent_of_packing(tmp_path: Path) -> None:
+    prompt_document: PromptDocument = PromptDocument(tmp_path)
+    prompt_document.add_file(tmp_path / "a.py", "a = 1\n")
+    prompt_document.add_file(tmp_path / "b.py", "b = 2\n")
+    prompt_document.write("<instructions>")
+    rendered: str = prompt_document.render()
+
+    copied_document: PromptDocument = prompt_document.copy()
+    copied_document.segments[tmp_path / "a.py"].replace("a = ...")
+    copied_document.remove_file(tmp_path / "b.py")
+    copied_document.write("</instructions>")
+
+    assert prompt_document.render() == rendered
+    assert "a = ..." in copied_document.render()
+    assert "b = 2" not in copied_document.render()
+
+
+def test_replace_unique_file_updates_content(tmp_path: Path) -> None:
+    prompt_document: PromptDocument = PromptDocument(tmp_path)
+    prompt_document.add_unique_file(tmp_path / "a.py", "first = 1\n")
+
+    assert prompt_document.replace_unique_file(tmp_path / "a.py", "second = 2\n")
+    assert prompt_document.segments[tmp_path / "a.py"].get_content() == "second = 2\n"
+    assert list(prompt_document.content_owners.values()) == [tmp_path / "a.py"]
+
+
+def test_replace_unique_file_rejects_duplicates(tmp_path: Path) -> None:
+    content: str = "value = 'a long enough line to be replaced by a reference'\n"
+    prompt_document: PromptDocument = PromptDocument(tmp_path)
+    prompt_document.add_unique_file(tmp_path / "a.py", content)
+    prompt_document.add_unique_file(tmp_path / "b.py", content)
+    prompt_document.add_unique_file(tmp_path / "c.py", "other = 3\n")
+
+    assert not prompt_document.replace_unique_file(tmp_path / "a.py", "changed = 1\n")
+    assert not prompt_document.replace_unique_file(tmp_path / "b.py", "changed = 1\n")
+    assert not prompt_document.replace_unique_file(tmp_path / "c.py", content)
@@ -0,0 +1,61 @@
+from pathlib import Path
+from typing import List
+
+from src.libs.utils.prompt_document import PromptDocument
+from src.libs.utils.prompt_packer import FULL_SOURCE_LEVEL, OMITTED_LEVEL, SIGNATURES_LEVEL, PackingCandidate, PackingReport, pack_prompt_document
+
+ORIGINAL_CONTENT: str = "def shared(value):\n" + "    value = value + 1\n" * 40 + "    return value\n"
+OTHER_CONTENT: str = "def other(value):\n" + "    value = value * 2\n" * 40 + "    return value\n"
+
+
+def count_words(text: str) -> int:
+    return len(text.split())
+
+
+def create_document(project_root: Path) -> PromptDocument:
+    prompt_document: PromptDocument = PromptDocument(project_root)
+    prompt_document.add_unique_file(project_root / "a.py", ORIGINAL_CONTENT)
+    prompt_document.add_unique_file(project_root / "b.py", ORIGINAL_CONTENT)
+    prompt_document.add_unique_file(project_root / "c.py", OTHER_CONTENT)
+
+    return prompt_document
+
+
+def create_candidates(prompt_document: PromptDocument) -> List[PackingCandidate]:
+    return [
+        PackingCandidate(file_path, 1, FULL_SOURCE_LEVEL, {SIGNATURES_LEVEL: "def placeholder(value): ..."})
+        for file_path in prompt_document.segments
+    ]
+
+
+def test_duplicate_is_written_as_reference(tmp_path: Path) -> None:
+    prompt_document: PromptDocument = create_document(tmp_path)
+
+    assert prompt_document.references == {tmp_path / "b.py": tmp_path / "a.py"}
+    assert prompt_document.segments[tmp_path / "b.py"].get_content() == "Identical to a.py"
+
+
+def test_packing_keeps_originals_of_references(tmp_path: Path) -> None:
+    prompt_document: PromptDocument = create_document(tmp_path)
+    candidates: List[PackingCandidate] = create_candidates(prompt_document)
+    token_budget: int = count_words(prompt_document.render()) - 10
+
+    report: PackingReport = pack_prompt_document(prompt_document, candidates, token_budget, count_words)
+
+    assert [candidate.file_path for candidate in report.degraded] == [tmp_path / "c.py"]
+    assert prompt_document.segments[tmp_path / "a.py"].get_content() == ORIGINAL_CONTENT
+    assert prompt_document.segments[tmp_path / "b.py"].get_content() == "Identical to a.py"
+    assert not report.is_over_budget()
+
+
+def test_packing_never_omits_originals_of_references(tmp_path: Path) -> None:
+    prompt_document: PromptDocument = create_document(tmp_path)
+    candidates: List[PackingCandidate] = create_candidates(prompt_document)
+
+    report: PackingReport = pack_prompt_document(prompt_document, candidates, 1, count_words)
+
+    assert [candidate.level for candidate in report.degraded] == [OMITTED_LEVEL]
+    assert tmp_path / "c.py" not in prompt_document.segments
+    assert prompt_document.segments[tmp_path / "a.py"].get_content() == ORIGINAL_CONTENT
+    assert tmp_path / "b.py" in prompt_document.references
+    assert report.is_over_budget()
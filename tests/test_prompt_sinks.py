@@ -0,0 +1,114 @@
+from pathlib import Path
+
+from src.libs.utils.prompt_document import PromptDocument
+from src.libs.utils.prompt_sinks import BlankLineNormalizer, create_prompt_sink, normalize_blank_lines
+
+PROJECT_ROOT: Path = Path("/project")
+
+FILENAME_OUTPUT: str = (
+    "Instructions before files\n"
+    "\n"
+    "\n"
+    "--- Filename main.py ---\n"
+    "\n"
+    "import app\n"
+    "\n"
+    "\n"
+    "app.run()\n"
+    "\n"
+    "\n"
+    "--- End of Filename main.py ---\n"
+    "\n"
+    "\n"
+    "--- Filename app.py ---\n"
+    "\n"
+    "\n"
+    "def run():\n"
+    "    pass\n"
+    "\n"
+    "\n"
+    "VALUE = 1\n"
+    "\n"
+    "\n"
+    "--- End of Filename app.py ---\n"
+    "<context>\n"
+    "  keep  \n"
+    "\n"
+    "\n"
+    "this\n"
+    "</context>"
+)
+
+
+XML_OUTPUT: str = (
+    "<documents>\n"
+    '  <document index="1">\n'
+    "    <source>main.py</source>\n"
+    "    <document_content>      \n"
+    "      import app\n"
+    "      \n"
+    "      \n"
+    "      app.run()\n"
+    "    </document_content>\n"
+    "  </document>\n"
+    '  <document index="2">\n'
+    "    <source>app.py</source>\n"
+    "    <document_content>      \n"
+    "      \n"
+    "      def run():\n"
+    "          pass\n"
+    "      \n"
+    "      \n"
+    "      VALUE = 1\n"
+    "    </document_content>\n"
+    "  </document>\n"
+    "</documents>\n"
+    "\n"
+    "Instructions before files\n"
+    "\n"
+    "\n"
+    "\n"
+    "\n"
+    "\n"
+    "\n"
+    "<context>\n"
+    "  keep  \n"
+    "\n"
+    "\n"
+    "this\n"
+    "</context>"
+)
+
+
+def build_prompt_document() -> PromptDocument:
+    prompt_document: PromptDocument = PromptDocument(PROJECT_ROOT)
+    prompt_document.write("Instructions before files\n\n\n\n")
+    prompt_document.add_file(PROJECT_ROOT / "main.py", "import app\n\n\n\n\napp.run()\n   \n")
+    prompt_document.append_to_file(PROJECT_ROOT / "app.py", "def run():\n    pass\n")
+    prompt_document.append_to_file(PROJECT_ROOT / "app.py", "\n\t\nVALUE = 1\n")
+    prompt_document.write("<context>\n  keep  \n\n\n\n\nthis\n</context>\n")
+    return prompt_document
+
+
+def render(output_format: str) -> str:
+    prompt_sink = create_prompt_sink(output_format, PROJECT_ROOT)
+    prompt_sink.write_prompt_document(build_prompt_document())
+    return prompt_sink.get_content()
+
+
+def test_filename_sink_matches_golden_output() -> None:
+    assert render("Filename") == FILENAME_OUTPUT
+
+
+def test_xml_sink_matches_golden_output() -> None:
+    assert render("XML") == XML_OUTPUT
+
+
+def test_blank_line_normalizer_does_not_depend_on_chunking() -> None:
+    text: str = "\n\n  \nfirst\n\n\n\n \t\nsecond  \n\n\n\nthird\n\n \n"
+    normalizer: BlankLineNormalizer = BlankLineNormalizer()
+
+    for char in text:
+        normalizer.write(char)
+
+    assert normalizer.close() == normalize_blank_lines(text) == "\n\nfirst\n\n\nsecond  \n\n\nthird"
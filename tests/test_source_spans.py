@@ -0,0 +1,61 @@
+import ast
+from typing import List
+
+from src.libs.utils.source_spans import SourceView, Span, SpanSet, merge_adjacent_spans
+
+
+def get_statement_spans(content: str) -> List[Span]:
+    return [((node.lineno, node.col_offset), (node.end_lineno, node.end_col_offset)) for node in ast.parse(content).body]
+
+
+def test_span_set_merges_overlapping_and_touching_spans() -> None:
+    span_set: SpanSet = SpanSet()
+
+    assert span_set.add(((1, 0), (3, 0)))
+    assert span_set.add(((2, 0), (5, 0)))
+    assert span_set.add(((5, 0), (6, 4)))
+    assert span_set.add(((8, 0), (9, 0)))
+
+    assert list(zip(span_set.starts, span_set.ends)) == [((1, 0), (6, 4)), ((8, 0), (9, 0))]
+
+
+def test_span_set_rejects_contained_spans() -> None:
+    span_set: SpanSet = SpanSet()
+    span_set.add(((1, 0), (10, 0)))
+
+    assert not span_set.add(((1, 0), (10, 0)))
+    assert not span_set.add(((3, 4), (7, 2)))
+    assert span_set.add(((9, 0), (11, 0)))
+    assert list(zip(span_set.starts, span_set.ends)) == [((1, 0), (11, 0))]
+
+
+def test_span_set_bridges_spans_that_cover_a_gap() -> None:
+    span_set: SpanSet = SpanSet()
+    span_set.add(((1, 0), (2, 0)))
+    span_set.add(((4, 0), (5, 0)))
+
+    assert span_set.add(((1, 5), (4, 3)))
+    assert list(zip(span_set.starts, span_set.ends)) == [((1, 0), (5, 0))]
+
+
+def test_merge_adjacent_spans_merges_overlapping_and_contained_spans() -> None:
+    source_view: SourceView = SourceView("a = 1\nb = 2\nc = 3\n")
+
+    assert merge_adjacent_spans(source_view, [((1, 0), (2, 5)), ((2, 0), (3, 5))]) == [((1, 0), (3, 5))]
+    assert merge_adjacent_spans(source_view, [((1, 0), (3, 5)), ((2, 0), (2, 5))]) == [((1, 0), (3, 5))]
+
+
+def test_merge_adjacent_spans_merges_across_whitespace_and_separators() -> None:
+    content: str = "a = 1; b = 2\nc = 3\n"
+    source_view: SourceView = SourceView(content)
+    merged_spans: List[Span] = merge_adjacent_spans(source_view, get_statement_spans(content))
+
+    assert [source_view.get_source(span) for span in merged_spans] == ["a = 1; b = 2\nc = 3"]
+
+
+def test_merge_adjacent_spans_keeps_non_whitespace_gaps() -> None:
+    content: str = "a = 1; unused = 0; b = 2\nc = 3  # note\nd = 4\n\n\ne = 5\n"
+    source_view: SourceView = SourceView(content)
+    a, _, b, c, d, e = get_statement_spans(content)
+
+    assert [source_view.get_source(span) for span in merge_adjacent_spans(source_view, [a, b, c, d, e])] == ["a = 1", "b = 2\nc = 3", "d = 4", "e = 5"]
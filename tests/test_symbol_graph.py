@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Set
+
+import pytest
+
+from src.libs.utils.module_index import get_module_index
+from src.libs.utils.symbol_graph import SymbolGraph
+
+
+project_root: Path = Path(__file__).resolve().parents[1]
+
+REACHED_FILES_SCRIPT: str = """
+import sys
+from pathlib import Path
+
+from src.libs.utils.symbol_graph import SymbolGraph
+
+root = Path(sys.argv[1])
+reached_names, _ = SymbolGraph(root, None, [], lambda path: False).find_reachable_symbols(root / "main.py")
+print(" ".join(path.stem for path in reached_names))
+"""
+
+
+def find_reachable_names(symbol_graph: SymbolGraph, entry_file: Path) -> Dict[Path, Set[str]]:
+    reached_names, _ = symbol_graph.find_reachable_symbols(entry_file)
+    return reached_names
+
+
+def test_invalidate_follows_star_imports(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr("sys.platform", "linux")
+    (tmp_path / "helpers.py").write_text("def first():\n    return 1\n\n\ndef second():\n    return 2\n")
+    (tmp_path / "api.py").write_text("from helpers import *\n")
+    (tmp_path / "main.py").write_text("import api\n\napi.first()\n")
+    get_module_index().invalidate()
+
+    symbol_graph: SymbolGraph = SymbolGraph(tmp_path, None, [], lambda path: False)
+    assert find_reachable_names(symbol_graph, tmp_path / "main.py")[tmp_path / "helpers.py"] == {"first"}
+
+    (tmp_path / "helpers.py").write_text("def first():\n    return second()\n\n\ndef second():\n    return 2\n")
+    symbol_graph.invalidate({tmp_path / "helpers.py"})
+    assert find_reachable_names(symbol_graph, tmp_path / "main.py")[tmp_path / "helpers.py"] == {"first", "second"}
+
+    (tmp_path / "helpers.py").write_text("def second():\n    return 2\n")
+    symbol_graph.invalidate({tmp_path / "helpers.py"})
+    assert tmp_path / "helpers.py" not in find_reachable_names(symbol_graph, tmp_path / "main.py")
+
+
+def test_reached_modules_do_not_depend_on_hash_seed(tmp_path: Path) -> None:
+    module_names: List[str] = [f"module_{index}" for index in range(12)]
+
+    for module_name in module_names:
+        (tmp_path / f"{module_name}.py").write_text(f"def {module_name}_function():\n    return 1\n")
+
+    (tmp_path / "main.py").write_text(
+        "".join(f"import {module_name}\n" for module_name in module_names)
+        + "\n\ndef run():\n"
+        + "".join(f"    {module_name}.{module_name}_function()\n" for module_name in reversed(module_names))
+        + "\n\nrun()\n"
+    )
+
+    outputs: Set[str] = set()
+
+    for seed in ["1", "2", "3"]:
+        environment: Dict[str, str] = {**os.environ, "PYTHONHASHSEED": seed, "XDG_CACHE_HOME": str(tmp_path / f"cache-{seed}")}
+        result: subprocess.CompletedProcess = subprocess.run(
+            [sys.executable, "-c", REACHED_FILES_SCRIPT, str(tmp_path)], cwd=project_root, env=environment, capture_output=True, text=True, check=True
+        )
+        outputs.add(result.stdout)
+
+    assert outputs == {" ".join(["main"] + list(reversed(module_names))) + "\n"}
@@ -0,0 +1,61 @@
+import os
+from pathlib import Path
+
+from src.libs.utils.text_files import SNIFF_SIZE, is_text_content, is_text_file
+
+
+def test_nul_bytes_mark_content_as_binary() -> None:
+    assert is_text_content(b"plain text\n", True)
+    assert not is_text_content(b"plain\0text\n", True)
+    assert not is_text_content(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR", False)
+
+
+def test_invalid_utf8_marks_content_as_binary() -> None:
+    assert is_text_content("naïve café ✓\n".encode(), True)
+    assert not is_text_content(b"caf\xe9\n", True)
+    assert not is_text_content(b"\xff\xfe\xfd", False)
+
+
+def test_multi_byte_character_cut_by_the_sniff_window_is_text() -> None:
+    head: bytes = "✓".encode()[:2]
+
+    assert is_text_content(head, False)
+    assert not is_text_content(head, True)
+
+
+def test_files_are_classified_by_content_not_extension(tmp_path: Path) -> None:
+    (tmp_path / "Makefile").write_text("all:\n\techo ok\n")
+    (tmp_path / "LICENSE").write_text("MIT License\n")
+    (tmp_path / "image.txt").write_bytes(b"GIF89a\0\0")
+    (tmp_path / "blob").write_bytes(b"\xc3\x28 broken")
+    (tmp_path / "empty").write_bytes(b"")
+    (tmp_path / "long.py").write_bytes(b"x" * (SNIFF_SIZE - 1) + "✓".encode())
+
+    assert is_text_file(tmp_path / "Makefile")
+    assert is_text_file(tmp_path / "LICENSE")
+    assert not is_text_file(tmp_path / "image.txt")
+    assert not is_text_file(tmp_path / "blob")
+    assert is_text_file(tmp_path / "empty")
+    assert is_text_file(tmp_path / "long.py")
+
+
+def test_allowed_files_max_size_and_non_regular_files(tmp_path: Path) -> None:
+    (tmp_path / "data.bin").write_bytes(b"\0\1\2")
+    (tmp_path / "big.txt").write_text("x" * 100)
+    (tmp_path / "folder").mkdir()
+
+    assert is_text_file(tmp_path / "data.bin", allowed_files=["data.bin"])
+    assert not is_text_file(tmp_path / "big.txt", max_size=99)
+    assert is_text_file(tmp_path / "big.txt", max_size=100)
+    assert not is_text_file(tmp_path / "folder")
+    assert not is_text_file(tmp_path / "missing.txt")
+
+
+def test_verdict_is_refreshed_when_the_file_changes(tmp_path: Path) -> None:
+    file_path: Path = tmp_path / "notes"
+    file_path.write_text("text\n")
+    assert is_text_file(file_path)
+
+    file_path.write_bytes(b"text\0\n")
+    os.utime(file_path, ns=(0, 0))
+    assert not is_text_file(file_path)
@@ -0,0 +1,89 @@
+import random
+from typing import List
+
+import pytest
+
+import src.libs.utils.token_counter as token_counter_module
+from src.libs.utils.token_counter import BPE_PRETOKENIZE_PATTERN, HEURISTIC_TOKEN_PATTERN, BpeTokenizer, TokenCounter, find_stream_cut
+
+SAMPLE_TEXTS: List[str] = [
+    "",
+    "____",
+    "def get_user_input(__name__):\n    return __name__\n",
+    "snake_case_name = CONSTANT_VALUE_1 + _private\r\n",
+    "  \t mixed spaces   and ÿ unicode_κείμενο 12345 ²³\n\n",
+    "'s 'll 've 're 'd 'm 't don't I'm",
+]
+
+
+def test_pretokenizer_covers_sample_texts() -> None:
+    for text in SAMPLE_TEXTS:
+        assert "".join(BPE_PRETOKENIZE_PATTERN.findall(text)) == text
+
+
+def test_pretokenizer_covers_random_text() -> None:
+    generator: random.Random = random.Random(8)
+
+    for _ in range(2000):
+        text: str = "".join(
+            chr(generator.choice([generator.randint(0, 0x7F), generator.randint(0, 0xD7FF), generator.randint(0xE000, 0x10FFFF)]))
+            for _ in range(generator.randint(0, 40))
+        )
+        assert "".join(BPE_PRETOKENIZE_PATTERN.findall(text)) == text
+
+
+def test_pretokenizer_keeps_underscores() -> None:
+    assert BPE_PRETOKENIZE_PATTERN.findall("def get_user_input(__name__):") == ["def", " get", "_", "user", "_", "input", "(__", "name", "__):"]
+
+
+def test_underscores_are_counted() -> None:
+    assert BpeTokenizer({}, "bytes").count_tokens("____") == 4
+    assert BpeTokenizer({b"__": 0}, "pairs").count_tokens("____") == 2
+
+
+def test_stream_carry_stays_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(token_counter_module, "MAX_STREAM_CARRY", 16 * 1024)
+    chunk: str = "a" * 4096
+    token_counter: TokenCounter = TokenCounter()
+    counted_lengths: List[int] = []
+    count_tokens = token_counter.count_tokens
+
+    def record_count_tokens(text: str) -> int:
+        counted_lengths.append(len(text))
+        return count_tokens(text)
+
+    token_counter.count_tokens = record_count_tokens
+    total: int = token_counter.count_stream_tokens(chunk for _ in range(1024))
+
+    assert max(counted_lengths) <= 16 * 1024 + len(chunk)
+    assert total == len(counted_lengths) - counted_lengths.count(0)
+
+
+def test_stream_cut_keeps_word_ends() -> None:
+    text: str = "first second" + "b" * 64
+
+    assert find_stream_cut(text) == len("first")
+    assert find_stream_cut("c" * 64, max_carry=128) == 0
+    assert find_stream_cut("c" * 256, max_carry=128) == 256
+
+
+def test_stream_cuts_do_not_change_pieces() -> None:
+    generator: random.Random = random.Random(23)
+    alphabet: List[str] = list("abcXYZ_019'sdt  \t\n\r.,:;(){}=+-é中") + ["'ll", "\r\n", "__", "):\n", "123456"]
+
+    for _ in range(2000):
+        text: str = "".join(generator.choice(alphabet) for _ in range(generator.randint(0, 60)))
+        cuts: List[int] = sorted(generator.randint(0, len(text)) for _ in range(generator.randint(1, 6)))
+        chunks: List[str] = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+        for pattern in (BPE_PRETOKENIZE_PATTERN, HEURISTIC_TOKEN_PATTERN):
+            pieces: List[str] = []
+            carry: str = ""
+
+            for chunk in chunks:
+                carry += chunk
+                cut: int = find_stream_cut(carry)
+                pieces.extend(pattern.findall(carry[:cut]))
+                carry = carry[cut:]
+
+            assert pieces + pattern.findall(carry) == pattern.findall(text)
@@ -0,0 +1,61 @@
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from src.libs.utils import tracing
+from src.libs.utils.tracing import CHROME_TRACE_FORMAT, SUMMARY_TRACE_FORMAT, Tracer, trace_aggregate, trace_span
+
+
+def write_trace(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, output_format: str) -> Dict[str, Any]:
+    tracer: Tracer = Tracer(tmp_path / "trace.json", output_format)
+    monkeypatch.setattr(tracing, "TRACER", tracer)
+
+    with trace_span("build", file=tmp_path / "main.py"):
+        with trace_span("parse"):
+            time.sleep(0.01)
+
+        for _ in range(3):
+            with trace_aggregate("gitignore"):
+                pass
+
+    tracer.write()
+    return json.loads((tmp_path / "trace.json").read_text())
+
+
+def test_chrome_trace_has_one_complete_event_per_span(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    trace: Dict[str, Any] = write_trace(tmp_path, monkeypatch, CHROME_TRACE_FORMAT)
+    events: Dict[str, Dict[str, Any]] = {event["name"]: event for event in trace["traceEvents"]}
+
+    assert sorted(events) == ["build", "parse"]
+    assert all(event["ph"] == "X" for event in events.values())
+    assert events["build"]["args"] == {"file": str(tmp_path / "main.py")}
+    assert events["build"]["ts"] <= events["parse"]["ts"]
+    assert events["build"]["dur"] >= events["parse"]["dur"] >= 10_000
+    assert [(aggregate["name"], aggregate["count"]) for aggregate in trace["otherData"]["aggregates"]] == [("gitignore", 3)]
+
+
+def test_summary_trace_aggregates_spans_by_name(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    trace: Dict[str, Any] = write_trace(tmp_path, monkeypatch, SUMMARY_TRACE_FORMAT)
+    spans: Dict[str, Dict[str, Any]] = {span["name"]: span for span in trace["spans"]}
+
+    assert "traceEvents" not in trace
+    assert sorted(spans) == ["build", "gitignore", "parse"]
+    assert spans["gitignore"]["count"] == 3
+    assert spans["build"]["total_ms"] >= spans["parse"]["total_ms"] >= 10
+    assert spans["build"]["self_ms"] < spans["build"]["total_ms"] - spans["parse"]["total_ms"] + 1e-6
+    assert trace["spans"][0]["name"] == "parse"
+
+
+def test_spans_are_free_when_tracing_is_disabled(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(tracing, "TRACER", None)
+
+    assert trace_span("parse") is tracing.NULL_SPAN
+    assert trace_aggregate("gitignore") is tracing.NULL_SPAN
+
+
+def test_unknown_trace_format_is_rejected(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="Unknown trace format"):
+        Tracer(tmp_path / "trace.json", "flamegraph")
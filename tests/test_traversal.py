@@ -0,0 +1,41 @@
+import ast
+from pathlib import Path
+from typing import Any, List, Set
+
+import pytest
+
+from src.libs.utils import analysis_cache
+from src.libs.utils.gitignore import GitignoreMatcher
+from src.libs.utils.module_index import get_module_index
+from src.libs.utils.traversal import MIN_PARALLEL_FRONTIER_SIZE, prefetch_import_graph
+
+
+def write_project(project_root: Path, module_count: int) -> None:
+    for index in range(module_count):
+        (project_root / f"module_{index}.py").write_text(f"import os\n\n\ndef function_{index}():\n    return os.sep\n")
+
+    (project_root / "main.py").write_text("".join(f"import module_{index}\n" for index in range(module_count)))
+
+
+def prefetch(project_root: Path) -> Set[Path]:
+    return prefetch_import_graph(project_root / "main.py", project_root, GitignoreMatcher(project_root), [], lambda path: False, max_workers=2)
+
+
+def test_prefetched_summaries_are_persisted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    project_root: Path = tmp_path / "project"
+    project_root.mkdir()
+    write_project(project_root, MIN_PARALLEL_FRONTIER_SIZE * 2)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr("sys.platform", "linux")
+    monkeypatch.setattr(analysis_cache, "ANALYSIS_CACHES", {})
+    get_module_index().invalidate()
+
+    assert len(prefetch(project_root)) == MIN_PARALLEL_FRONTIER_SIZE * 2 + 1
+
+    parsed_sources: List[Any] = []
+    parse = ast.parse
+    monkeypatch.setattr(analysis_cache, "ANALYSIS_CACHES", {})
+    monkeypatch.setattr(ast, "parse", lambda source, *args, **kwargs: parsed_sources.append(source) or parse(source, *args, **kwargs))
+
+    assert len(prefetch(project_root)) == MIN_PARALLEL_FRONTIER_SIZE * 2 + 1
+    assert parsed_sources == []